@@ -8,15 +8,499 @@ Three personas are leveraged:
 """
 
 from pydantic import BaseModel
-from Curator import Curate
-from Get import Get
-from Chain import Prompt, Model, Chain, Parser, MessageStore, create_system_message
+from pydantic.json_schema import SkipJsonSchema
+from cache import DiskCache, RetrievalCache, cache_key, DEFAULT_CACHE_DIR
+from packing import (
+    pack_candidates,
+    estimate_tokens,
+    PackedCandidates,
+    DEFAULT_TOKEN_BUDGET,
+)
+from blacklist import Blacklist, DEFAULT_BLACKLIST
+from local_index import LocalIndex, load_publishers, DEFAULT_INDEX_DIR
+from titles import TitleIndex, repair_titles
+from artifacts import ArtifactStore, new_run_id, DEFAULT_ARTIFACT_PATH
+from semantic_cache import SemanticTopicCache, SemanticHit, DEFAULT_THRESHOLD
+from routing import HedgedRouter, DEFAULT_SECONDARY, DEFAULT_MAX_WORKERS as DEFAULT_HEDGE_WORKERS
+from runlog import RunLog, DEFAULT_RUNLOG_DIR
+from scheduling import Scheduler, ModelLimits, LaneStats, parse_limits, INTERACTIVE
+from profiling import span
+import profiling
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar, copy_context
+from functools import lru_cache, partial, wraps
+from typing import Iterator, Callable
+import threading
 import argparse
+import logging
+import time
+import sys
+import os
+
+# Progress and warnings from library code go to this logger; the command line prints them (see __main__).
+logger = logging.getLogger("Mentor")
 
 # Initialize our log
 # ------------------------------------------------
+# Chain (which pulls in every model SDK), Curator (chromadb, FlagEmbedding) and Get are imported on first use,
+# so importing Mentor stays cheap. The message store is attached to Chain at that point too.
+# By default that's a RunLog (see runlog.py): this process's messages, appended to its own JSONL files in the background.
+
+message_store_log_file: str | None = None
+message_store_run_log: str | None = str(DEFAULT_RUNLOG_DIR)
+run_log: RunLog | None = None
+_message_store_ready = False
+_message_store_lock = threading.Lock()
+
+
+def configure_message_store(
+    log_file: str | None = None, run_log_dir: str | None = str(DEFAULT_RUNLOG_DIR)
+) -> None:
+    """
+    Where Chain logs messages: Chain's own MessageStore in log_file if one is given (a single JSON file),
+    otherwise a RunLog in run_log_dir; with neither, logging is off. Takes effect on the next LLM call.
+    """
+    global message_store_log_file, message_store_run_log, _message_store_ready
+    with _message_store_lock:
+        message_store_log_file = log_file
+        message_store_run_log = run_log_dir
+        _message_store_ready = False
+
+
+def load_chain():
+    """
+    Import the Chain package on first use and attach our message store. Returns the module.
+    """
+    global _message_store_ready
+    import Chain
+
+    global run_log
+    schedule_model_calls(Chain)
+    if not _message_store_ready:
+        with _message_store_lock:
+            if not _message_store_ready:
+                if run_log is not None:
+                    run_log.close()
+                    run_log = None
+                if message_store_log_file:
+                    Chain.Chain._message_store = Chain.MessageStore(log_file=message_store_log_file)
+                elif message_store_run_log:
+                    # Messages are tagged with the artifact run they belong to, when there is one.
+                    run_log = RunLog(message_store_run_log, tag=_run_id.get)
+                    Chain.Chain._message_store = run_log
+                else:
+                    Chain.Chain._message_store = None
+                _message_store_ready = True
+    return Chain
+
+
+@lru_cache(maxsize=None)
+def load_model(model_name: str):
+    """
+    One Chain Model per model name, reused by every call (and kept warm in a long-running process).
+    """
+    return load_chain().Model(model_name)
+
+
+def render_prompt(prompt: str, input_variables: dict) -> str:
+    """
+    Render a prompt template the way Chain does (Jinja2).
+    """
+    from jinja2 import Template
+
+    return Template(prompt).render(**input_variables)
+
+
+# How many Curate queries we allow in flight at once.
+DEFAULT_MAX_WORKERS = 8
+# The librarian is asked for 6-12 courses.
+MIN_COURSES = 6
+
+# Opt-in LLM response cache (see enable_response_cache)
+# ------------------------------------------------
+
+response_cache: DiskCache | None = None
+refresh_cache = False
+
+
+def env_flag(name: str) -> bool:
+    """
+    A boolean environment variable: 1/true/yes/on (any case) is true; unset, empty, 0/false/no/off are false.
+    """
+    value = os.environ.get(name, "").strip().lower()
+    if value in ("", "0", "false", "no", "off"):
+        return False
+    if value in ("1", "true", "yes", "on"):
+        return True
+    raise ValueError(f"{name}={value!r} is not a boolean (use 1/0, true/false, yes/no or on/off)")
+
+
+def enable_response_cache(
+    path: str = str(DEFAULT_CACHE_DIR / "responses.sqlite"),
+    refresh: bool = False,
+    **kwargs,
+) -> DiskCache:
+    """
+    Cache LLM responses on disk, keyed by model, system message, rendered prompt and parser schema.
+    With refresh=True, cached responses are ignored (but fresh ones are still stored).
+    kwargs (max_bytes, max_age) are passed to DiskCache.
+    """
+    global response_cache, refresh_cache
+    response_cache = DiskCache(path, **kwargs)
+    refresh_cache = refresh
+    return response_cache
+
+
+def disable_response_cache() -> None:
+    global response_cache, refresh_cache
+    response_cache = None
+    refresh_cache = False
+
+
+# Opt-in retrieval cache (see enable_retrieval_cache)
+# ------------------------------------------------
+
+retrieval_cache: RetrievalCache | None = None
+
+
+def enable_retrieval_cache(
+    path: str = str(DEFAULT_CACHE_DIR / "retrieval.sqlite"), **kwargs
+) -> RetrievalCache:
+    """
+    Cache Curate results in memory and on disk, keyed by normalized query and catalog version.
+    kwargs (catalog_version, memory_size, version_ttl, max_bytes, max_age) are passed to RetrievalCache.
+    Hit/miss counters are on retrieval_cache.stats.
+    """
+    global retrieval_cache
+    retrieval_cache = RetrievalCache(path, **kwargs)
+    return retrieval_cache
+
+
+def disable_retrieval_cache() -> None:
+    global retrieval_cache
+    retrieval_cache = None
+
+
+# Opt-in semantic topic cache: reuse runs for near-duplicate topics (see semantic_cache.py)
+# ------------------------------------------------
+
+semantic_cache: SemanticTopicCache | None = None
+
+
+def enable_semantic_cache(
+    path: str = str(DEFAULT_CACHE_DIR / "topics.sqlite"), **kwargs
+) -> SemanticTopicCache:
+    """
+    kwargs (embed, threshold, curation_threshold, ttl, max_entries) are passed to SemanticTopicCache.
+    """
+    global semantic_cache
+    semantic_cache = SemanticTopicCache(path, **kwargs)
+    return semantic_cache
+
+
+def disable_semantic_cache() -> None:
+    global semantic_cache
+    semantic_cache = None
+
+
+# Opt-in latency hedging between the primary and a fallback model (see routing.py)
+# ------------------------------------------------
+
+router: HedgedRouter | None = None
+
+
+def enable_hedging(**kwargs) -> HedgedRouter:
+    """
+    kwargs (primary, secondary, percentile, default_deadline, min_samples, max_workers) are passed to HedgedRouter.
+    """
+    global router
+    router = HedgedRouter(**kwargs)
+    return router
+
+
+def disable_hedging() -> None:
+    global router
+    router = None
+
+
+# Opt-in shared scheduler: per-model rate limits, priorities, retries and adaptive concurrency (see scheduling.py)
+# ------------------------------------------------
+
+scheduler: Scheduler | None = None
+_priority: ContextVar[int] = ContextVar("priority", default=INTERACTIVE)
+_schedule_lock = threading.Lock()
+
+
+def enable_scheduler(limits: dict[str, ModelLimits] | None = None, **kwargs) -> Scheduler:
+    """
+    Send every model call (and Curate query, in the "curate" lane) through one Scheduler.
+    kwargs (default_limits, max_retries, base_delay, max_delay) are passed to Scheduler.
+    """
+    global scheduler
+    import Chain
+
+    schedule_model_calls(Chain)
+    scheduler = Scheduler(limits, **kwargs)
+    return scheduler
+
+
+def disable_scheduler() -> None:
+    global scheduler
+    scheduler = None
+
+
+def scheduler_stats() -> dict[str, LaneStats]:
+    return scheduler.stats if scheduler is not None else {}
+
+
+@contextmanager
+def call_priority(priority: int):
+    """
+    Calls made inside this block (in this thread) queue with this priority; lower goes first (INTERACTIVE, BATCH).
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def prioritized(priority: int, function: Callable) -> Callable:
+    """
+    function, run under call_priority(priority). For work handed to a thread pool, which doesn't inherit the caller's.
+    """
+
+    def run(*args, **kwargs):
+        with call_priority(priority):
+            return function(*args, **kwargs)
+
+    return run
+
+
+def scheduled(
+    lane: str,
+    call: Callable[[], object],
+    tokens: int = 0,
+    priority: int | None = None,
+    completion_tokens: Callable[[object], int] | None = None,
+):
+    """
+    call() through the scheduler's lane if one is enabled, otherwise just call().
+    """
+    if scheduler is None:
+        return call()
+    return scheduler.run(
+        lane,
+        call,
+        tokens=tokens,
+        priority=_priority.get() if priority is None else priority,
+        completion_tokens=completion_tokens,
+    )
+
+
+def message_text(input) -> str:
+    """
+    The text of a model query: a prompt string, or a list of messages (dicts or Message models).
+    """
+    if isinstance(input, str):
+        return input
+    return "\n".join(
+        str(message["content"] if isinstance(message, dict) else getattr(message, "content", message))
+        for message in input
+    )
+
+
+def schedule_model_calls(Chain) -> None:
+    """
+    Route every Chain Model.query through scheduled(), once per Model class. Every Chain.run ends in a query, so this
+    covers our own calls and those of code that builds its own Model and Chain (the editing_mode scripts,
+    review_certificates). The lane is the model name a Model was created with ("claude", not the resolved name).
+    """
+    Model = Chain.Model
+    with _schedule_lock:
+        if getattr(Model, "_scheduled", False):
+            return
+        init, query = Model.__init__, Model.query
+
+        @wraps(init)
+        def scheduled_init(self, *args, **kwargs):
+            init(self, *args, **kwargs)
+            self._lane = args[0] if args else kwargs.get("model", self.model)
+
+        @wraps(query)
+        def scheduled_query(self, input, *args, **kwargs):
+            return scheduled(
+                getattr(self, "_lane", self.model),
+                partial(query, self, input, *args, **kwargs),
+                tokens=estimate_tokens(message_text(input)) if scheduler is not None else 0,
+                completion_tokens=lambda result: estimate_tokens(
+                    result.model_dump_json() if isinstance(result, BaseModel) else str(result)
+                ),
+            )
+
+        Model.__init__, Model.query = scheduled_init, scheduled_query
+        Model._scheduled = True
+
+
+# Retrieval engine: Curate by default, or the in-process LocalIndex (see local_index.py)
+# ------------------------------------------------
+
+local_index: LocalIndex | None = None
+
+
+def use_local_index(index_dir: str = str(DEFAULT_INDEX_DIR), **kwargs) -> LocalIndex:
+    """
+    Retrieve from the exported, memory-mapped catalog instead of Curate. kwargs (embed) go to LocalIndex.
+    """
+    global local_index, catalog_titles
+    local_index = LocalIndex(index_dir, **kwargs)
+    catalog_titles = None
+    return local_index
+
+
+def use_curate() -> None:
+    global local_index, catalog_titles
+    local_index = None
+    catalog_titles = None
+
+
+# Verbatim course titles from the whole catalog, when we have it locally (built on first use).
+catalog_titles: TitleIndex | None = None
+
+
+def catalog_title_index() -> TitleIndex | None:
+    global catalog_titles
+    if catalog_titles is None and local_index is not None:
+        catalog_titles = TitleIndex(course["title"] for course in local_index.courses)
+    return catalog_titles
+
+
+# Publisher of each course, for the blacklist's publisher rules: from the local index, or else from a catalog
+# export at DEFAULT_INDEX_DIR (Curate only returns titles and descriptions). Empty if there's neither.
+catalog_publishers: dict[str, str] | None = None
+_publishers_lock = threading.Lock()
+
+
+def publisher_index() -> dict[str, str]:
+    global catalog_publishers
+    if local_index is not None:
+        return local_index.publishers
+    if catalog_publishers is None:
+        with _publishers_lock:
+            if catalog_publishers is None:
+                export = DEFAULT_INDEX_DIR / "courses.jsonl"
+                catalog_publishers = load_publishers(DEFAULT_INDEX_DIR) if export.exists() else {}
+    return catalog_publishers
+
+
+def course_publisher(title: str) -> str | None:
+    return publisher_index().get(title)
+
+
+# Blacklist (see blacklist.conf)
+# ------------------------------------------------
+
+blacklist: Blacklist | None = None
+use_blacklist = True
+_blacklist_lock = threading.Lock()
+
 
-Chain._message_store = MessageStore(log_file="log.json")
+def load_blacklist(path: str = str(DEFAULT_BLACKLIST)) -> Blacklist:
+    """
+    Compile the blacklist at path and apply it to every retrieval from now on.
+    """
+    global blacklist, use_blacklist
+    blacklist = Blacklist.load(path)
+    use_blacklist = True
+    if blacklist.publishers and not publisher_index():
+        logger.warning(
+            "The blacklist's publisher rules need publisher metadata, and there is none "
+            "(export the catalog with local_index.py); only its title rules apply."
+        )
+    return blacklist
+
+
+def disable_blacklist() -> None:
+    global blacklist, use_blacklist
+    blacklist = None
+    use_blacklist = False
+
+
+def active_blacklist() -> Blacklist | None:
+    """
+    The blacklist to apply; the default blacklist.conf is compiled on first use.
+    """
+    if use_blacklist and blacklist is None:
+        with _blacklist_lock:
+            if use_blacklist and blacklist is None and DEFAULT_BLACKLIST.exists():
+                load_blacklist()
+    return blacklist if use_blacklist else None
+
+
+# Artifact store: every stage's output, by topic, stage and run (see artifacts.py)
+# ------------------------------------------------
+
+artifact_store: ArtifactStore | None = None
+_run_id: ContextVar[str | None] = ContextVar("run_id", default=None)
+
+
+def enable_artifact_store(path: str = str(DEFAULT_ARTIFACT_PATH)) -> ArtifactStore:
+    global artifact_store
+    artifact_store = ArtifactStore(path)
+    return artifact_store
+
+
+def disable_artifact_store() -> None:
+    global artifact_store
+    artifact_store = None
+
+
+@contextmanager
+def artifact_run(run_id: str | None = None):
+    """
+    Group the artifacts recorded inside this block under one run ID: run_id (to resume a run), or else an
+    enclosing run's, or a new one.
+    """
+    token = _run_id.set(run_id or _run_id.get() or new_run_id())
+    try:
+        yield _run_id.get()
+    finally:
+        _run_id.reset(token)
+
+
+def record_artifact(topic: str, stage: str, value) -> None:
+    if artifact_store is not None:
+        artifact_store.put(topic, stage, value, run_id=_run_id.get())
+
+
+# Librarian protocol: full titles (default), or candidate IDs mapped back to titles locally
+# ------------------------------------------------
+
+candidate_ids = False
+
+
+def use_candidate_ids(enabled: bool = True) -> None:
+    global candidate_ids
+    candidate_ids = enabled
+
+
+# Course lookups
+# ------------------------------------------------
+
+
+@lru_cache(maxsize=512)
+def course_TOC(course_title: str) -> str:
+    """
+    The verbose table of contents for a course, memoized (LRU) across calls since popular courses recur across curations.
+    Clear with course_TOC.cache_clear().
+    """
+    from Get import Get
+
+    with span("get", course=course_title) as attributes:
+        toc = Get(course_title).course_TOC_verbose
+        attributes["toc_chars"] = len(toc)
+    return toc
 
 
 # Our pydantic data models
@@ -71,6 +555,19 @@ class Curriculum(BaseModel):
         )
 
 
+class ModuleRetrieval(BaseModel):
+    """
+    The RAG results for a single module of a Curriculum.
+    If the Curate lookup failed, courses is empty and error says why.
+    blacklisted counts the hits removed by the blacklist.
+    """
+
+    module: Module
+    courses: list[tuple[str, str]] = []
+    error: str | None = None
+    blacklisted: int = 0
+
+
 class Curation(BaseModel):
     """
     Curation objects are the output of the Mentor pipeline.
@@ -79,6 +576,9 @@ class Curation(BaseModel):
 
     topic: str
     course_titles: list[str]
+    # Titles the librarian picked that match no course (see titles.py): dropped from course_titles, kept here so a
+    # short curation can be spotted. Left out of the JSON schema the model is given.
+    unmatched_titles: SkipJsonSchema[list[str]] = []
 
     def __str__(self):
         """
@@ -86,17 +586,52 @@ class Curation(BaseModel):
         """
         return self.model_dump_json(indent=2)
 
-    def curation_TOCs(self, verbose=True) -> str:
+    def curation_TOCs(self, verbose=True, max_workers=DEFAULT_MAX_WORKERS) -> str:
         """
         Concatenates the tocs for the courses so that there's a high level curriculum for LLMs to review.
         Use local models (i.e. Magnus)
         """
-        curriculum_text = ""
-        for course in self.course_titles:
-            course = Get(course)
-            curriculum_text += course.course_TOC_verbose
+        with span("curation_TOCs", courses=len(self.course_titles)) as attributes:
+            curriculum_text = "".join(self.stream_TOCs(max_workers=max_workers))
+            attributes["chars"] = len(curriculum_text)
         return curriculum_text
 
+    def stream_TOCs(
+        self, max_workers=DEFAULT_MAX_WORKERS, ordered=True
+    ) -> Iterator[str]:
+        """
+        Yields the toc for each course as soon as it's available; the lookups run concurrently.
+        With ordered=True, tocs come out in course order (each as soon as it and the ones before it are ready);
+        otherwise in order of arrival.
+        """
+        if not self.course_titles:
+            return
+        workers = max(1, min(max_workers, len(self.course_titles)))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            # Each lookup in a copy of the caller's context (its artifact run and priority).
+            futures = [
+                executor.submit(copy_context().run, course_TOC, course)
+                for course in self.course_titles
+            ]
+            if ordered:
+                for future in futures:
+                    yield future.result()
+            else:
+                for future in as_completed(futures):
+                    yield future.result()
+        finally:
+            # If the consumer stops early, don't wait on lookups nobody will read.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class CourseSelection(BaseModel):
+    """
+    The librarian's answer under the ID protocol: the IDs of the selected candidates.
+    """
+
+    course_ids: list[int]
+
 
 # Persona prompts
 # ------------------------------------------------
@@ -215,6 +750,19 @@ Your answer should include the topic, description, audience, and a list of modul
 YOU SHOULD ALWAYS RETURN AT LEAST SIX MODULES, AND NO MORE THAN TWELVE.
 """.strip()
 
+prompt_lnd_structured = """
+A colleague has asked you to create a learning path on the following topic:
+<topic>
+{{topic}}
+</topic>
+
+Please design a learning path, and provide it directly as a structured JSON representation of the curriculum.
+Your answer should include the topic, description, audience, and a list of modules.
+Each module should have a title, a description of the course and its relevance to the overall learning path, and its learning objectives.
+"Topic" should be the verbatim topic provided to you above.
+YOU SHOULD ALWAYS RETURN AT LEAST SIX MODULES, AND NO MORE THAN TWELVE.
+""".strip()
+
 prompt_video_course_librarian = """
 You have a received a curriculum object on the topic of:
 <topic>
@@ -239,23 +787,185 @@ Provide a structured Curation object that includes the topic of the curriculum a
 "Topic" should be the verbatim topic of the curriculum provided to you above.
 """.strip()
 
+prompt_video_course_librarian_ids = """
+You have a received a curriculum object on the topic of:
+<topic>
+{{topic}}
+</topic>
+
+Here is the curriculum object:
+<curriculum>
+{{curriculum}}
+</curriculum>
+
+And here are the courses that you have to choose from, each with a numeric ID in square brackets:
+<courses>
+{{courses}}
+</courses>
+
+Please select the most appropriate courses to fulfill the objectives of this curriculum.
+REMEMBER TO PICK 6-12 COURSES TOTAL; NO LESS THAN SIX, NO MORE THAN TWELVE.
+
+Provide a structured CourseSelection object with the IDs of the selected video courses, in the order a learner should take them.
+Return only the IDs, not the titles.
+""".strip()
+
 # Our chains
 # ------------------------------------------------
 
 
-def lnd_curriculum(topic: str) -> str:
+def response_cache_key(
+    model_name: str,
+    persona: str,
+    prompt: str,
+    input_variables: dict,
+    pydantic_model: type[BaseModel] | None = None,
+) -> str:
     """
-    We have an L&D professional dream up an ideal curriculum.
-    Returns a string.
+    Content address of an LLM call: model name, system message, rendered prompt and parser schema.
+    The model name is the one the caller asked for (e.g. "claude"), so a hit needs neither Chain nor the model;
+    after pointing an alias at another model, run with refresh.
+    """
+    return cache_key(
+        model_name,
+        persona,
+        render_prompt(prompt, input_variables),
+        pydantic_model.model_json_schema() if pydantic_model else None,
+    )
+
+
+def run_chain(
+    prompt: str,
+    persona: str,
+    input_variables: dict,
+    pydantic_model: type[BaseModel] | None = None,
+    model_name: str = "claude",
+    stage: str = "llm",
+    priority: int | None = None,
+):
+    """
+    Run a single LLM call (system message + prompt, optionally parsed into a pydantic model).
+    Goes through the response cache if one is enabled. If a hedged router is enabled and model_name is its primary,
+    the call is hedged with the secondary model (see routing.py); stage labels the call for its latency stats.
+    If the scheduler is enabled, the call queues with priority (default: the current call_priority).
+    Returns the response content: a string, or an instance of pydantic_model.
+    """
+    # Resolved here: the router runs calls on its own threads, which don't see our call_priority.
+    priority = _priority.get() if priority is None else priority
+    if router is None or model_name != router.primary:
+        return run_chain_once(
+            prompt, persona, input_variables, pydantic_model, model_name, priority=priority
+        )
+    with span("hedge", stage=stage) as attributes:
+        content, winner = router.run(
+            stage,
+            partial(
+                run_chain_once, prompt, persona, input_variables, pydantic_model, priority=priority
+            ),
+        )
+        attributes["winner"] = winner
+    # Which model answered, next to the stage's output in the artifact store.
+    record_artifact(input_variables.get("topic", ""), f"{stage}_model", winner)
+    return content
+
+
+def run_chain_once(
+    prompt: str,
+    persona: str,
+    input_variables: dict,
+    pydantic_model: type[BaseModel] | None = None,
+    model_name: str = "claude",
+    priority: int | None = None,
+):
+    """
+    run_chain for exactly one model, no hedging.
+    """
+    with span("llm", model=model_name) as attributes:
+        key = None
+        if response_cache is not None:
+            key = response_cache_key(
+                model_name, persona, prompt, input_variables, pydantic_model
+            )
+            if not refresh_cache:
+                cached = response_cache.get(key)
+                if cached is not None:
+                    attributes["cached"] = True
+                    if pydantic_model:
+                        return pydantic_model.model_validate_json(cached)
+                    return cached
+        Chain = load_chain()
+        model = load_model(model_name)
+        messages = [Chain.create_system_message(persona)]
+        parser = Chain.Parser(pydantic_model) if pydantic_model else None
+        chain = Chain.Chain(prompt=Chain.Prompt(prompt), model=model, parser=parser)
+        # The model's query goes through the scheduler (see schedule_model_calls), in this priority.
+        with call_priority(priority) if priority is not None else nullcontext():
+            response = chain.run(messages=messages, input_variables=input_variables)
+        content = response.content
+        serialized = content.model_dump_json() if pydantic_model else content
+        if profiling.profiler is not None or profiling._hooks:
+            attributes["prompt_tokens"] = estimate_tokens(
+                persona + render_prompt(prompt, input_variables)
+            )
+            attributes["completion_tokens"] = estimate_tokens(serialized)
+        if key is not None:
+            response_cache.set(key, serialized)
+        return content
+
+
+def stream_chain(
+    prompt: str,
+    persona: str,
+    input_variables: dict,
+    model_name: str = "claude",
+) -> Iterator[str]:
+    """
+    Like run_chain for plain text, but yields the response in chunks as the model produces them.
+    A model streams if it has a stream(messages) method yielding text chunks, messages being {"role", "content"}
+    dicts; Chain's Model has none, so its answers (like cache hits) come as one chunk, from run_chain_once.
+    """
+    model = load_model(model_name)
+    if not callable(getattr(model, "stream", None)):
+        yield run_chain_once(prompt, persona, input_variables, model_name=model_name)
+        return
+    started = time.perf_counter()
+    with span("llm", model=model_name, streamed=True) as attributes:
+        key = None
+        if response_cache is not None:
+            key = response_cache_key(model_name, persona, prompt, input_variables)
+            if not refresh_cache:
+                cached = response_cache.get(key)
+                if cached is not None:
+                    attributes["cached"] = True
+                    yield cached
+                    return
+        rendered = render_prompt(prompt, input_variables)
+        messages = [
+            {"role": "system", "content": persona},
+            {"role": "user", "content": rendered},
+        ]
+        chunks = []
+        # A stream can't be retried once chunks are out, so it only holds a scheduler slot for its duration.
+        with (
+            scheduler.slot(model_name, estimate_tokens(persona + rendered), _priority.get())
+            if scheduler is not None
+            else nullcontext()
+        ):
+            for chunk in model.stream(messages):
+                if not chunks:
+                    attributes["first_chunk_s"] = time.perf_counter() - started
+                chunks.append(chunk)
+                yield chunk
+        attributes["prompt_tokens"] = estimate_tokens(persona + rendered)
+        attributes["completion_tokens"] = estimate_tokens("".join(chunks))
+        if key is not None:
+            response_cache.set(key, "".join(chunks))
+
+
+def extract_curriculum_description(response_content: str) -> str:
+    """
+    Extract the answer from between the <curriculum_description> XML tags.
     """
-    model = Model("claude")
-    # model = Model('llama3.1:latest')
-    prompt = Prompt(prompt_lnd)
-    messages = [create_system_message(persona_lnd)]
-    chain = Chain(prompt=prompt, model=model)
-    response = chain.run(messages=messages, input_variables={"topic": topic})
-    # Extract the answer from between the XML tags
-    response_content = response.content
     start = response_content.find("<curriculum_description>") + len(
         "<curriculum_description>"
     )
@@ -263,92 +973,687 @@ def lnd_curriculum(topic: str) -> str:
     return response_content[start:end]
 
 
+def lnd_curriculum(topic: str) -> str:
+    """
+    We have an L&D professional dream up an ideal curriculum.
+    Returns a string.
+    """
+    # model_name = "llama3.1:latest"
+    with span("lnd_curriculum"):
+        response_content = run_chain(
+            prompt_lnd, persona_lnd, {"topic": topic}, stage="lnd_curriculum"
+        )
+    ideal_curriculum = extract_curriculum_description(response_content)
+    record_artifact(topic, "ideal_curriculum", ideal_curriculum)
+    return ideal_curriculum
+
+
 def curriculum_specialist_curriculum(ideal_curriculum: str, topic: str) -> Curriculum:
     """
     We have a Curriculum Specialist dream up an ideal curriculum.
     Interprets the L&D professional's suggestions into a curriculum object.
     """
-    model = Model("claude")
-    # model = Model('llama3.1:latest')
-    prompt = Prompt(prompt_curriculum_specialist)
-    messages = [create_system_message(persona_curriculum_specialist)]
-    parser = Parser(Curriculum)
-    chain = Chain(prompt=prompt, model=model, parser=parser)
-    response = chain.run(
-        messages=messages,
-        input_variables={"ideal_curriculum": ideal_curriculum, "topic": topic},
+    # model_name = "llama3.1:latest"
+    with span("curriculum_specialist_curriculum") as attributes:
+        curriculum = run_chain(
+            prompt_curriculum_specialist,
+            persona_curriculum_specialist,
+            {"ideal_curriculum": ideal_curriculum, "topic": topic},
+            pydantic_model=Curriculum,
+            stage="curriculum_specialist_curriculum",
+        )
+        attributes["modules"] = len(curriculum.modules)
+    record_artifact(topic, "curriculum", curriculum)
+    return curriculum
+
+
+def lnd_structured_curriculum(topic: str) -> Curriculum:
+    """
+    Fast mode: the L&D professional designs the curriculum and returns the Curriculum object directly,
+    in one structured-output call instead of lnd_curriculum + curriculum_specialist_curriculum.
+    """
+    # model_name = "llama3.1:latest"
+    with span("lnd_structured_curriculum") as attributes:
+        curriculum = run_chain(
+            prompt_lnd_structured,
+            persona_lnd,
+            {"topic": topic},
+            pydantic_model=Curriculum,
+            stage="lnd_structured_curriculum",
+        )
+        attributes["modules"] = len(curriculum.modules)
+    record_artifact(topic, "curriculum", curriculum)
+    return curriculum
+
+
+def module_query(module: Module) -> str:
+    """
+    Build the string we send to Curate for a module (title, description, learning objectives).
+    """
+    return (
+        module.title
+        + ": "
+        + module.description
+        + "\nLearning Objectives:\n"
+        + "\n\t".join(module.learning_objectives)
     )
-    return response.content
 
 
-def identify_courses(curriculum: Curriculum) -> Curation:
+def module_retrieval(
+    module: Module, course_matches: list[tuple[str, str]]
+) -> ModuleRetrieval:
+    """
+    Wrap a module's hits in a ModuleRetrieval, after applying the blacklist.
+    """
+    removed = 0
+    active = active_blacklist()
+    if active is not None:
+        course_matches, removed = active.filter(course_matches, publisher_of=course_publisher)
+    return ModuleRetrieval(module=module, courses=course_matches, blacklisted=removed)
+
+
+def search_courses(query: str) -> list[tuple[str, str]]:
+    """
+    Top 10 (title, description) hits for a free-text query from the active engine: the local index,
+    or Curate (through the retrieval cache, if enabled). The blacklist is not applied here.
+    """
+    if local_index is not None:
+        return local_index.search([query])[0]
+    from Curator import Curate
+
+    def curate(query: str) -> list[tuple[str, str]]:
+        return scheduled("curate", partial(Curate, query))
+
+    if retrieval_cache is not None:
+        return retrieval_cache.lookup(query, curate)
+    return curate(query)
+
+
+def warm_retrieval() -> None:
+    """
+    Load the retrieval engine (Curate and its vector store, or the local index's embedding model) and the semantic
+    cache's embedding model now, rather than on the first request.
+    """
+    if local_index is not None:
+        local_index.embed(["warm-up"])
+    else:
+        from Curator import Curate  # noqa: F401
+    if semantic_cache is not None:
+        semantic_cache.embed(["warm-up"])
+
+
+def retrieve_module(module: Module) -> ModuleRetrieval:
+    """
+    RAG: get the top 10 courses for a single module.
+    Errors are captured on the result rather than raised, so one bad module doesn't sink the rest.
+    """
+    if local_index is not None:
+        return retrieve_modules_locally([module])[0]
+    with span("curate", module=module.title) as attributes:
+        try:
+            course_matches = search_courses(module_query(module))
+        except Exception as e:
+            attributes["failed"] = True
+            return ModuleRetrieval(module=module, error=f"{type(e).__name__}: {e}")
+        retrieval = module_retrieval(module, course_matches)
+        attributes["courses"] = len(retrieval.courses)
+        attributes["blacklisted"] = retrieval.blacklisted
+    return retrieval
+
+
+def retrieve_modules_locally(modules: list[Module], k: int = 10) -> list[ModuleRetrieval]:
+    """
+    Top k courses for every module from the local index, in one batched search.
+    """
+    with span("local_search", queries=len(modules)) as attributes:
+        try:
+            hits = local_index.search([module_query(module) for module in modules], k=k)
+        except Exception as e:
+            attributes["failed"] = True
+            error = f"{type(e).__name__}: {e}"
+            return [ModuleRetrieval(module=module, error=error) for module in modules]
+        retrievals = [
+            module_retrieval(module, courses) for module, courses in zip(modules, hits)
+        ]
+        attributes["blacklisted"] = sum(r.blacklisted for r in retrievals)
+    return retrievals
+
+
+def retrieve_courses(
+    curriculum: Curriculum, max_workers: int = DEFAULT_MAX_WORKERS
+) -> list[ModuleRetrieval]:
+    """
+    Query Curate for all modules of the curriculum at once, with at most max_workers queries in flight.
+    Results are returned in module order.
+    """
+    if not curriculum.modules:
+        return []
+    if local_index is not None:
+        return retrieve_modules_locally(curriculum.modules)
+    workers = max(1, min(max_workers, len(curriculum.modules)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Each query runs in a copy of our context, so it keeps our call_priority.
+        futures = [
+            executor.submit(copy_context().run, retrieve_module, module)
+            for module in curriculum.modules
+        ]
+        return [future.result() for future in futures]
+
+
+def retrieve_as_completed(
+    modules: list[Module], max_workers: int = DEFAULT_MAX_WORKERS
+) -> Iterator[tuple[int, ModuleRetrieval]]:
+    """
+    (position, retrieval) for each module as soon as it's ready: all at once from one batched search with the
+    local index, otherwise as each concurrent Curate query finishes.
+    """
+    if not modules:
+        return
+    if local_index is not None:
+        yield from enumerate(retrieve_modules_locally(modules))
+        return
+    workers = max(1, min(max_workers, len(modules)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(copy_context().run, retrieve_module, module): position
+            for position, module in enumerate(modules)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def retrieve_curricula(
+    curricula: list[Curriculum], max_workers: int = DEFAULT_MAX_WORKERS
+) -> list[list[ModuleRetrieval]]:
+    """
+    Retrieval for a whole batch of curricula. With the local index, every module of every curriculum
+    goes into a single batched search; with Curate, each curriculum is retrieved as usual.
+    """
+    if local_index is None:
+        return [
+            retrieve_courses(curriculum, max_workers=max_workers)
+            for curriculum in curricula
+        ]
+    modules = [module for curriculum in curricula for module in curriculum.modules]
+    retrievals = iter(retrieve_modules_locally(modules))
+    return [[next(retrievals) for _ in curriculum.modules] for curriculum in curricula]
+
+
+def identify_courses(
+    curriculum: Curriculum,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    token_budget: int | None = DEFAULT_TOKEN_BUDGET,
+) -> Curation:
     """
     We have a Curriculum Specialist identify the courses that best fit the ideal curriculum.
+    Candidates are deduplicated, ranked and packed into token_budget (None for no limit).
     Returns a Curation object.
     """
-    recommended_courses = []
-    for module in curriculum.modules:
-        # RAG: get the top 10 courses for this module
-        course_matches = Curate(
-            module.title
-            + ": "
-            + module.description
-            + "\nLearning Objectives:\n"
-            + "\n\t".join(module.learning_objectives)
+    with span("identify_courses", modules=len(curriculum.modules)):
+        retrievals = retrieve_courses(curriculum, max_workers=max_workers)
+        return librarian_curation(curriculum, retrievals, token_budget=token_budget)
+
+
+def librarian_curation(
+    curriculum: Curriculum,
+    retrievals: list[ModuleRetrieval],
+    token_budget: int | None = DEFAULT_TOKEN_BUDGET,
+) -> Curation:
+    """
+    The librarian half of identify_courses: pack the retrieved candidates and have the librarian pick courses.
+    """
+    module_hits = []
+    blacklisted = sum(retrieval.blacklisted for retrieval in retrievals)
+    if active_blacklist() is not None:
+        logger.info("Blacklist removed %d candidates.", blacklisted)
+    for retrieval in retrievals:
+        if retrieval.error:
+            logger.warning(
+                "Retrieval failed for module '%s': %s", retrieval.module.title, retrieval.error
+            )
+            continue
+        module_hits.append((retrieval.module.title, retrieval.courses))
+    packed = pack_candidates(module_hits, token_budget=token_budget)
+    if not packed.candidates:
+        raise RuntimeError(
+            f"Retrieval failed for every module of curriculum '{curriculum.topic}'."
         )
-        # Get a pretty printed version of the courses
-        recommended_courses += course_matches
-    course_context = "\n".join(
-        [f"{course[0]}: {course[1]}" for course in recommended_courses]
-    )
+    logger.info("%s", packed)
+    record_artifact(curriculum.topic, "candidates", packed)
+    if candidate_ids:
+        curation = librarian_curation_ids(curriculum, packed, blacklisted)
+        record_artifact(curriculum.topic, "curation", curation)
+        return curation
+    course_context = packed.context
     # Ask the library
-    # model = Model("llama3.1:latest")
-    model = Model("claude")
-    prompt = Prompt(prompt_video_course_librarian)
-    messages = [create_system_message(video_course_librarian)]
-    parser = Parser(Curation)
-    chain = Chain(prompt=prompt, model=model, parser=parser)
-    response = chain.run(
-        messages=messages,
-        input_variables={
-            "topic": module.title,
-            "curriculum": curriculum,
-            "courses": course_context,
-        },
+    # model_name = "llama3.1:latest"
+    with span(
+        "librarian",
+        candidates=len(packed.candidates),
+        duplicate_candidates=packed.duplicates,
+        dropped_candidates=packed.dropped,
+        blacklisted=blacklisted,
+        course_context_chars=len(course_context),
+        course_context_tokens=packed.tokens,
+    ):
+        curation = run_chain(
+            prompt_video_course_librarian,
+            video_course_librarian,
+            {
+                "topic": curriculum.topic,
+                "curriculum": curriculum,
+                "courses": course_context,
+            },
+            pydantic_model=Curation,
+            stage="librarian",
+        )
+    # Make sure every title is verbatim, so the Get lookups work: correct near misses, drop what we can't match.
+    with span("titles", titles=len(curation.course_titles)) as attributes:
+        indexes = [TitleIndex(candidate.title for candidate in packed.candidates)]
+        if catalog_title_index() is not None:
+            indexes.append(catalog_titles)
+        course_titles, report = repair_titles(curation.course_titles, indexes)
+        attributes["corrected"] = len(report.corrected)
+        attributes["unmatched"] = len(report.unmatched)
+    if report.corrected or report.unmatched:
+        logger.warning("%s", report)
+    curation = curation.model_copy(
+        update={"course_titles": course_titles, "unmatched_titles": report.unmatched}
     )
-    return response.content
+    check_course_count(curation)
+    record_artifact(curriculum.topic, "curation", curation)
+    return curation
 
 
-def Mentor(topic: str) -> Curation:
+def check_course_count(curation: Curation) -> bool:
     """
-    Runs the entire Mentor pipeline.
+    Warn if a curation has fewer than MIN_COURSES courses (e.g. after dropping unmatched titles). Returns whether it's ok.
+    """
+    if len(curation.course_titles) >= MIN_COURSES:
+        return True
+    logger.warning(
+        "Curation for '%s' has %d courses, fewer than %d%s.",
+        curation.topic,
+        len(curation.course_titles),
+        MIN_COURSES,
+        f" ({len(curation.unmatched_titles)} unmatched titles dropped)" if curation.unmatched_titles else "",
+    )
+    return False
+
+
+def librarian_curation_ids(
+    curriculum: Curriculum, packed: PackedCandidates, blacklisted: int = 0
+) -> Curation:
+    """
+    The librarian under the ID protocol: candidates are numbered, the model answers with IDs only, and we map
+    them back to the exact titles. Cuts completion tokens and rules out transcription errors.
+    """
+    course_context = packed.numbered_context
+    with span(
+        "librarian",
+        candidates=len(packed.candidates),
+        duplicate_candidates=packed.duplicates,
+        dropped_candidates=packed.dropped,
+        blacklisted=blacklisted,
+        course_context_chars=len(course_context),
+        course_context_tokens=packed.tokens,
+        candidate_ids=True,
+    ):
+        selection = run_chain(
+            prompt_video_course_librarian_ids,
+            video_course_librarian,
+            {
+                "topic": curriculum.topic,
+                "curriculum": curriculum,
+                "courses": course_context,
+            },
+            pydantic_model=CourseSelection,
+            stage="librarian",
+        )
+    course_titles, unknown = packed.titles_for(selection.course_ids)
+    if unknown:
+        logger.warning("Ignored unknown candidate IDs: %s", unknown)
+    curation = Curation(topic=curriculum.topic, course_titles=course_titles)
+    check_course_count(curation)
+    return curation
+
+
+def semantic_lookup(topic: str) -> tuple[Curriculum, Curation | None] | None:
+    """
+    A cached run for a similar topic: its Curriculum, plus its Curation if the topics are close enough to reuse it too.
+    Both are retitled to this topic. None if there's no semantic cache or no hit.
+    """
+    if semantic_cache is None:
+        return None
+    with span("semantic_cache") as attributes:
+        hit: SemanticHit | None = semantic_cache.lookup(topic)
+        attributes["hit"] = hit is not None
+        if hit is not None:
+            attributes["similarity"] = hit.score
+    if hit is None:
+        return None
+    curriculum = Curriculum.model_validate_json(hit.curriculum_json)
+    curriculum = curriculum.model_copy(update={"topic": topic})
+    curation = None
+    if hit.curation_json and hit.score >= semantic_cache.curation_threshold:
+        curation = Curation.model_validate_json(hit.curation_json)
+        curation = curation.model_copy(update={"topic": topic})
+    reused = "Curriculum and Curation" if curation else "Curriculum"
+    logger.info(
+        "Semantic cache hit for '%s': reusing the %s of '%s' (similarity %.3f).",
+        topic,
+        reused,
+        hit.topic,
+        hit.score,
+    )
+    return curriculum, curation
+
+
+def semantic_store(topic: str, curriculum: Curriculum, curation: Curation) -> None:
+    if semantic_cache is not None:
+        semantic_cache.put(
+            topic, curriculum.model_dump_json(), curation.model_dump_json()
+        )
+
+
+def plan_curriculum(topic: str, fast: bool = False) -> Curriculum:
+    """
+    The curriculum half of the pipeline: the L&D and structuring stages, or the fused call with fast=True.
     """
+    if fast:
+        return lnd_structured_curriculum(topic)
     ideal_curriculum = lnd_curriculum(topic)
-    curriculum = curriculum_specialist_curriculum(ideal_curriculum, topic)
-    curation = identify_courses(curriculum)
+    return curriculum_specialist_curriculum(ideal_curriculum, topic)
+
+
+def Mentor(
+    topic: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    token_budget: int | None = DEFAULT_TOKEN_BUDGET,
+    fast: bool = False,
+) -> Curation:
+    """
+    Runs the entire Mentor pipeline.
+    With fast=True, the L&D and structuring stages are fused into a single LLM call.
+    """
+    cached = semantic_lookup(topic)
+    if cached is not None and cached[1] is not None:
+        return cached[1]
+    with artifact_run():
+        if cached is not None:
+            curriculum = cached[0]
+            record_artifact(topic, "curriculum", curriculum)
+        else:
+            curriculum = plan_curriculum(topic, fast=fast)
+        curation = identify_courses(
+            curriculum, max_workers=max_workers, token_budget=token_budget
+        )
+    if cached is None:
+        semantic_store(topic, curriculum, curation)
     return curation
 
 
 if __name__ == "__main__":
+    # Helper modules (batch, ...) import from Mentor; make sure they share this module rather than re-importing it.
+    sys.modules.setdefault("Mentor", sys.modules[__name__])
     parser = argparse.ArgumentParser(description="Run the Mentor.py script.")
     parser.add_argument(
         "topic", type=str, nargs="?", help="The topic for the curriculum."
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help="How many module retrievals to run concurrently.",
+    )
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        default=DEFAULT_TOKEN_BUDGET,
+        help="Maximum (estimated) tokens of course candidates in the librarian prompt; 0 for no limit.",
+    )
+    parser.add_argument(
+        "--batch",
+        type=str,
+        metavar="TOPIC_FILE",
+        help="Run the pipeline for every topic in this file (one per line).",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        default="mentor_checkpoint.jsonl",
+        help="Batch mode: append-only checkpoint file; finished topics are skipped on restart.",
+    )
+    parser.add_argument(
+        "--pipelines",
+        type=int,
+        default=4,
+        help="Batch mode: how many topic pipelines to run concurrently.",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache LLM responses and Curate results on disk (also enabled by setting MENTOR_CACHE=1).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the caches, even if MENTOR_CACHE is set.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached LLM responses and store fresh ones.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print intermediate results (ideal curriculum, Curriculum, per-module hits) as they arrive.",
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Fuse the L&D and structuring stages into one LLM call (saves a round trip).",
+    )
+    parser.add_argument(
+        "--speculative",
+        action="store_true",
+        help="Stream the structured curriculum and start each module's retrieval as soon as it is emitted.",
+    )
+    parser.add_argument(
+        "--candidate-ids",
+        action="store_true",
+        help="Number the candidates and have the librarian return IDs instead of titles (fewer output tokens).",
+    )
+    parser.add_argument(
+        "--semantic-cache",
+        action="store_true",
+        help="Reuse the Curriculum (or, for near-identical topics, the Curation) of a similar topic run before.",
+    )
+    parser.add_argument(
+        "--semantic-threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Cosine similarity a previous topic needs for --semantic-cache to reuse its Curriculum.",
+    )
+    parser.add_argument(
+        "--hedge",
+        nargs="?",
+        const=DEFAULT_SECONDARY,
+        metavar="FALLBACK_MODEL",
+        help=f"If claude is slower than usual (p95 of its recent latencies for the stage), also ask FALLBACK_MODEL "
+        f"(default {DEFAULT_SECONDARY}) and take the first valid answer.",
+    )
+    parser.add_argument(
+        "--hedge-workers",
+        type=int,
+        default=DEFAULT_HEDGE_WORKERS,
+        help="Threads for hedged calls; each in-flight call takes up to two.",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        action="append",
+        default=[],
+        metavar="MODEL:rpm=N,tpm=N,concurrency=N",
+        help="Queue calls to MODEL within these quotas (repeatable; 'curate' limits Curate queries). "
+        "Throttled calls are retried with backoff and concurrency adapts to throttling.",
+    )
+    parser.add_argument(
+        "--local-index",
+        type=str,
+        metavar="INDEX_DIR",
+        help="Retrieve from a local memory-mapped catalog export (see local_index.py) instead of Curate.",
+    )
+    parser.add_argument(
+        "--blacklist",
+        type=str,
+        default=str(DEFAULT_BLACKLIST),
+        help="Blacklist rules file (keyword, exact:, prefix:, regex: lines).",
+    )
+    parser.add_argument(
+        "--no-blacklist",
+        action="store_true",
+        help="Don't filter retrieved courses against the blacklist.",
+    )
+    parser.add_argument(
+        "--artifacts",
+        nargs="?",
+        const=str(DEFAULT_ARTIFACT_PATH),
+        metavar="DB",
+        help=f"Record every stage's output in an artifact store (default {DEFAULT_ARTIFACT_PATH}).",
+    )
+    parser.add_argument(
+        "--run-log",
+        type=str,
+        default=str(DEFAULT_RUNLOG_DIR),
+        metavar="DIR",
+        help="Directory for the append-only JSONL message log (one set of files per run); "
+        "pass an empty string to disable logging.",
+    )
+    parser.add_argument(
+        "--log-file",
+        type=str,
+        help="Log messages to this single JSON file with Chain's own MessageStore instead of the run log.",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="",
+        metavar="TRACE_JSON",
+        help="Print a per-stage timing/token summary; if a path is given, also write a JSON trace there.",
+    )
     args = parser.parse_args()
+    # Per-pipeline progress would interleave in batch mode; only warnings are shown there.
+    logging.basicConfig(level=logging.WARNING if args.batch else logging.INFO, format="%(message)s")
+    configure_message_store(args.log_file or None, args.run_log or None)
+    if args.local_index:
+        use_local_index(args.local_index)
+    use_candidate_ids(args.candidate_ids)
+    if args.artifacts:
+        enable_artifact_store(args.artifacts)
+    if args.hedge:
+        enable_hedging(secondary=args.hedge, max_workers=args.hedge_workers)
+    if args.rate_limit:
+        enable_scheduler(dict(parse_limits(spec) for spec in args.rate_limit))
+    if args.semantic_cache and not args.no_cache:
+        enable_semantic_cache(threshold=args.semantic_threshold)
+    if args.no_blacklist:
+        disable_blacklist()
+    else:
+        load_blacklist(args.blacklist)
+    token_budget = args.token_budget or None
+    if not args.no_cache and (
+        args.cache or args.refresh or env_flag("MENTOR_CACHE")
+    ):
+        enable_response_cache(refresh=args.refresh)
+        enable_retrieval_cache()
+    if args.profile is not None:
+        profiler = profiling.enable()
+
+    def report_profile():
+        if router is not None:
+            print(router.stats)
+        for lane, stats in scheduler_stats().items():
+            print(f"{lane}: {stats}")
+        if args.profile is None:
+            return
+        print(profiler.summary())
+        if args.profile:
+            profiler.write_trace(args.profile)
+            print(f"Trace written to {args.profile}")
+    if args.batch:
+        from batch import run_batch, read_topics
+        from speculative import Mentor_speculative
+
+        result = run_batch(
+            read_topics(args.batch),
+            checkpoint=args.checkpoint,
+            pipelines=args.pipelines,
+            max_workers=args.max_workers,
+            token_budget=token_budget,
+            fast=args.fast,
+            pipeline=Mentor_speculative if args.speculative else Mentor,
+        )
+        print(
+            f"{len(result.curations)} curations ({result.skipped} from checkpoint), {len(result.failures)} failures."
+        )
+        if retrieval_cache is not None:
+            print(retrieval_cache.stats)
+        report_profile()
+        raise SystemExit(1 if result.failures else 0)
     if args.topic:
         topic = args.topic
     else:
         topic = "Financial Analysis and Modeling"
+    if args.speculative:
+        from speculative import Mentor_speculative
+
+        print("Creating a curation (speculative retrieval) for the topic:", topic)
+        print(
+            Mentor_speculative(
+                topic,
+                max_workers=args.max_workers,
+                token_budget=token_budget,
+                fast=args.fast,
+            )
+        )
+        if retrieval_cache is not None:
+            print(retrieval_cache.stats)
+        report_profile()
+        raise SystemExit(0)
+    from streaming import Mentor_stream
+
     print("Creating an ideal curriculum for the topic:", topic)
-    ideal_curriculum = lnd_curriculum(topic)
-    # RAG: convert the ideal curriculum into a structured object
-    print(
-        f"Converting the ideal curriculum into a structured object for the topic: {topic}"
-    )
-    curriculum = curriculum_specialist_curriculum(ideal_curriculum, topic)
-    # RAG: get the course descriptions
-    print("Identifying courses for the curriculum.")
-    curation = identify_courses(curriculum)
-    # RAG: get the curated courses
-    print("Curation object:")
-    print(curation)
+    for event in Mentor_stream(
+        topic,
+        max_workers=args.max_workers,
+        token_budget=token_budget,
+        fast=args.fast,
+    ):
+        if event.kind == "ideal_curriculum_delta" and args.stream:
+            print(event.text, end="", flush=True)
+        elif event.kind == "ideal_curriculum":
+            if args.stream:
+                print()
+            # RAG: convert the ideal curriculum into a structured object
+            print(
+                f"Converting the ideal curriculum into a structured object for the topic: {topic}"
+            )
+        elif event.kind == "curriculum":
+            if args.stream:
+                print(event.curriculum)
+            # RAG: get the course descriptions
+            print("Identifying courses for the curriculum.")
+        elif event.kind == "module_retrieval" and args.stream:
+            retrieval = event.retrieval
+            print(
+                f"[{event.elapsed:.1f}s] {retrieval.module.title}: "
+                + (retrieval.error or f"{len(retrieval.courses)} courses")
+            )
+        elif event.kind == "curation":
+            # RAG: get the curated courses
+            print("Curation object:")
+            print(event.curation)
+    if retrieval_cache is not None:
+        print(retrieval_cache.stats)
+    report_profile()
@@ -1,4 +1,4 @@
-from .mentor import Mentor
+from .Mentor import Mentor
 
 
 __all__ = ["Mentor"]
@@ -0,0 +1,210 @@
+"""
+Append-only store for pipeline outputs (ideal curriculum, Curriculum, candidates, Curation, critiques, ...).
+
+Every artifact is one row in a SQLite file, keyed by topic, stage and run ID (one run = one pass of the pipeline over
+a topic). Appends are a single INSERT, lookups go through indexes, and iteration pages through the table by ID, so
+neither memory use nor write cost grows with the number of topics stored.
+
+Values are stored as JSON: pydantic models as model_dump_json() (their class name is kept in `kind`), strings as-is.
+"""
+
+from pydantic import BaseModel
+from pathlib import Path
+from typing import Iterator
+import threading
+import sqlite3
+import json
+import time
+import uuid
+
+DEFAULT_ARTIFACT_PATH = Path(".mentor_artifacts.db")
+PAGE_SIZE = 500
+
+
+def new_run_id() -> str:
+    return f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+class Artifact(BaseModel):
+    """
+    One stored output. load() decodes the value (pass the pydantic model to get an instance back).
+    """
+
+    id: int
+    run_id: str
+    topic: str
+    stage: str
+    kind: str
+    created: float
+    value: str
+
+    def load(self, model: type[BaseModel] | None = None):
+        if model is not None:
+            return model.model_validate_json(self.value)
+        if self.kind == "text":
+            return self.value
+        return json.loads(self.value)
+
+
+class ArtifactStore:
+    """
+    The artifact table in a single SQLite file, safe to share between threads.
+    """
+
+    COLUMNS = "id, run_id, topic, stage, kind, created, value"
+
+    def __init__(self, path: str | Path = DEFAULT_ARTIFACT_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            # WAL + NORMAL: an append is a sequential write, without an fsync per commit.
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS artifacts ("
+                "id INTEGER PRIMARY KEY, run_id TEXT NOT NULL, topic TEXT NOT NULL, stage TEXT NOT NULL, "
+                "kind TEXT NOT NULL, created REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS artifacts_topic_stage ON artifacts (topic, stage, id)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS artifacts_run ON artifacts (run_id, id)"
+            )
+
+    def put(self, topic: str, stage: str, value, run_id: str | None = None) -> int:
+        """
+        Append an artifact and return its ID.
+        """
+        if isinstance(value, BaseModel):
+            kind, encoded = type(value).__name__, value.model_dump_json()
+        elif isinstance(value, str):
+            kind, encoded = "text", value
+        else:
+            kind, encoded = "json", json.dumps(value, default=str, ensure_ascii=False)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO artifacts (run_id, topic, stage, kind, created, value) VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id or new_run_id(), topic, stage, kind, time.time(), encoded),
+            )
+            return cursor.lastrowid
+
+    def get(self, artifact_id: int) -> Artifact | None:
+        rows = self._query(f"SELECT {self.COLUMNS} FROM artifacts WHERE id = ?", (artifact_id,))
+        return rows[0] if rows else None
+
+    def latest(self, topic: str, stage: str) -> Artifact | None:
+        """
+        The most recent artifact for this topic and stage.
+        """
+        rows = self._query(
+            f"SELECT {self.COLUMNS} FROM artifacts WHERE topic = ? AND stage = ? ORDER BY id DESC LIMIT 1",
+            (topic, stage),
+        )
+        return rows[0] if rows else None
+
+    def run(self, run_id: str) -> dict[str, Artifact]:
+        """
+        Everything a run produced, by stage (the last one, if a stage was recorded twice).
+        """
+        rows = self._query(
+            f"SELECT {self.COLUMNS} FROM artifacts WHERE run_id = ? ORDER BY id", (run_id,)
+        )
+        return {artifact.stage: artifact for artifact in rows}
+
+    def find(
+        self,
+        topic: str | None = None,
+        stage: str | None = None,
+        run_id: str | None = None,
+    ) -> Iterator[Artifact]:
+        """
+        Stream the matching artifacts, oldest first, a page at a time.
+        """
+        filters, parameters = [], []
+        for column, value in (("topic", topic), ("stage", stage), ("run_id", run_id)):
+            if value is not None:
+                filters.append(f"{column} = ?")
+                parameters.append(value)
+        last_id = 0
+        while True:
+            rows = self._query(
+                f"SELECT {self.COLUMNS} FROM artifacts WHERE "
+                + " AND ".join(filters + ["id > ?"])
+                + f" ORDER BY id LIMIT {PAGE_SIZE}",
+                (*parameters, last_id),
+            )
+            yield from rows
+            if len(rows) < PAGE_SIZE:
+                return
+            last_id = rows[-1].id
+
+    def topics(self) -> list[str]:
+        with self._lock:
+            return [
+                topic
+                for (topic,) in self._conn.execute(
+                    "SELECT DISTINCT topic FROM artifacts ORDER BY topic"
+                )
+            ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0]
+
+    def _query(self, sql: str, parameters: tuple) -> list[Artifact]:
+        with self._lock:
+            rows = self._conn.execute(sql, parameters).fetchall()
+        return [
+            Artifact(
+                id=row[0], run_id=row[1], topic=row[2], stage=row[3], kind=row[4], created=row[5], value=row[6]
+            )
+            for row in rows
+        ]
+
+
+def import_pickle(store: ArtifactStore, path: str | Path) -> int:
+    """
+    Import the list of ReACT inputs that editing_mode/4_reACT_prompting_with_caching.py used to pickle
+    ({"CURRICULUM", "CURATION_OBJECT", "CRITIQUE"} dicts). Returns the number of entries imported.
+    """
+    import pickle
+
+    with open(path, "rb") as f:
+        entries = pickle.load(f)
+    for entry in entries:
+        curation = entry["CURATION_OBJECT"]
+        if isinstance(curation, BaseModel):
+            curation = curation.model_dump()
+        run_id = new_run_id()
+        topic = curation["topic"]
+        store.put(topic, "curation", curation, run_id=run_id)
+        store.put(topic, "curriculum_text", entry["CURRICULUM"], run_id=run_id)
+        store.put(topic, "critique", entry["CRITIQUE"], run_id=run_id)
+    return len(entries)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or import into the artifact store.")
+    parser.add_argument("--db", type=str, default=str(DEFAULT_ARTIFACT_PATH))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("topics", help="List the topics with stored artifacts.")
+    show = subparsers.add_parser("show", help="Print the latest artifact for a topic and stage.")
+    show.add_argument("topic")
+    show.add_argument("stage")
+    import_parser = subparsers.add_parser("import", help="Import a cached.pkl from editing_mode.")
+    import_parser.add_argument("pickle_path")
+    args = parser.parse_args()
+    store = ArtifactStore(args.db)
+    if args.command == "topics":
+        for topic in store.topics():
+            print(topic)
+    elif args.command == "show":
+        artifact = store.latest(args.topic, args.stage)
+        print(artifact.value if artifact else f"No {args.stage} artifact for '{args.topic}'.")
+    else:
+        print(f"Imported {import_pickle(store, args.pickle_path)} entries into {args.db}")
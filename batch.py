@@ -0,0 +1,272 @@
+"""
+Batch mode for Mentor: run the pipeline over many topics.
+
+Several topic pipelines are kept in flight at once (they spend most of their time waiting on the network),
+and every finished Curation is appended to a JSONL checkpoint as soon as it's ready.
+Restarting a run with the same checkpoint skips the topics that are already done.
+
+With the local index (Mentor.use_local_index), topics run in waves instead: each wave's curricula are generated
+(`pipelines` at a time), every module of the wave is retrieved in one batched search (Mentor.retrieve_curricula),
+and then the librarian picks courses for each topic. Checkpoints are written as each topic's librarian finishes.
+"""
+
+from Mentor import (
+    Mentor,
+    Curriculum,
+    Curation,
+    ModuleRetrieval,
+    plan_curriculum,
+    retrieve_curricula,
+    librarian_curation,
+    artifact_run,
+    record_artifact,
+    semantic_lookup,
+    semantic_store,
+    prioritized,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_TOKEN_BUDGET,
+)
+import Mentor as mentor
+from scheduling import BATCH
+from profiling import span
+from pydantic import BaseModel
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Iterator
+import threading
+import logging
+import json
+
+logger = logging.getLogger("Mentor.batch")
+
+DEFAULT_PIPELINES = 4
+WAVE_SIZE_PER_PIPELINE = 4  # topics per wave, per pipeline
+
+
+class BatchResult(BaseModel):
+    """
+    The output of a batch run.
+    curations includes topics restored from the checkpoint; failures maps topic -> error message.
+    """
+
+    curations: dict[str, Curation]
+    failures: dict[str, str] = {}
+    skipped: int = 0
+
+
+def read_topics(topic_file: str | Path) -> list[str]:
+    """
+    Read a topic file: one topic per line, blank lines and lines starting with # are ignored.
+    Duplicate topics are only run once.
+    """
+    topics = []
+    seen = set()
+    with open(topic_file, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and line not in seen:
+                seen.add(line)
+                topics.append(line)
+    return topics
+
+
+def load_checkpoint(checkpoint: str | Path) -> dict[str, Curation]:
+    """
+    Load the finished curations from a checkpoint file.
+    A truncated last line (i.e. from a crash mid-write) is ignored.
+    """
+    path = Path(checkpoint)
+    if not path.exists():
+        return {}
+    curations = {}
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            curations[record["topic"]] = Curation(**record["curation"])
+    return curations
+
+
+class Checkpoint:
+    """
+    Append-only JSONL checkpoint. Each line is {"topic": ..., "curation": {...}}.
+    Writing a record costs one line of I/O, no matter how many topics are already done.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        # If a previous run died mid-write, start our records on a fresh line.
+        if self.path.exists() and self.path.stat().st_size:
+            with open(self.path, "rb+") as f:
+                f.seek(-1, 2)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+
+    def append(self, topic: str, curation: Curation) -> None:
+        line = json.dumps({"topic": topic, "curation": curation.model_dump()})
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+                f.flush()
+
+
+def run_pipelines(
+    topics: list[str],
+    pipelines: int = DEFAULT_PIPELINES,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    token_budget: int | None = DEFAULT_TOKEN_BUDGET,
+    fast: bool = False,
+    pipeline: Callable[..., Curation] = Mentor,
+) -> Iterator[tuple[str, Curation | Exception]]:
+    """
+    (topic, Curation or the exception it failed with) for every topic as it finishes, `pipelines` topics at a time.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, pipelines)) as executor:
+        futures = {
+            executor.submit(
+                prioritized(BATCH, pipeline),
+                topic,
+                max_workers=max_workers,
+                token_budget=token_budget,
+                fast=fast,
+            ): topic
+            for topic in topics
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
+
+def _plan_topic(topic: str, fast: bool = False) -> tuple[str | None, Curriculum, Curation | None, bool]:
+    """
+    The curriculum half of Mentor(): (artifact run ID, Curriculum, Curation if the semantic cache had one, cached).
+    """
+    cached = semantic_lookup(topic)
+    if cached is not None and cached[1] is not None:
+        return None, cached[0], cached[1], True
+    with artifact_run() as run_id:
+        if cached is not None:
+            curriculum = cached[0]
+            record_artifact(topic, "curriculum", curriculum)
+        else:
+            curriculum = plan_curriculum(topic, fast=fast)
+    return run_id, curriculum, None, cached is not None
+
+
+def _curate_planned(
+    topic: str,
+    run_id: str,
+    curriculum: Curriculum,
+    retrievals: list[ModuleRetrieval],
+    token_budget: int | None,
+    cached: bool,
+) -> Curation:
+    """
+    The librarian half of Mentor(), in the artifact run the curriculum was recorded under.
+    """
+    with artifact_run(run_id), span("identify_courses", modules=len(curriculum.modules)):
+        curation = librarian_curation(curriculum, retrievals, token_budget=token_budget)
+    if not cached:
+        semantic_store(topic, curriculum, curation)
+    return curation
+
+
+def run_waves(
+    topics: list[str],
+    pipelines: int = DEFAULT_PIPELINES,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    token_budget: int | None = DEFAULT_TOKEN_BUDGET,
+    fast: bool = False,
+    wave_size: int | None = None,
+) -> Iterator[tuple[str, Curation | Exception]]:
+    """
+    Like run_pipelines, but each wave of topics shares one batched retrieval (for the local index).
+    wave_size defaults to WAVE_SIZE_PER_PIPELINE * pipelines.
+    """
+    pipelines = max(1, pipelines)
+    wave_size = max(1, wave_size or WAVE_SIZE_PER_PIPELINE * pipelines)
+    with ThreadPoolExecutor(max_workers=pipelines) as executor:
+        for start in range(0, len(topics), wave_size):
+            planned = []
+            futures = {
+                executor.submit(prioritized(BATCH, _plan_topic), topic, fast): topic
+                for topic in topics[start : start + wave_size]
+            }
+            for future in as_completed(futures):
+                topic = futures[future]
+                try:
+                    run_id, curriculum, curation, cached = future.result()
+                except Exception as e:
+                    yield topic, e
+                    continue
+                if curation is not None:
+                    yield topic, curation
+                else:
+                    planned.append((topic, run_id, curriculum, cached))
+            if not planned:
+                continue
+            retrievals = retrieve_curricula(
+                [curriculum for _, _, curriculum, _ in planned], max_workers=max_workers
+            )
+            futures = {
+                executor.submit(
+                    prioritized(BATCH, _curate_planned),
+                    topic,
+                    run_id,
+                    curriculum,
+                    topic_retrievals,
+                    token_budget,
+                    cached,
+                ): topic
+                for (topic, run_id, curriculum, cached), topic_retrievals in zip(planned, retrievals)
+            }
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except Exception as e:
+                    yield futures[future], e
+
+
+def run_batch(
+    topics: list[str],
+    checkpoint: str | Path = "mentor_checkpoint.jsonl",
+    pipelines: int = DEFAULT_PIPELINES,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    token_budget: int | None = DEFAULT_TOKEN_BUDGET,
+    fast: bool = False,
+    pipeline: Callable[..., Curation] = Mentor,
+) -> BatchResult:
+    """
+    Run the Mentor pipeline for every topic, with at most `pipelines` topics in flight.
+    Topics already in the checkpoint are skipped; failed topics are logged (and returned) and can be retried by re-running.
+    With the scheduler enabled, batch calls queue behind interactive ones.
+    With the local index (and the default pipeline), topics run in waves that share one batched retrieval.
+    """
+    done = load_checkpoint(checkpoint)
+    todo = [topic for topic in topics if topic not in done]
+    logger.info("%d of %d topics already done.", len(topics) - len(todo), len(topics))
+    writer = Checkpoint(checkpoint)
+    curations = {topic: done[topic] for topic in topics if topic in done}
+    failures = {}
+    if todo:
+        if pipeline is Mentor and mentor.local_index is not None:
+            results = run_waves(todo, pipelines, max_workers, token_budget, fast)
+        else:
+            results = run_pipelines(todo, pipelines, max_workers, token_budget, fast, pipeline)
+        for topic, outcome in results:
+            if isinstance(outcome, Exception):
+                failures[topic] = f"{type(outcome).__name__}: {outcome}"
+                logger.warning("Failed: %s (%s)", topic, failures[topic])
+                continue
+            writer.append(topic, outcome)
+            curations[topic] = outcome
+            logger.info("Finished: %s", topic)
+    curations = {topic: curations[topic] for topic in topics if topic in curations}
+    return BatchResult(
+        curations=curations, failures=failures, skipped=len(topics) - len(todo)
+    )
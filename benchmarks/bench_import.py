@@ -0,0 +1,74 @@
+"""
+Import-time benchmark for Mentor.
+
+Measures the cost of `import Mentor` in fresh interpreters (timed inside the interpreter, so Python's own startup
+isn't counted), and checks that importing Mentor doesn't pull in heavy dependencies or touch the filesystem.
+
+Usage:
+    python benchmarks/bench_import.py --runs 10 --max-ms 300
+Exits non-zero if the median import time exceeds --max-ms or a heavy module gets imported.
+"""
+
+from pathlib import Path
+import subprocess
+import statistics
+import argparse
+import tempfile
+import json
+import sys
+import os
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# Modules that must only be loaded on first use.
+HEAVY_MODULES = ["Chain", "Curator", "Get", "numpy", "chromadb", "FlagEmbedding", "anthropic", "openai", "jinja2"]
+
+PROBE = """
+import json, os, sys, time
+start = time.perf_counter()
+import Mentor
+elapsed = time.perf_counter() - start
+print(json.dumps({"import_s": elapsed, "loaded": [m for m in HEAVY if m in sys.modules], "files": os.listdir(".")}))
+"""
+
+
+def probe(module_path: Path, cwd: str) -> dict:
+    """
+    Import Mentor in a fresh interpreter (run in an empty directory, so we can see any files it creates).
+    """
+    code = f"HEAVY = {HEAVY_MODULES!r}\n" + PROBE
+    env = dict(os.environ, PYTHONPATH=str(module_path))
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cost of importing Mentor.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--max-ms", type=float, default=None, help="Fail if the median import time exceeds this."
+    )
+    args = parser.parse_args()
+    failures = []
+    with tempfile.TemporaryDirectory() as cwd:
+        results = [probe(REPO_DIR, cwd) for _ in range(args.runs)]
+    times = [result["import_s"] * 1000 for result in results]
+    median = statistics.median(times)
+    print(f"import Mentor: median {median:.1f} ms, min {min(times):.1f} ms, max {max(times):.1f} ms over {args.runs} runs")
+    loaded = sorted({module for result in results for module in result["loaded"]})
+    if loaded:
+        failures.append(f"heavy modules imported eagerly: {', '.join(loaded)}")
+    files = sorted({file for result in results for file in result["files"]})
+    if files:
+        failures.append(f"import created files: {', '.join(files)}")
+    if args.max_ms is not None and median > args.max_ms:
+        failures.append(f"median import time {median:.1f} ms exceeds {args.max_ms:.1f} ms")
+    for failure in failures:
+        print("FAIL:", failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Offline benchmark for the Mentor pipeline.
+
+Runs the full pipeline (Mentor + Curation.curation_TOCs) over a fixed topic corpus with deterministic local fakes
+for Chain, Curator and Get (see fakes.py), so what we measure is the orchestration code plus the simulated latency.
+Reports runs/sec, p50/p95 latency per topic, and peak memory.
+
+Usage:
+    python benchmarks/bench_pipeline.py --pipelines 4 --llm-latency 0.05 --json bench.json
+"""
+
+from pathlib import Path
+import argparse
+import statistics
+import math
+import resource
+import shutil
+import json
+import time
+import sys
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCHMARK_DIR.parent))
+sys.path.insert(0, str(BENCHMARK_DIR))
+
+from fakes import FakeConfig, install
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Nearest-rank percentile.
+    """
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def run_benchmark(
+    topics: list[str],
+    config: FakeConfig,
+    pipelines: int = 1,
+    repeat: int = 1,
+    fast: bool = False,
+    speculative: bool = False,
+    hedge: bool = False,
+    message_log: str | None = None,
+) -> dict:
+    """
+    Run every topic `repeat` times with `pipelines` topics in flight. Returns the report as a dict.
+    message_log: None (no message logging), "json" (one JSON file, rewritten per message) or "runlog".
+    """
+    install(config)
+    # Imported after install() so Mentor picks up the fakes.
+    from concurrent.futures import ThreadPoolExecutor
+    import tempfile
+    import Mentor
+    from speculative import Mentor_speculative
+
+    pipeline = Mentor_speculative if speculative else Mentor.Mentor
+    Mentor.course_TOC.cache_clear()
+    log_dir = tempfile.mkdtemp(prefix="mentor-bench-log-") if message_log else None
+    Mentor.configure_message_store(
+        str(Path(log_dir) / "log.json") if message_log == "json" else None,
+        log_dir if message_log == "runlog" else None,
+    )
+    if hedge:
+        # No latency history yet in a fresh process: start hedging at a few times the typical latency.
+        Mentor.enable_hedging(default_deadline=4 * config.llm_latency)
+    else:
+        Mentor.disable_hedging()
+
+    def run_one(topic: str) -> float:
+        start = time.perf_counter()
+        curation = pipeline(topic, fast=fast)
+        curation.curation_TOCs()
+        return time.perf_counter() - start
+
+    workload = [topic for _ in range(repeat) for topic in topics]
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, pipelines)) as executor:
+            latencies = list(executor.map(run_one, workload))
+        # Include writing out whatever the run log still has queued.
+        if Mentor.run_log is not None:
+            Mentor.run_log.close()
+        wall = time.perf_counter() - start
+    finally:
+        if log_dir is not None:
+            shutil.rmtree(log_dir, ignore_errors=True)
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return {
+        "config": config.model_dump(),
+        "pipelines": pipelines,
+        "fast": fast,
+        "speculative": speculative,
+        "hedge": hedge,
+        "hedge_stats": Mentor.router.stats.model_dump() if hedge else None,
+        "message_log": message_log,
+        "runs": len(workload),
+        "wall_s": wall,
+        "runs_per_s": len(workload) / wall,
+        "p50_s": statistics.median(latencies),
+        "p95_s": percentile(latencies, 95),
+        "max_s": max(latencies),
+        "peak_rss_mb": peak_mb,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Mentor offline.")
+    parser.add_argument(
+        "--topics",
+        type=str,
+        default=str(BENCHMARK_DIR / "topics.txt"),
+        help="Topic file, one per line (default: the 20 example topics).",
+    )
+    parser.add_argument("--pipelines", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--fast", action="store_true", help="Benchmark fast mode.")
+    parser.add_argument(
+        "--speculative",
+        action="store_true",
+        help="Benchmark speculative retrieval (combine with --streaming to see the overlap).",
+    )
+    parser.add_argument(
+        "--hedge",
+        action="store_true",
+        help="Hedge slow primary calls with the fallback model (combine with --stall-probability).",
+    )
+    parser.add_argument(
+        "--message-log",
+        choices=["json", "runlog"],
+        help="Log messages to one JSON file (rewritten per message, like Chain's MessageStore) or to the run log.",
+    )
+    for field, info in FakeConfig.model_fields.items():
+        if isinstance(info.default, bool):
+            parser.add_argument("--" + field.replace("_", "-"), action="store_true")
+        else:
+            parser.add_argument(
+                "--" + field.replace("_", "-"),
+                type=type(info.default),
+                default=info.default,
+            )
+    parser.add_argument("--json", type=str, help="Also write the report here.")
+    args = parser.parse_args()
+    topics = [
+        line.strip() for line in Path(args.topics).read_text().splitlines() if line.strip()
+    ]
+    config = FakeConfig(**{field: getattr(args, field) for field in FakeConfig.model_fields})
+    report = run_benchmark(topics, config, pipelines=args.pipelines, repeat=args.repeat, fast=args.fast, speculative=args.speculative, hedge=args.hedge, message_log=args.message_log)
+    print(
+        f"{report['runs']} runs in {report['wall_s']:.2f}s: {report['runs_per_s']:.2f} runs/s, "
+        f"p50 {report['p50_s'] * 1000:.1f} ms, p95 {report['p95_s'] * 1000:.1f} ms, "
+        f"peak RSS {report['peak_rss_mb']:.1f} MB"
+    )
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Deterministic local stand-ins for Chain, Curator, Get and review_certificates, for benchmarking (and testing) Mentor
+offline.
+
+install() puts fake modules into sys.modules, so it must run before Mentor is imported.
+Outputs are derived from a hash of the inputs (same input, same output, every run), and every call sleeps for
+a configurable latency to stand in for the network.
+"""
+
+from pydantic import BaseModel
+import hashlib
+import json
+import re
+import threading
+import types
+import time
+import sys
+
+
+class FakeConfig(BaseModel):
+    """
+    Latencies are in seconds. Sizes control how much text the fakes return.
+    """
+
+    llm_latency: float = 0.05
+    curate_latency: float = 0.01
+    get_latency: float = 0.005
+    modules: int = 8
+    hits: int = 10
+    catalog_size: int = 400
+    description_chars: int = 200
+    ideal_curriculum_chars: int = 4000
+    selected_courses: int = 8
+    # Give the fake Model a stream() method that spreads llm_latency over stream_chunks chunks.
+    streaming: bool = False
+    stream_chunks: int = 20
+    # Make a fraction of stall_model's calls (chosen by hash, so reproducible) take stall_latency instead, to exercise hedging.
+    stall_model: str = "claude"
+    stall_probability: float = 0.0
+    stall_latency: float = 1.0
+
+
+def _digest(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:12], 16)
+
+
+def _filler(seed: int, chars: int) -> str:
+    words = ["skills", "learning", "modules", "practical", "foundations", "advanced"]
+    text = []
+    while sum(len(word) + 1 for word in text) < chars:
+        text.append(words[(seed + len(text)) % len(words)])
+    return " ".join(text)[:chars]
+
+
+def _curriculum(seed: int, topic: str, config: FakeConfig) -> dict:
+    return {
+        "topic": topic,
+        "description": _filler(seed, config.description_chars),
+        "audience": "Professionals",
+        "modules": [
+            {
+                "title": f"Module {(seed + i) % 997}",
+                "description": _filler(seed + i, config.description_chars),
+                "learning_objectives": [_filler(seed + i + j, 60) for j in range(3)],
+            }
+            for i in range(config.modules)
+        ],
+    }
+
+
+def _ideal_curriculum(seed: int, config: FakeConfig) -> str:
+    return (
+        "<curriculum_description>\n"
+        + _filler(seed, config.ideal_curriculum_chars)
+        + "\n</curriculum_description>"
+    )
+
+
+def _content(message) -> str:
+    return message["content"] if isinstance(message, dict) else message.content
+
+
+def _tag(text: str, tag: str) -> str:
+    match = re.search(rf"<{tag}>\s*(.*?)\s*</{tag}>", text, re.S)
+    return match.group(1) if match else ""
+
+
+def build_chain_module(config: FakeConfig) -> types.ModuleType:
+    """
+    A module exposing the parts of Chain that Mentor uses.
+    """
+    from jinja2 import Template
+
+    class Message(BaseModel):
+        role: str
+        content: str
+
+    def create_system_message(content: str) -> Message:
+        return Message(role="system", content=content)
+
+    class Prompt:
+        def __init__(self, prompt_string: str):
+            self.prompt_string = prompt_string
+
+        def render(self, input_variables: dict) -> str:
+            return Template(self.prompt_string).render(**input_variables)
+
+    class Model:
+        def __init__(self, model: str):
+            self.model = model
+
+        def query(self, input, verbose: bool = True, pydantic_model=None):
+            """
+            Like Chain's Model.query: a prompt string or messages list in, a string or pydantic_model instance out.
+            Answers from the tags in the rendered prompt (<topic>, <courses>).
+            """
+            rendered = input if isinstance(input, str) else _content(input[-1])
+            seed = _digest(rendered)
+            stalled = (
+                self.model == config.stall_model
+                and _digest(rendered + self.model) % 1000 < config.stall_probability * 1000
+            )
+            time.sleep(config.stall_latency if stalled else config.llm_latency)
+            if pydantic_model is None:
+                return _ideal_curriculum(seed, config)
+            topic = _tag(rendered, "topic")
+            if "modules" in pydantic_model.model_fields:
+                return pydantic_model(**_curriculum(seed, topic, config))
+            # The librarian: pick the first few candidates from the course context.
+            if "course_ids" in pydantic_model.model_fields:
+                return pydantic_model(course_ids=list(range(1, config.selected_courses + 1)))
+            titles = [
+                line.split(": ", 1)[0].split("] ", 1)[-1]
+                for line in _tag(rendered, "courses").splitlines()
+                if ": " in line
+            ]
+            return pydantic_model(topic=topic, course_titles=titles[: config.selected_courses])
+
+        def _stream(self, messages):
+            """
+            Streams curriculum JSON if the prompt asks for JSON, otherwise an ideal curriculum.
+            """
+            rendered = _content(messages[-1])
+            seed = _digest(rendered)
+            if "JSON schema" in rendered:
+                text = json.dumps(_curriculum(seed, _tag(rendered, "topic"), config))
+            else:
+                text = _ideal_curriculum(seed, config)
+            size = max(1, -(-len(text) // config.stream_chunks))
+            for start in range(0, len(text), size):
+                time.sleep(config.llm_latency / config.stream_chunks)
+                yield text[start : start + size]
+
+        if config.streaming:
+            stream = _stream
+
+    class Parser:
+        def __init__(self, pydantic_model):
+            self.pydantic_model = pydantic_model
+
+    class MessageStore:
+        """
+        Like Chain's: keeps every message and rewrites the whole JSON log file on each add().
+        """
+
+        def __init__(self, log_file: str | None = None):
+            self.log_file = log_file
+            self.messages = []
+            self._lock = threading.Lock()
+
+        def add(self, messages) -> None:
+            messages = messages if isinstance(messages, list) else [messages]
+            with self._lock:
+                self.messages.extend(
+                    m.model_dump() if isinstance(m, BaseModel) else m for m in messages
+                )
+                if self.log_file:
+                    with open(self.log_file, "w") as f:
+                        json.dump(self.messages, f, default=str)
+
+    class Response:
+        def __init__(self, content):
+            self.content = content
+
+    class Chain:
+        _message_store = None
+
+        def __init__(self, prompt=None, model=None, parser=None):
+            self.prompt = prompt
+            self.model = model
+            self.parser = parser
+
+        def run(self, input_variables=None, verbose=True, messages=[]):
+            """
+            Like Chain's run_messages: log the messages, then the model's query, then log the answer.
+            """
+            rendered = self.prompt.render(input_variables or {})
+            messages = list(messages) + [{"role": "user", "content": rendered}]
+            if Chain._message_store:
+                Chain._message_store.add(messages)
+            result = self.model.query(
+                messages,
+                verbose=verbose,
+                pydantic_model=self.parser.pydantic_model if self.parser else None,
+            )
+            if Chain._message_store:
+                Chain._message_store.add({"role": "assistant", "content": result})
+            return Response(result)
+
+    module = types.ModuleType("Chain")
+    for obj in (Message, Prompt, Model, Parser, MessageStore, Chain):
+        setattr(module, obj.__name__, obj)
+    module.create_system_message = create_system_message
+    return module
+
+
+def build_curator_module(config: FakeConfig) -> types.ModuleType:
+    def Curate(query: str, *args, **kwargs) -> list[tuple[str, str]]:
+        time.sleep(config.curate_latency)
+        seed = _digest(query)
+        return [
+            (
+                f"Course {(seed + i * 7) % config.catalog_size}",
+                _filler(seed + i, config.description_chars),
+            )
+            for i in range(config.hits)
+        ]
+
+    module = types.ModuleType("Curator")
+    module.Curate = Curate
+    return module
+
+
+def build_get_module(config: FakeConfig) -> types.ModuleType:
+    class Course:
+        def __init__(self, title: str):
+            seed = _digest(title)
+            self.title = title
+            self.course_TOC_verbose = (
+                f"{title}\n"
+                + "\n".join(
+                    f"  Chapter {i}: {_filler(seed + i, 40)}" for i in range(1, 6)
+                )
+                + "\n"
+            )
+
+    def Get(title: str) -> Course:
+        time.sleep(config.get_latency)
+        return Course(title)
+
+    module = types.ModuleType("Get")
+    module.Get = Get
+    return module
+
+
+def build_review_certificates_module(config: FakeConfig) -> types.ModuleType:
+    """
+    The parts of review_certificates that editing_mode uses. Like the real one, the critique is a plain Chain call
+    (on its own Model("gpt")), so it goes through whatever Mentor wraps around Chain.
+    """
+
+    def review_curriculum(curation, audience: str) -> str:
+        import Chain
+
+        prompt = Chain.Prompt("Critique this curation of {{topic}} for {{audience}}:\n{{curation}}")
+        chain = Chain.Chain(prompt, Chain.Model("gpt"))
+        variables = {"topic": curation.topic, "audience": audience, "curation": curation}
+        return chain.run(input_variables=variables).content
+
+    def create_curriculum_text_for_review(curation) -> str:
+        return curation.curation_TOCs()
+
+    def learner_progression(curation) -> str:
+        return review_curriculum(curation, "learners")
+
+    module = types.ModuleType("review_certificates")
+    module.review_curriculum = review_curriculum
+    module.create_curriculum_text_for_review = create_curriculum_text_for_review
+    module.learner_progression = learner_progression
+    return module
+
+
+def install(config: FakeConfig | None = None) -> FakeConfig:
+    """
+    Replace Chain, Curator, Get and review_certificates in sys.modules with the fakes. Call before importing Mentor.
+    """
+    config = config or FakeConfig()
+    sys.modules["Chain"] = build_chain_module(config)
+    sys.modules["Curator"] = build_curator_module(config)
+    sys.modules["Get"] = build_get_module(config)
+    sys.modules["review_certificates"] = build_review_certificates_module(config)
+    return config
@@ -0,0 +1,122 @@
+"""
+Blacklist of courses we never want to recommend (vendor-produced content), compiled once into a fast matcher.
+
+blacklist.conf has one rule per line; blank lines and lines starting with # are ignored:
+    IBM                        publisher: the word or phrase appears in the course's publisher (case-insensitive, whole words)
+    publisher:IBM              the same, spelled out
+    exact:Excel Essential Training      the whole title matches (case-insensitive)
+    prefix:Microsoft           the title starts with this (case-insensitive)
+    regex:^AWS\\b.*Certification   a Python regex, searched in the title case-insensitively
+
+Bare vendor names only ever match the publisher: "Microsoft Excel Essential Training" is a course about a vendor's
+product, not necessarily one the vendor produced. Matching a title takes an explicit exact:, prefix: or regex: rule.
+Publisher rules need publisher metadata for each hit (see Mentor.course_publisher); without it only title rules apply.
+
+Matching cost doesn't grow with the number of rules (except regex rules, which are combined into one pattern):
+exact rules are a set lookup, publisher keywords are looked up by word n-gram, and prefixes by the distinct prefix lengths.
+"""
+
+from pathlib import Path
+from typing import Callable
+import re
+
+DEFAULT_BLACKLIST = Path(__file__).resolve().parent / "blacklist.conf"
+
+WORD = re.compile(r"\w+")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+class Blacklist:
+    """
+    A compiled set of blacklist rules. Build with Blacklist.load(path) or Blacklist(rules).
+    """
+
+    def __init__(self, rules: list[str]):
+        self.rules = list(rules)
+        self.exact: set[str] = set()
+        self.prefixes: set[str] = set()
+        self.publishers: set[str] = set()
+        patterns = []
+        for rule in rules:
+            kind, _, value = rule.partition(":")
+            if kind in ("exact", "prefix", "regex", "publisher") and value.strip():
+                value = value.strip()
+            else:
+                kind, value = "publisher", rule.strip()
+            if kind == "exact":
+                self.exact.add(_normalize(value))
+            elif kind == "prefix":
+                self.prefixes.add(_normalize(value))
+            elif kind == "regex":
+                re.compile(value)  # fail loudly on a bad rule
+                patterns.append(f"(?:{value})")
+            else:
+                self.publishers.add(" ".join(WORD.findall(value.casefold())))
+        self.publishers.discard("")
+        self.prefix_lengths = sorted({len(prefix) for prefix in self.prefixes})
+        self.max_publisher_words = max(
+            (len(publisher.split()) for publisher in self.publishers), default=0
+        )
+        self.regex = re.compile("|".join(patterns), re.IGNORECASE) if patterns else None
+
+    @classmethod
+    def load(cls, path: str | Path = DEFAULT_BLACKLIST) -> "Blacklist":
+        with open(path, "r") as f:
+            rules = [
+                line.strip()
+                for line in f
+                if line.strip() and not line.strip().startswith("#")
+            ]
+        return cls(rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def title_matches(self, title: str | None) -> bool:
+        if not title:
+            return False
+        normalized = _normalize(title)
+        if normalized in self.exact:
+            return True
+        for length in self.prefix_lengths:
+            if length > len(normalized):
+                break
+            if normalized[:length] in self.prefixes:
+                return True
+        return self.regex is not None and self.regex.search(title) is not None
+
+    def publisher_matches(self, publisher: str | None) -> bool:
+        if not publisher or not self.publishers:
+            return False
+        words = WORD.findall(publisher.casefold())
+        for start in range(len(words)):
+            for end in range(start + 1, min(len(words), start + self.max_publisher_words) + 1):
+                if " ".join(words[start:end]) in self.publishers:
+                    return True
+        return False
+
+    def matches(self, title: str | None, publisher: str | None = None) -> bool:
+        """
+        True if the title matches a title rule or the publisher matches a publisher rule.
+        """
+        return self.title_matches(title) or self.publisher_matches(publisher)
+
+    def filter(
+        self,
+        courses: list[tuple[str, str]],
+        publisher_of: Callable[[str], str | None] | None = None,
+    ) -> tuple[list[tuple[str, str]], int]:
+        """
+        Drop blacklisted (title, description) hits. Returns the kept hits and how many were removed.
+        publisher_of(title) supplies each hit's publisher; descriptions are never matched (they often mention
+        vendors whose products a course merely teaches).
+        """
+        kept = [
+            course
+            for course in courses
+            if not self.matches(course[0], publisher_of(course[0]) if publisher_of else None)
+        ]
+        return kept, len(courses) - len(kept)
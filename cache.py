@@ -0,0 +1,323 @@
+"""
+Disk-backed, content-addressed cache.
+
+Entries are keyed by a hash of whatever makes a result unique (for LLM calls: model, system message, rendered prompt and parser schema).
+Eviction is LRU, bounded by total size and by age.
+
+RetrievalCache puts an in-memory LRU in front of a DiskCache for Curate lookups.
+"""
+
+from pydantic import BaseModel
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+import unicodedata
+import threading
+import importlib.util
+import warnings
+import os
+import re
+import sqlite3
+import hashlib
+import json
+import time
+
+DEFAULT_CACHE_DIR = Path(".mentor_cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60  # seconds
+CHROMA_FILE = "chroma.sqlite3"
+
+
+def cache_key(*parts) -> str:
+    """
+    Hash the parts into a stable hex digest. Parts must be JSON serializable (anything else is str()'d).
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    A key/value store in a single SQLite file, safe to share between threads.
+    get() refreshes an entry's access time; set() evicts expired entries, then least recently used ones until under max_bytes.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float | None = DEFAULT_MAX_AGE,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+            )
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, created FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self.max_age is not None and now - created > self.max_age:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (now, key)
+            )
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._evict(now)
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def _evict(self, now: float) -> None:
+        """
+        Caller holds the lock.
+        """
+        if self.max_age is not None:
+            self._conn.execute(
+                "DELETE FROM entries WHERE created < ?", (now - self.max_age,)
+            )
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed ASC"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+
+
+# Retrieval cache
+# ------------------------------------------------
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a retrieval query so that near-identical modules share a cache entry:
+    unicode normalization, case folding, punctuation stripped, whitespace collapsed.
+    """
+    query = unicodedata.normalize("NFKC", query).casefold()
+    query = re.sub(r"[^\w\s]", " ", query)
+    return " ".join(query.split())
+
+
+def find_catalog() -> Path | None:
+    """
+    The chroma persist directory holding the course collection: $MENTOR_CATALOG_PATH, or else the directory
+    containing chroma.sqlite3 inside the installed Curator package.
+    """
+    path = os.environ.get("MENTOR_CATALOG_PATH")
+    if path:
+        return Path(path)
+    spec = importlib.util.find_spec("Curator")
+    if spec is None or spec.origin is None:
+        return None
+    stores = sorted(Path(spec.origin).parent.rglob(CHROMA_FILE))
+    return stores[0].parent if stores else None
+
+
+def catalog_fingerprint(path: str | Path | None = None) -> str:
+    """
+    Fingerprint the course collection: the names, sizes and modification times of the files in its chroma persist
+    directory (see find_catalog), which change whenever the collection is written. Source and bytecode files are ignored.
+    Returns "unknown", with a warning, if no catalog can be found; the cache then never invalidates on its own.
+    """
+    path = Path(path) if path is not None else find_catalog()
+    if path is None or not path.exists():
+        warnings.warn(
+            "Course catalog not found (set MENTOR_CATALOG_PATH to the chroma persist directory); "
+            "cached Curate results won't be invalidated when the catalog changes.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return "unknown"
+    files = (
+        [path]
+        if path.is_file()
+        else sorted(
+            p
+            for p in path.rglob("*")
+            if p.is_file() and "__pycache__" not in p.parts and p.suffix not in (".py", ".pyc")
+        )
+    )
+    digest = hashlib.sha256()
+    for file in files:
+        stat = file.stat()
+        digest.update(f"{file}:{stat.st_size}:{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class CacheStats(BaseModel):
+    """
+    Counters for a RetrievalCache. time_saved sums, over hits, the original retrieval time minus the lookup time.
+    """
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    miss_time: float = 0.0
+    time_saved: float = 0.0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"Retrieval cache: {self.hits} hits ({self.memory_hits} memory, {self.disk_hits} disk), "
+            f"{self.misses} misses, hit rate {self.hit_rate:.0%}, ~{self.time_saved:.2f}s saved"
+        )
+
+
+class RetrievalCache:
+    """
+    Two-tier cache for Curate results: an in-memory LRU in front of a DiskCache.
+    Keys are the normalized query plus the catalog version, so a changed course collection invalidates everything.
+    The catalog version is re-checked at most every version_ttl seconds.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_CACHE_DIR / "retrieval.sqlite",
+        catalog_version: Callable[[], str] = catalog_fingerprint,
+        memory_size: int = 1024,
+        version_ttl: float = 60.0,
+        **kwargs,
+    ):
+        self.disk = DiskCache(path, **kwargs)
+        self.catalog_version = catalog_version
+        self.memory_size = memory_size
+        self.version_ttl = version_ttl
+        self.stats = CacheStats()
+        # key -> (courses, seconds the original retrieval took)
+        self._memory: OrderedDict[str, tuple[list[tuple[str, str]], float]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_checked = 0.0
+
+    def version(self) -> str:
+        """
+        The current catalog version. Clears the memory tier when it changes.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._version is not None and now - self._version_checked < self.version_ttl:
+                return self._version
+        version = self.catalog_version()
+        with self._lock:
+            if version != self._version:
+                self._memory.clear()
+            self._version = version
+            self._version_checked = now
+        return version
+
+    def key(self, query: str) -> str:
+        return cache_key("retrieval", self.version(), normalize_query(query))
+
+    def get(self, query: str) -> tuple[list[tuple[str, str]], float] | None:
+        """
+        Return (courses, original retrieval time) for query, or None.
+        """
+        key = self.key(query)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+                return self._memory[key]
+        cached = self.disk.get(key)
+        if cached is None:
+            return None
+        record = json.loads(cached)
+        entry = ([tuple(course) for course in record["courses"]], record["elapsed"])
+        with self._lock:
+            self.stats.disk_hits += 1
+            self._remember(key, entry)
+        return entry
+
+    def set(
+        self, query: str, courses: list[tuple[str, str]], elapsed: float = 0.0
+    ) -> None:
+        key = self.key(query)
+        entry = ([tuple(course) for course in courses], elapsed)
+        self.disk.set(key, json.dumps({"courses": entry[0], "elapsed": elapsed}))
+        with self._lock:
+            self._remember(key, entry)
+
+    def lookup(
+        self, query: str, retrieve: Callable[[str], list[tuple[str, str]]]
+    ) -> list[tuple[str, str]]:
+        """
+        Return the cached results for query, or call retrieve(query) and cache them.
+        """
+        start = time.perf_counter()
+        entry = self.get(query)
+        if entry is not None:
+            courses, original = entry
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stats.time_saved += max(0.0, original - elapsed)
+            return courses
+        courses = retrieve(query)
+        elapsed = time.perf_counter() - start
+        self.set(query, courses, elapsed)
+        with self._lock:
+            self.stats.misses += 1
+            self.stats.miss_time += elapsed
+        return courses
+
+    def _remember(self, key: str, entry: tuple[list[tuple[str, str]], float]) -> None:
+        """
+        Caller holds the lock.
+        """
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
@@ -1,4 +1,4 @@
-from Chain import Prompt, Model, Chain, MessageStore
+from Chain import Prompt, Model, Chain
 from review_certificates import (
     review_curriculum,
     learner_progression,
@@ -6,7 +6,6 @@ from review_certificates import (
 )
 from Mentor import Mentor
 
-Chain.message_store = MessageStore(log_file="log.json")
 
 react_prompt = """
 You are an AI agent tasked with improving a curriculum curation for a skill-based learning program. 
@@ -1,13 +1,11 @@
-from Chain import Prompt, Model, Chain, MessageStore
+from Chain import Prompt, Model, Chain
 from review_certificates import (
     review_curriculum,
     learner_progression,
     create_curriculum_text_for_review,
 )
-from Mentor import Mentor
-import pickle
+from Mentor import Mentor, enable_artifact_store, artifact_run, record_artifact
 
-Chain.message_store = MessageStore(log_file="log.json")
 
 example_topics = """
 Leadership Pipeline for Enterprise Growth
@@ -98,21 +96,16 @@ ReACT is not quite right here, how we define the fuction.
 """
 
 if __name__ == "__main__":
-    with open("cached.pkl", "rb") as f:
-        cached = pickle.load(f)
-    print(f"{len(cached)} objects cached")
+    # Each topic's outputs are appended to the artifact store (import the old cached.pkl with `python artifacts.py import`).
+    store = enable_artifact_store("artifacts.db")
+    print(f"{len(store)} artifacts stored")
     for topic in example_topics:
-        c = Mentor(topic)
-        critique = review_curriculum(c, "Data Scientists")
-        curriculum = create_curriculum_text_for_review(c)
-        input_variables = {
-            "CURRICULUM": curriculum,
-            "CURATION_OBJECT": c.model_dump(),
-            "CRITIQUE": critique,
-        }
-        cached.append(input_variables)
-        with open("cached.pkl", "wb") as f:
-            pickle.dump(cached, f)
+        with artifact_run():
+            c = Mentor(topic)
+            critique = review_curriculum(c, "Data Scientists")
+            curriculum = create_curriculum_text_for_review(c)
+            record_artifact(topic, "curriculum_text", curriculum)
+            record_artifact(topic, "critique", critique)
 
 
 """
@@ -0,0 +1,269 @@
+"""
+Executable version of the ReACT editing loop sketched in 3_reACT_prompting.py / 4_reACT_prompting_with_caching.py.
+
+Each turn, the model thinks and emits <function_call>Get_alternative_courses(description="...")</function_call> tags.
+We execute every call in the turn concurrently (retrieval through Mentor's active engine, then the TOCs via Get),
+append the observations to the transcript, and go again, until the model answers with <improved_curation>.
+Observations are memoised by description, across iterations and across topics in the same process (the
+MAX_OBSERVATIONS most recently used).
+
+The loop is bounded: after max_iterations turns, or once the estimated tokens would exceed token_budget, the model
+is told to give its final answer. If it still doesn't produce a valid curation, the original one is kept.
+"""
+
+from Mentor import (
+    Curation,
+    course_TOC,
+    search_courses,
+    active_blacklist,
+    course_publisher,
+    run_chain,
+    render_prompt,
+    estimate_tokens,
+)
+from speculative import extract_json
+from titles import TitleIndex, repair_titles
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from pydantic import BaseModel, ValidationError
+from typing import Literal
+import threading
+import re
+
+DEFAULT_MAX_ITERATIONS = 4
+DEFAULT_TOKEN_BUDGET = 60000
+ALTERNATIVES = 5
+MAX_OBSERVATIONS = 256
+
+persona_editor = """
+You are an experienced Learning and Development (L&D) professional who edits curated learning paths of video courses.
+""".strip()
+
+react_prompt = """
+You are an AI agent tasked with improving a curriculum curation for a skill-based learning program.
+Your goal is to analyze the current curation, consider the critique provided, and make improvements
+by potentially adding, removing, or replacing courses.
+
+Here is the current curation object:
+<curation_object>
+{{CURATION_OBJECT}}
+</curation_object>
+
+Here is the current curriculum (detailed table of contents for each course):
+<curriculum>
+{{CURRICULUM}}
+</curriculum>
+
+Here is a critique of the current curation:
+<critique>
+{{CRITIQUE}}
+</critique>
+
+You have access to the following function:
+
+Get_alternative_courses(description: str) -> List[str]
+This function takes a brief description (1-2 sentences) of desired course content and returns a list
+of 5 alternative course titles with their table of contents.
+
+To improve the curation, follow these steps using the ReACT framework:
+
+1. Thought: Analyze the current curation, curriculum, and critique. Identify areas for improvement.
+2. Action: Decide on a course of action (e.g., remove a course, add a new course, replace a course).
+3. Function Call: If adding or replacing a course, use the Get_alternative_courses function to find
+options. You can make several function calls in one step.
+4. Observation: Stop after your function calls. The results will be given back to you in <observation> tags;
+don't write observations yourself.
+5. Repeat steps 1-4 as needed until you have made all necessary improvements.
+
+For each step, use the following format:
+<thought>Your thought process</thought>
+<action>Your chosen action</action>
+<function_call>Get_alternative_courses(description="Your description")</function_call>
+
+Once you have finished improving the curation, provide your final output in this format:
+<improved_curation>
+{
+  "topic": "Updated topic if changed",
+  "course_titles": [
+    "Updated list of course titles"
+  ]
+}
+</improved_curation>
+<explanation>
+Briefly explain the changes you made and why they improve the curation based on the critique and
+your analysis.
+</explanation>
+{% if TRANSCRIPT %}
+
+Here is your work so far:
+<transcript>
+{{TRANSCRIPT}}
+</transcript>
+{% endif %}
+{% if FINAL %}
+
+You can't make any more function calls. Provide your <improved_curation> and <explanation> now.
+{% endif %}
+""".strip()
+
+FUNCTION_CALL = re.compile(
+    r"<function_call>\s*Get_alternative_courses\(\s*(?:description\s*=\s*)?(?P<quote>\"\"\"|\"|')(?P<description>.*?)(?P=quote)\s*\)\s*</function_call>",
+    re.S,
+)
+IMPROVED_CURATION = re.compile(r"<improved_curation>(.*?)</improved_curation>", re.S)
+EXPLANATION = re.compile(r"<explanation>(.*?)</explanation>", re.S)
+
+# Observations by normalized description, shared by every run in this process, least recently used first: (titles, text).
+observations: OrderedDict[str, tuple[list[str], str]] = OrderedDict()
+_observations_lock = threading.Lock()
+
+
+def clear_observations() -> None:
+    with _observations_lock:
+        observations.clear()
+
+
+def get_alternative_courses(description: str) -> tuple[list[str], str]:
+    """
+    The tool: the top 5 courses for a description. Returns their titles and their tables of contents.
+    """
+    courses = search_courses(description)
+    blacklist = active_blacklist()
+    if blacklist is not None:
+        courses, _ = blacklist.filter(courses, publisher_of=course_publisher)
+    titles = [title for title, *_ in courses[:ALTERNATIVES]]
+    with ThreadPoolExecutor(max_workers=max(1, len(titles))) as executor:
+        tocs = list(executor.map(course_TOC, titles))
+    return titles, "\n".join(tocs)
+
+
+def observe(
+    descriptions: list[str], max_workers: int = 8
+) -> tuple[list[tuple[list[str], str]], int]:
+    """
+    Run a turn's calls concurrently, reusing memoised observations. Returns the observations (in call order)
+    and how many came from the memo. Failed calls are reported to the model and not memoised.
+    """
+    keys = [" ".join(description.casefold().split()) for description in descriptions]
+    with _observations_lock:
+        known = {key: observations[key] for key in keys if key in observations}
+        for key in known:
+            observations.move_to_end(key)
+    missing = {
+        key: description
+        for key, description in zip(keys, descriptions)
+        if key not in known
+    }
+    fresh = {}
+    if missing:
+        workers = max(1, min(max_workers, len(missing)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                key: executor.submit(copy_context().run, get_alternative_courses, description)
+                for key, description in missing.items()
+            }
+            for key, future in futures.items():
+                try:
+                    fresh[key] = future.result()
+                except Exception as e:
+                    fresh[key] = ([], f"Error: {type(e).__name__}: {e}")
+                else:
+                    with _observations_lock:
+                        observations[key] = fresh[key]
+                        while len(observations) > MAX_OBSERVATIONS:
+                            observations.popitem(last=False)
+    cached = sum(1 for key in keys if key in known)
+    return [known.get(key) or fresh[key] for key in keys], cached
+
+
+class ReactResult(BaseModel):
+    """
+    The outcome of an editing run. stopped says why the loop ended.
+    """
+
+    curation: Curation
+    improved: bool = False
+    explanation: str | None = None
+    iterations: int = 0
+    calls: int = 0
+    cached_calls: int = 0
+    tokens: int = 0
+    stopped: Literal["answer", "max_iterations", "token_budget"] = "answer"
+    corrected_titles: int = 0
+    unmatched_titles: list[str] = []
+
+
+def improve_curation(
+    curation: Curation,
+    curriculum: str,
+    critique: str,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    model_name: str = "gpt",
+) -> ReactResult:
+    """
+    Run the ReACT loop until the model returns an improved curation, or the iteration/token limits are hit.
+    The returned titles are checked against everything the model saw (see titles.py).
+    """
+    transcript = []
+    seen_titles = list(curation.course_titles)
+    result = ReactResult(curation=curation)
+    final = False
+    while True:
+        input_variables = {
+            "CURATION_OBJECT": curation.model_dump(),
+            "CURRICULUM": curriculum,
+            "CRITIQUE": critique,
+            "TRANSCRIPT": "\n".join(transcript),
+            "FINAL": final,
+        }
+        prompt_tokens = estimate_tokens(
+            persona_editor + render_prompt(react_prompt, input_variables)
+        )
+        if not final and result.tokens + prompt_tokens > token_budget:
+            result.stopped, final = "token_budget", True
+            continue
+        response = run_chain(
+            react_prompt, persona_editor, input_variables, model_name=model_name
+        )
+        result.iterations += 1
+        result.tokens += prompt_tokens + estimate_tokens(response)
+        answer = IMPROVED_CURATION.search(response)
+        if answer:
+            try:
+                improved = Curation.model_validate_json(extract_json(answer.group(1)))
+            except ValidationError:
+                improved = None
+            if improved is not None:
+                course_titles, report = repair_titles(
+                    improved.course_titles, [TitleIndex(seen_titles)]
+                )
+                result.curation = improved.model_copy(
+                    update={"course_titles": course_titles}
+                )
+                result.improved = True
+                result.corrected_titles = len(report.corrected)
+                result.unmatched_titles = report.unmatched
+                explanation = EXPLANATION.search(response)
+                result.explanation = explanation.group(1).strip() if explanation else None
+                return result
+        if final:
+            return result
+        # Anything the model wrote after its calls (e.g. made-up observations) is dropped.
+        turn = response.split("<observation>", 1)[0].strip()
+        descriptions = [match.group("description") for match in FUNCTION_CALL.finditer(turn)]
+        transcript.append(turn)
+        if descriptions:
+            results, cached = observe(descriptions)
+            result.calls += len(descriptions)
+            result.cached_calls += cached
+            for description, (titles, text) in zip(descriptions, results):
+                transcript.append(
+                    f'<observation description="{description}">\n{text}\n</observation>'
+                )
+                seen_titles += titles
+        if result.iterations >= max_iterations:
+            result.stopped, final = "max_iterations", True
+        elif not descriptions:
+            final = True
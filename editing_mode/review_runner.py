@@ -0,0 +1,309 @@
+"""
+Evaluation runner for editing mode: generate -> TOC -> critique -> revise, fanned out across topics.
+
+The numbered scripts run this loop one topic at a time. Here each topic is a job on a thread or process pool
+(--workers wide), and within a topic the TOC lookup and the critique run side by side, since both only need the
+Curation. Every stage is timed; results come back as a ReviewReport (printable, or dumped to JSON).
+
+Usage:
+    python review_runner.py --topics ../benchmarks/topics.txt --workers 8 --json sweep.json
+Use --processes for a process pool (each worker imports Mentor and its clients once). Workers are spawned, not forked,
+and configure themselves: each opens its own connection to the --artifacts store, and with --rate-limit each gets its
+own scheduler with an equal share of the quotas, so the sweep as a whole stays within them.
+With --rate-limit, every model call goes through the scheduler at batch priority.
+"""
+
+from review_certificates import review_curriculum, create_curriculum_text_for_review
+from Mentor import (
+    Mentor,
+    Curation,
+    run_chain,
+    artifact_run,
+    record_artifact,
+    enable_artifact_store,
+    enable_scheduler,
+    call_priority,
+)
+from scheduling import ModelLimits, parse_limits, INTERACTIVE, BATCH
+from react_agent import (
+    persona_editor,
+    improve_curation,
+    ReactResult,
+    DEFAULT_MAX_ITERATIONS,
+    DEFAULT_TOKEN_BUDGET,
+)
+from batch import read_topics
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from contextvars import copy_context
+from pydantic import BaseModel
+from pathlib import Path
+from functools import partial
+import multiprocessing
+import statistics
+import argparse
+import logging
+import time
+
+DEFAULT_TOPICS = Path(__file__).resolve().parent.parent / "benchmarks" / "topics.txt"
+DEFAULT_AUDIENCE = "Data Scientists"
+STAGES = ["generate", "toc", "critique", "revise"]
+
+prompt_revision = """
+Look at this curation that an l&d specialist has made for this topic: {{topic}}.
+
+<curation>
+{{curation}}
+</curation>
+
+This was critiqued by a curriculum specialist. Here is their critique:
+
+<critique>
+{{critique}}
+</critique>
+
+Based on this critique, what would you change in the curation? Make a detailed list of changes, focusing entirely on the content (not learning modality).
+""".strip()
+
+
+class ReviewResult(BaseModel):
+    """
+    Everything one topic produced, plus how long each stage took (in seconds).
+    If a stage fails, error says which and the later fields are left empty.
+    """
+
+    topic: str
+    curation: Curation | None = None
+    curriculum: str | None = None
+    critique: str | None = None
+    revision: str | None = None
+    react: ReactResult | None = None
+    error: str | None = None
+    timings: dict[str, float] = {}
+
+
+class ReviewReport(BaseModel):
+    """
+    The results of a sweep, in topic order.
+    """
+
+    results: list[ReviewResult]
+    workers: int
+    processes: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def failures(self) -> list[ReviewResult]:
+        return [result for result in self.results if result.error]
+
+    def __str__(self):
+        lines = [
+            f"Reviewed {len(self.results)} topics in {self.elapsed:.1f}s "
+            f"({self.workers} {'processes' if self.processes else 'threads'}); {len(self.failures)} failures."
+        ]
+        for stage in STAGES + ["total"]:
+            times = [
+                result.timings[stage]
+                for result in self.results
+                if stage in result.timings
+            ]
+            if times:
+                lines.append(
+                    f"  {stage:<9} median {statistics.median(times):6.1f}s  max {max(times):6.1f}s  (n={len(times)})"
+                )
+        for result in self.failures:
+            lines.append(f"  FAILED {result.topic}: {result.error}")
+        return "\n".join(lines)
+
+
+def _timed(timings: dict[str, float], stage: str, function, *args):
+    start = time.perf_counter()
+    try:
+        return function(*args)
+    finally:
+        timings[stage] = time.perf_counter() - start
+
+
+def revise_curation(topic: str, curation: Curation, critique: str, model_name: str = "gpt") -> str:
+    """
+    Ask for a detailed list of changes to the curation, given the critique.
+    """
+    return run_chain(
+        prompt_revision,
+        persona_editor,
+        {"topic": topic, "curation": curation, "critique": critique},
+        model_name=model_name,
+    )
+
+
+def review_topic(
+    topic: str,
+    audience: str = DEFAULT_AUDIENCE,
+    revise: bool = True,
+    model_name: str = "gpt",
+    react: bool = False,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    priority: int = INTERACTIVE,
+) -> ReviewResult:
+    """
+    Run the whole loop for one topic. Never raises: a failure is recorded on the result.
+    With react=True, the revision is the ReACT agent's improved Curation (see react_agent.py) instead of a list of changes.
+    priority is the scheduler priority of the topic's model calls.
+    """
+    result = ReviewResult(topic=topic)
+    timings = result.timings
+    start = time.perf_counter()
+    stage = "generate"
+    try:
+        with artifact_run(), call_priority(priority):
+            result.curation = _timed(timings, "generate", Mentor, topic)
+            # The TOCs and the critique only need the Curation, so they run side by side
+            # (each in a copy of this context, so their calls keep the priority and artifact run).
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                toc = executor.submit(
+                    copy_context().run,
+                    _timed, timings, "toc", create_curriculum_text_for_review, result.curation,
+                )
+                critique = executor.submit(
+                    copy_context().run,
+                    _timed, timings, "critique", review_curriculum, result.curation, audience,
+                )
+                stage = "critique"
+                result.critique = critique.result()
+                stage = "toc"
+                result.curriculum = toc.result()
+            record_artifact(topic, "curriculum_text", result.curriculum)
+            record_artifact(topic, "critique", result.critique)
+            if revise and react:
+                stage = "revise"
+                agent = partial(
+                    improve_curation,
+                    max_iterations=max_iterations,
+                    token_budget=token_budget,
+                    model_name=model_name,
+                )
+                result.react = _timed(
+                    timings, "revise", agent, result.curation, result.curriculum, result.critique
+                )
+                record_artifact(topic, "improved_curation", result.react)
+            elif revise:
+                stage = "revise"
+                result.revision = _timed(
+                    timings, "revise", revise_curation, topic, result.curation, result.critique, model_name
+                )
+                record_artifact(topic, "revision", result.revision)
+    except Exception as e:
+        result.error = f"{stage}: {type(e).__name__}: {e}"
+    timings["total"] = time.perf_counter() - start
+    return result
+
+
+def configure_worker(
+    artifacts: str | None = None, rate_limits: dict[str, ModelLimits] | None = None
+) -> None:
+    """
+    Set up the artifact store and scheduler in this process (the pool initializer for process workers).
+    """
+    if artifacts:
+        enable_artifact_store(artifacts)
+    if rate_limits:
+        enable_scheduler(rate_limits)
+
+
+def run_reviews(
+    topics: list[str],
+    workers: int = 4,
+    processes: bool = False,
+    audience: str = DEFAULT_AUDIENCE,
+    revise: bool = True,
+    model_name: str = "gpt",
+    react: bool = False,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    artifacts: str | None = None,
+    rate_limits: dict[str, ModelLimits] | None = None,
+) -> ReviewReport:
+    """
+    Review every topic on a pool of workers threads (or processes). Prints a line as each topic finishes.
+    artifacts (an artifact store path) and rate_limits are set up in this process, or in each worker process.
+    """
+    start = time.perf_counter()
+    workers = max(1, min(workers, len(topics) or 1))
+    if processes:
+        shares = {name: limits.share(workers) for name, limits in (rate_limits or {}).items()}
+        pool = partial(
+            ProcessPoolExecutor,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=configure_worker,
+            initargs=(artifacts, shares),
+        )
+    else:
+        configure_worker(artifacts, rate_limits)
+        pool = ThreadPoolExecutor
+    job = partial(
+        review_topic,
+        audience=audience,
+        revise=revise,
+        model_name=model_name,
+        react=react,
+        max_iterations=max_iterations,
+        token_budget=token_budget,
+        priority=BATCH,
+    )
+    results: dict[str, ReviewResult] = {}
+    with pool(max_workers=workers) as executor:
+        futures = {executor.submit(job, topic): topic for topic in topics}
+        for future in as_completed(futures):
+            result = future.result()
+            results[result.topic] = result
+            status = f"FAILED ({result.error})" if result.error else "done"
+            print(f"[{len(results)}/{len(topics)}] {result.topic}: {status} in {result.timings['total']:.1f}s")
+    return ReviewReport(
+        results=[results[topic] for topic in topics],
+        workers=workers,
+        processes=processes,
+        elapsed=time.perf_counter() - start,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run generate -> TOC -> critique -> revise across many topics in parallel."
+    )
+    parser.add_argument("--topics", type=str, default=str(DEFAULT_TOPICS), help="Topic file, one per line.")
+    parser.add_argument("--workers", type=int, default=4, help="How many topics to review at once.")
+    parser.add_argument("--processes", action="store_true", help="Use a process pool instead of threads.")
+    parser.add_argument("--audience", type=str, default=DEFAULT_AUDIENCE)
+    parser.add_argument("--no-revise", action="store_true", help="Stop after the critique.")
+    parser.add_argument("--react", action="store_true", help="Revise with the ReACT agent (returns an improved Curation).")
+    parser.add_argument("--max-iterations", type=int, default=DEFAULT_MAX_ITERATIONS, help="ReACT turns before a final answer is forced.")
+    parser.add_argument("--react-token-budget", type=int, default=DEFAULT_TOKEN_BUDGET, help="Estimated tokens per ReACT run.")
+    parser.add_argument("--model", type=str, default="gpt", help="Model for the revision step.")
+    parser.add_argument("--json", type=str, help="Write the full report here.")
+    parser.add_argument("--artifacts", type=str, metavar="DB", help="Also record every stage's output in this artifact store.")
+    parser.add_argument(
+        "--rate-limit",
+        action="append",
+        default=[],
+        metavar="MODEL:rpm=N,tpm=N,concurrency=N",
+        help="Queue model calls within these quotas, retrying throttled calls (repeatable).",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(threadName)s %(message)s")
+    report = run_reviews(
+        read_topics(args.topics),
+        workers=args.workers,
+        processes=args.processes,
+        audience=args.audience,
+        revise=not args.no_revise,
+        model_name=args.model,
+        react=args.react,
+        max_iterations=args.max_iterations,
+        token_budget=args.react_token_budget,
+        artifacts=args.artifacts,
+        rate_limits=dict(parse_limits(spec) for spec in args.rate_limit),
+    )
+    print(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            f.write(report.model_dump_json(indent=2))
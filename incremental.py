@@ -0,0 +1,258 @@
+"""
+Incremental re-curation: after a critique or a manual edit changes a few Modules, redo only what those changes touch.
+
+A CurationState keeps the Curriculum, the retrieval hits for each of its modules and the resulting Curation.
+recurate(state, new_curriculum) diffs the two curricula by module content hash:
+- unchanged modules keep their stored hits (no Curate query),
+- added or changed modules are retrieved,
+- courses already selected for unchanged modules are kept as they are, and the librarian is only asked to pick
+  courses for the added/changed modules, from their candidates (a much smaller prompt and answer).
+If nothing changed, the old state comes back without any calls; if modules were only removed, their courses are
+dropped without calling the librarian.
+
+States are recorded as "curation_state" artifacts when the artifact store is enabled (see latest_state).
+"""
+
+from Mentor import (
+    Module,
+    Curriculum,
+    Curation,
+    ModuleRetrieval,
+    video_course_librarian,
+    run_chain,
+    retrieve_courses,
+    librarian_curation,
+    check_course_count,
+    record_artifact,
+    DEFAULT_MAX_WORKERS,
+)
+import Mentor
+from packing import pack_candidates, DEFAULT_TOKEN_BUDGET
+from titles import TitleIndex, repair_titles
+from cache import cache_key
+from profiling import span
+from pydantic import BaseModel
+import logging
+
+logger = logging.getLogger("Mentor.incremental")
+
+prompt_video_course_librarian_delta = """
+You have a received a curriculum object on the topic of:
+<topic>
+{{topic}}
+</topic>
+
+Here is the curriculum object:
+<curriculum>
+{{curriculum}}
+</curriculum>
+
+Courses were already selected for most of its modules, and those selections stay as they are:
+<selected_courses>
+{{selected_courses}}
+</selected_courses>
+
+These modules are new or have changed, and need courses:
+<changed_modules>
+{{changed_modules}}
+</changed_modules>
+
+And here are the courses that you have to choose from for them:
+<courses>
+{{courses}}
+</courses>
+
+Please select the most appropriate courses to fulfill the objectives of the new or changed modules.
+Don't repeat courses that are already selected. The whole curation should end up with 6-12 courses;
+{{selected_count}} are already selected, so pick between {{min_new}} and {{max_new}}.
+YOU SHOULD MAKE SURE YOU ARE PROVIDING THE COURSE TITLE VERBATIM AS IT APPEARS IN THE COURSE DATABASE.
+
+Provide a structured Curation object that includes the topic of the curriculum and the course titles of the newly selected video courses only.
+"Topic" should be the verbatim topic of the curriculum provided to you above.
+""".strip()
+
+
+def module_hash(module: Module) -> str:
+    return cache_key(module.model_dump())
+
+
+class CurationState(BaseModel):
+    """
+    Everything recurate needs: the Curriculum, one ModuleRetrieval per module (same order), and the Curation.
+    """
+
+    curriculum: Curriculum
+    retrievals: list[ModuleRetrieval]
+    curation: Curation
+
+
+class CurriculumDiff(BaseModel):
+    unchanged: list[int] = []  # positions in the new curriculum
+    changed: list[int] = []  # new or edited modules, positions in the new curriculum
+    removed: list[int] = []  # positions in the old curriculum
+
+    def __str__(self):
+        return (
+            f"{len(self.changed)} new or changed, {len(self.removed)} removed, "
+            f"{len(self.unchanged)} unchanged modules"
+        )
+
+
+def diff_curricula(old: Curriculum, new: Curriculum) -> tuple[CurriculumDiff, dict[int, int]]:
+    """
+    Match modules by content hash. Returns the diff and, for each unchanged module, its old position.
+    """
+    old_positions: dict[str, list[int]] = {}
+    for position, module in enumerate(old.modules):
+        old_positions.setdefault(module_hash(module), []).append(position)
+    diff, reused = CurriculumDiff(), {}
+    for position, module in enumerate(new.modules):
+        candidates = old_positions.get(module_hash(module))
+        if candidates:
+            reused[position] = candidates.pop(0)
+            diff.unchanged.append(position)
+        else:
+            diff.changed.append(position)
+    matched = set(reused.values())
+    diff.removed = [p for p in range(len(old.modules)) if p not in matched]
+    return diff, reused
+
+
+def curate(
+    curriculum: Curriculum,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    token_budget: int | None = DEFAULT_TOKEN_BUDGET,
+) -> CurationState:
+    """
+    identify_courses, keeping the per-module hits so the result can be updated incrementally later.
+    """
+    with span("identify_courses", modules=len(curriculum.modules)):
+        retrievals = retrieve_courses(curriculum, max_workers=max_workers)
+        curation = librarian_curation(curriculum, retrievals, token_budget=token_budget)
+    state = CurationState(curriculum=curriculum, retrievals=retrievals, curation=curation)
+    record_artifact(curriculum.topic, "curation_state", state)
+    return state
+
+
+def recurate(
+    state: CurationState,
+    curriculum: Curriculum,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    token_budget: int | None = DEFAULT_TOKEN_BUDGET,
+) -> CurationState:
+    """
+    Update state for an edited Curriculum, redoing only the retrieval and selection the edit affects.
+    """
+    diff, reused = diff_curricula(state.curriculum, curriculum)
+    logger.info("Incremental re-curation: %s.", diff)
+    if not diff.changed and not diff.removed:
+        return state
+    with span("recurate", changed=len(diff.changed), removed=len(diff.removed)) as attributes:
+        retrievals: list[ModuleRetrieval | None] = [None] * len(curriculum.modules)
+        for position, old_position in reused.items():
+            retrievals[position] = state.retrievals[old_position]
+        if diff.changed:
+            changed = curriculum.model_copy(
+                update={"modules": [curriculum.modules[p] for p in diff.changed]}
+            )
+            for position, retrieval in zip(
+                diff.changed, retrieve_courses(changed, max_workers=max_workers)
+            ):
+                retrievals[position] = retrieval
+        # Keep the selected courses that belong to a module we kept, or to no module we know of (e.g. added by hand);
+        # drop the ones that only served removed or changed modules.
+        stable_titles = {
+            title for p in diff.unchanged for title, *_ in retrievals[p].courses
+        }
+        replaced_titles = {
+            title
+            for p in diff.removed
+            for title, *_ in state.retrievals[p].courses
+        }
+        kept = [
+            title
+            for title in state.curation.course_titles
+            if title in stable_titles or title not in replaced_titles
+        ]
+        attributes["kept"] = len(kept)
+        if diff.changed:
+            selected, unmatched = librarian_delta(
+                curriculum,
+                kept,
+                [retrievals[p] for p in diff.changed],
+                token_budget=token_budget,
+            )
+        else:
+            selected, unmatched = [], []
+        course_titles = list(dict.fromkeys(kept + selected))
+    curation = Curation(
+        topic=curriculum.topic, course_titles=course_titles, unmatched_titles=unmatched
+    )
+    check_course_count(curation)
+    new_state = CurationState(curriculum=curriculum, retrievals=retrievals, curation=curation)
+    record_artifact(curriculum.topic, "curation_state", new_state)
+    return new_state
+
+
+def librarian_delta(
+    curriculum: Curriculum,
+    kept: list[str],
+    retrievals: list[ModuleRetrieval],
+    token_budget: int | None = DEFAULT_TOKEN_BUDGET,
+) -> tuple[list[str], list[str]]:
+    """
+    Ask the librarian for courses for the changed modules only. Returns the new titles, checked against the candidates,
+    and the titles that matched no candidate.
+    """
+    module_hits = [
+        (retrieval.module.title, retrieval.courses)
+        for retrieval in retrievals
+        if not retrieval.error
+    ]
+    packed = pack_candidates(module_hits, token_budget=token_budget)
+    if not packed.candidates:
+        logger.warning("Retrieval failed for every changed module; keeping the previous selection.")
+        return [], []
+    logger.info("%s", packed)
+    with span(
+        "librarian",
+        candidates=len(packed.candidates),
+        duplicate_candidates=packed.duplicates,
+        dropped_candidates=packed.dropped,
+        course_context_tokens=packed.tokens,
+        delta=True,
+    ):
+        curation = run_chain(
+            prompt_video_course_librarian_delta,
+            video_course_librarian,
+            {
+                "topic": curriculum.topic,
+                "curriculum": curriculum,
+                "selected_courses": "\n".join(kept),
+                "selected_count": len(kept),
+                "min_new": max(1, 6 - len(kept)),
+                "max_new": max(1, 12 - len(kept)),
+                "changed_modules": "\n".join(
+                    f"{retrieval.module.title}: {retrieval.module.description}"
+                    for retrieval in retrievals
+                ),
+                "courses": packed.context,
+            },
+            pydantic_model=Curation,
+            stage="librarian",
+        )
+    indexes = [TitleIndex(candidate.title for candidate in packed.candidates)]
+    course_titles, report = repair_titles(curation.course_titles, indexes)
+    if report.corrected or report.unmatched:
+        logger.warning("%s", report)
+    return course_titles, report.unmatched
+
+
+def latest_state(topic: str) -> CurationState | None:
+    """
+    The most recent CurationState recorded for topic (needs the artifact store).
+    """
+    if Mentor.artifact_store is None:
+        return None
+    artifact = Mentor.artifact_store.latest(topic, "curation_state")
+    return artifact.load(CurationState) if artifact else None
@@ -0,0 +1,194 @@
+"""
+In-process retrieval engine over a memory-mapped copy of the course catalog embeddings.
+
+Curate embeds one query and makes one vector-store round trip per module. Here we export the catalog once
+(export_catalog) to:
+    <index_dir>/embeddings.npy   float32, one L2-normalized row per course (memory-mapped at query time)
+    <index_dir>/courses.jsonl    one {"title", "description", "metadata"} line per row
+(the metadata also gives each course's publisher, for the blacklist: see course_publisher)
+and then search any number of queries at once (LocalIndex.search): one batched embedding call, one matrix multiply,
+and a partial sort for the top k. Results are (title, description) tuples, interchangeable with Curate's.
+
+Query embeddings must come from the same model that embedded the catalog. By default we load it with FlagEmbedding,
+named by $MENTOR_EMBEDDING_MODEL (default BAAI/bge-base-en-v1.5); pass embed= to use something else.
+"""
+
+from pathlib import Path
+from typing import Callable
+import threading
+import json
+import os
+
+DEFAULT_INDEX_DIR = Path(".mentor_index")
+DEFAULT_EMBEDDING_MODEL = "BAAI/bge-base-en-v1.5"
+# Metadata fields that name a course's publisher, in order of preference ($MENTOR_PUBLISHER_KEY goes first).
+PUBLISHER_KEYS = ("publisher", "provider", "vendor", "author")
+
+
+def flag_embedder(model_name: str | None = None) -> Callable[[list[str]], "np.ndarray"]:
+    """
+    A batch embedding function backed by FlagEmbedding (loaded on first call).
+    """
+    model_name = model_name or os.environ.get(
+        "MENTOR_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL
+    )
+    model = None
+    lock = threading.Lock()
+
+    def embed(texts: list[str]):
+        nonlocal model
+        if model is None:
+            with lock:
+                if model is None:
+                    from FlagEmbedding import FlagModel
+
+                    model = FlagModel(model_name)
+        return model.encode(texts)
+
+    return embed
+
+
+def normalize_rows(matrix):
+    import numpy as np
+
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def course_publisher(metadata: dict | None) -> str | None:
+    """
+    The publisher named in a course's catalog metadata, if any.
+    """
+    if not metadata:
+        return None
+    keys = PUBLISHER_KEYS
+    if os.environ.get("MENTOR_PUBLISHER_KEY"):
+        keys = (os.environ["MENTOR_PUBLISHER_KEY"],) + keys
+    for key in keys:
+        if metadata.get(key):
+            return str(metadata[key])
+    return None
+
+
+def load_publishers(index_dir: str | Path = DEFAULT_INDEX_DIR) -> dict[str, str]:
+    """
+    Title -> publisher for every course of an export that has one (reads courses.jsonl only, not the embeddings).
+    """
+    publishers = {}
+    with open(Path(index_dir) / "courses.jsonl", "r") as f:
+        for line in f:
+            course = json.loads(line)
+            publisher = course_publisher(course.get("metadata"))
+            if publisher:
+                publishers[course["title"]] = publisher
+    return publishers
+
+
+def export_catalog(
+    chroma_path: str | Path,
+    collection_name: str,
+    index_dir: str | Path = DEFAULT_INDEX_DIR,
+    title_key: str = "course_title",
+) -> int:
+    """
+    Export a chromadb collection (the one Curate searches) into index_dir. Returns the number of courses.
+    The course title is read from metadata[title_key] (falling back to the document id), the description from the document.
+    """
+    import chromadb
+    import numpy as np
+
+    client = chromadb.PersistentClient(path=str(chroma_path))
+    collection = client.get_collection(collection_name)
+    records = collection.get(include=["embeddings", "documents", "metadatas"])
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    np.save(index_dir / "embeddings.npy", normalize_rows(records["embeddings"]))
+    with open(index_dir / "courses.jsonl", "w") as f:
+        for course_id, document, metadata in zip(
+            records["ids"], records["documents"], records["metadatas"]
+        ):
+            metadata = metadata or {}
+            course = {
+                "title": metadata.get(title_key, course_id),
+                "description": document or "",
+                "metadata": metadata,
+            }
+            f.write(json.dumps(course) + "\n")
+    return len(records["ids"])
+
+
+class LocalIndex:
+    """
+    A memory-mapped embedding matrix plus its title/description sidecar.
+    """
+
+    def __init__(
+        self,
+        index_dir: str | Path = DEFAULT_INDEX_DIR,
+        embed: Callable[[list[str]], "np.ndarray"] | None = None,
+    ):
+        import numpy as np
+
+        self.index_dir = Path(index_dir)
+        self.embeddings = np.load(self.index_dir / "embeddings.npy", mmap_mode="r")
+        with open(self.index_dir / "courses.jsonl", "r") as f:
+            self.courses = [json.loads(line) for line in f]
+        if len(self.courses) != self.embeddings.shape[0]:
+            raise ValueError(
+                f"{self.index_dir}: {self.embeddings.shape[0]} embeddings but {len(self.courses)} courses."
+            )
+        self.publishers = {
+            course["title"]: publisher
+            for course in self.courses
+            if (publisher := course_publisher(course.get("metadata")))
+        }
+        self.embed = embed or flag_embedder()
+
+    def __len__(self) -> int:
+        return len(self.courses)
+
+    def search(self, queries: list[str], k: int = 10) -> list[list[tuple[str, str]]]:
+        """
+        Top-k (title, description) hits for each query, best first. All queries are embedded in one batch
+        and scored with a single matrix multiply.
+        """
+        import numpy as np
+
+        if not queries:
+            return []
+        k = min(k, len(self.courses))
+        if k <= 0:
+            # An empty catalog (or k=0): nothing to rank, and argpartition can't take kth=-1.
+            return [[] for _ in queries]
+        vectors = normalize_rows(self.embed(list(queries)))
+        scores = vectors @ self.embeddings.T  # (queries, courses) cosine similarities
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in enumerate(top):
+            ranked = candidates[np.argsort(-scores[row, candidates])]
+            results.append(
+                [
+                    (self.courses[i]["title"], self.courses[i]["description"])
+                    for i in ranked
+                ]
+            )
+        return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Export the course catalog embeddings for the local retrieval engine."
+    )
+    parser.add_argument("chroma_path", type=str, help="The chromadb directory Curate uses.")
+    parser.add_argument("collection", type=str, help="The course collection name.")
+    parser.add_argument("--index-dir", type=str, default=str(DEFAULT_INDEX_DIR))
+    parser.add_argument("--title-key", type=str, default="course_title")
+    args = parser.parse_args()
+    count = export_catalog(
+        args.chroma_path, args.collection, args.index_dir, title_key=args.title_key
+    )
+    print(f"Exported {count} courses to {args.index_dir}")
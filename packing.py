@@ -0,0 +1,132 @@
+"""
+Candidate packing for the librarian prompt.
+
+Curate returns the top courses for each module; the same course often shows up under several modules.
+We deduplicate by title, merge the per-module rankings (reciprocal rank fusion), and fill the course context
+up to a token budget, best candidates first.
+"""
+
+from pydantic import BaseModel
+
+# Reciprocal rank fusion constant: a course ranked r for a module scores 1 / (RRF_K + r).
+RRF_K = 60
+DEFAULT_TOKEN_BUDGET = 8000
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count (~4 characters per token). Good enough for budgeting; we don't ship a tokenizer.
+    """
+    return max(1, len(text) // 4)
+
+
+class Candidate(BaseModel):
+    """
+    A course retrieved for one or more modules.
+    """
+
+    title: str
+    description: str
+    score: float = 0.0
+    modules: list[str] = []
+
+    def __str__(self) -> str:
+        return f"{self.title}: {self.description}"
+
+
+class PackedCandidates(BaseModel):
+    """
+    The candidates that made it into the librarian prompt, plus bookkeeping on what didn't.
+    """
+
+    candidates: list[Candidate]
+    tokens: int
+    duplicates: int = 0
+    dropped: int = 0
+    dropped_tokens: int = 0
+
+    @property
+    def context(self) -> str:
+        return "\n".join(str(candidate) for candidate in self.candidates)
+
+    @property
+    def numbered_context(self) -> str:
+        """
+        The context with each candidate prefixed by its ID ("[1] title: description"), for the ID protocol.
+        """
+        return "\n".join(
+            f"[{candidate_id}] {candidate}"
+            for candidate_id, candidate in enumerate(self.candidates, start=1)
+        )
+
+    def titles_for(self, ids: list[int]) -> tuple[list[str], list[int]]:
+        """
+        Map candidate IDs back to exact titles (deduplicated, in order). Returns the titles and any unknown IDs.
+        """
+        titles, unknown = [], []
+        for candidate_id in ids:
+            if 1 <= candidate_id <= len(self.candidates):
+                titles.append(self.candidates[candidate_id - 1].title)
+            else:
+                unknown.append(candidate_id)
+        return list(dict.fromkeys(titles)), unknown
+
+    def __str__(self) -> str:
+        return (
+            f"Packed {len(self.candidates)} candidates (~{self.tokens} tokens); "
+            f"merged {self.duplicates} duplicates, dropped {self.dropped} candidates (~{self.dropped_tokens} tokens)."
+        )
+
+
+def merge_candidates(
+    module_hits: list[tuple[str, list[tuple[str, str]]]]
+) -> tuple[list[Candidate], int]:
+    """
+    Deduplicate (module title, courses) hit lists by course title and merge their scores.
+    Returns the candidates ranked best first, and the number of duplicate hits merged away.
+    """
+    candidates: dict[str, Candidate] = {}
+    duplicates = 0
+    for module_title, courses in module_hits:
+        for rank, (title, description) in enumerate(courses, start=1):
+            key = " ".join(title.casefold().split())
+            candidate = candidates.get(key)
+            if candidate is None:
+                candidate = Candidate(title=title, description=description)
+                candidates[key] = candidate
+            else:
+                duplicates += 1
+            candidate.score += 1 / (RRF_K + rank)
+            if module_title not in candidate.modules:
+                candidate.modules.append(module_title)
+    # sorted() is stable, so ties keep retrieval order
+    ranked = sorted(candidates.values(), key=lambda c: c.score, reverse=True)
+    return ranked, duplicates
+
+
+def pack_candidates(
+    module_hits: list[tuple[str, list[tuple[str, str]]]],
+    token_budget: int | None = DEFAULT_TOKEN_BUDGET,
+) -> PackedCandidates:
+    """
+    Merge and rank the hits, then keep candidates (best first) while they fit in token_budget.
+    token_budget=None keeps everything.
+    """
+    ranked, duplicates = merge_candidates(module_hits)
+    kept = []
+    tokens = dropped_tokens = 0
+    for candidate in ranked:
+        # +1 for the newline joining the lines
+        cost = estimate_tokens(str(candidate)) + 1
+        if token_budget is None or tokens + cost <= token_budget:
+            kept.append(candidate)
+            tokens += cost
+        else:
+            dropped_tokens += cost
+    return PackedCandidates(
+        candidates=kept,
+        tokens=tokens,
+        duplicates=duplicates,
+        dropped=len(ranked) - len(kept),
+        dropped_tokens=dropped_tokens,
+    )
@@ -0,0 +1,165 @@
+"""
+Lightweight instrumentation for the Mentor pipeline.
+
+Code paths wrap themselves in span(name, **attributes); the attributes dict can be filled in with counters
+(tokens, courses, characters) while the span is open. Spans are recorded by the enabled Profiler and passed to any hooks.
+When nothing is listening, span() costs next to nothing.
+
+Usage:
+    profiler = profiling.enable()
+    Mentor(topic)
+    print(profiler.summary())
+    profiler.write_trace("trace.json")
+
+Token counts are estimates (see packing.estimate_tokens); Chain doesn't report usage to us.
+"""
+
+from pydantic import BaseModel
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Iterator
+import threading
+import json
+import time
+
+
+class Span(BaseModel):
+    """
+    A timed section of the pipeline. start is seconds since the profiler was enabled.
+    """
+
+    name: str
+    start: float
+    duration: float
+    thread: str
+    parent: str | None = None
+    attributes: dict = {}
+
+
+class Profiler:
+    """
+    Collects spans (from any thread) and summarizes them.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> str:
+        """
+        A table with one row per span name: calls, total/mean/max seconds, and summed numeric attributes.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        rows: dict[str, dict] = {}
+        for span in spans:
+            row = rows.setdefault(
+                span.name, {"calls": 0, "total": 0.0, "max": 0.0, "counters": {}}
+            )
+            row["calls"] += 1
+            row["total"] += span.duration
+            row["max"] = max(row["max"], span.duration)
+            for key, value in span.attributes.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    row["counters"][key] = row["counters"].get(key, 0) + value
+                elif isinstance(value, bool) and value:
+                    row["counters"][key] = row["counters"].get(key, 0) + 1
+        width = max([len(name) for name in rows] + [len("span")])
+        lines = [
+            f"{'span':<{width}}  {'calls':>5}  {'total s':>8}  {'mean s':>8}  {'max s':>8}  counters",
+            "-" * (width + 50),
+        ]
+        for name, row in rows.items():
+            counters = ", ".join(
+                f"{key}={value:g}" for key, value in sorted(row["counters"].items())
+            )
+            lines.append(
+                f"{name:<{width}}  {row['calls']:>5}  {row['total']:>8.3f}  "
+                f"{row['total'] / row['calls']:>8.3f}  {row['max']:>8.3f}  {counters}"
+            )
+        return "\n".join(lines)
+
+    def to_json(self) -> str:
+        with self._lock:
+            spans = [span.model_dump() for span in self.spans]
+        return json.dumps({"spans": spans}, indent=2, default=str)
+
+    def write_trace(self, path: str | Path) -> None:
+        Path(path).write_text(self.to_json())
+
+
+# Global registry
+# ------------------------------------------------
+
+profiler: Profiler | None = None
+_hooks: list[Callable[[Span], None]] = []
+_parent: ContextVar[str | None] = ContextVar("mentor_span_parent", default=None)
+
+
+def enable(new_profiler: Profiler | None = None) -> Profiler:
+    """
+    Start recording spans (into a fresh Profiler unless one is given). Returns the profiler.
+    """
+    global profiler
+    profiler = new_profiler or Profiler()
+    return profiler
+
+
+def disable() -> Profiler | None:
+    """
+    Stop recording spans. Returns the profiler that was active, if any.
+    """
+    global profiler
+    previous, profiler = profiler, None
+    return previous
+
+
+def add_hook(hook: Callable[[Span], None]) -> None:
+    """
+    Call hook(span) whenever a span finishes, whether or not a profiler is enabled.
+    """
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[Span], None]) -> None:
+    _hooks.remove(hook)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[dict]:
+    """
+    Time the enclosed block. Yields the attributes dict so callers can add counters as they go.
+    An exception in the block is noted in the attributes (as "error") and re-raised.
+    """
+    active = profiler
+    if active is None and not _hooks:
+        yield attributes
+        return
+    token = _parent.set(name)
+    start = time.perf_counter()
+    try:
+        yield attributes
+    except BaseException as e:
+        attributes["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _parent.reset(token)
+        record = Span(
+            name=name,
+            start=start - (active.origin if active else start),
+            duration=duration,
+            thread=threading.current_thread().name,
+            parent=_parent.get(),
+            attributes=attributes,
+        )
+        if active is not None:
+            active.record(record)
+        for hook in list(_hooks):
+            hook(record)
@@ -0,0 +1,146 @@
+"""
+Latency-hedged model routing.
+
+A stalled completion from the primary model holds up the whole pipeline. HedgedRouter tracks each model's latency per
+stage; when the primary hasn't answered by its usual deadline (a percentile of its recent latencies for that stage),
+the same call is also sent to a secondary model and the first valid result wins. A call that fails (e.g. its output
+doesn't parse) counts as a loss, so a failing primary falls over to the secondary straight away.
+
+The loser can't be interrupted once its request is in flight; it's cancelled if it hasn't started, otherwise its
+result is ignored (it still updates the response cache, if enabled). Only winners' latencies are recorded: a primary
+that lost after stalling would otherwise pull the deadline up towards the stall it's meant to cut short.
+Each hedged call takes up to two of the router's max_workers threads.
+"""
+
+from pydantic import BaseModel
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from contextvars import copy_context
+from collections import deque, Counter
+from typing import Callable
+import threading
+import math
+import time
+
+DEFAULT_PRIMARY = "claude"
+DEFAULT_SECONDARY = "llama3.1:latest"
+DEFAULT_PERCENTILE = 0.95
+DEFAULT_DEADLINE = 30.0  # seconds, until we have min_samples latencies for a stage
+MIN_SAMPLES = 5
+WINDOW = 100
+DEFAULT_MAX_WORKERS = 32
+
+
+class HedgeStats(BaseModel):
+    """
+    Per stage: how many calls each model won, and how many calls were hedged.
+    """
+
+    wins: dict[str, dict[str, int]] = {}
+    hedged: dict[str, int] = {}
+
+    def __str__(self):
+        lines = []
+        for stage, wins in sorted(self.wins.items()):
+            counts = ", ".join(f"{model}={count}" for model, count in sorted(wins.items()))
+            lines.append(f"{stage}: {counts} (hedged {self.hedged.get(stage, 0)})")
+        return "\n".join(lines)
+
+
+class LatencyTracker:
+    """
+    The last WINDOW latencies of each (model, stage).
+    """
+
+    def __init__(self, window: int = WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self.samples: dict[tuple[str, str], deque] = {}
+
+    def record(self, model_name: str, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.samples.setdefault((model_name, stage), deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, model_name: str, stage: str, p: float) -> tuple[float | None, int]:
+        """
+        The nearest-rank p-th latency, and the number of samples it's based on (None if there are none).
+        """
+        with self._lock:
+            samples = sorted(self.samples.get((model_name, stage), ()))
+        if not samples:
+            return None, 0
+        rank = max(1, math.ceil(p * len(samples)))
+        return samples[rank - 1], len(samples)
+
+
+class HedgedRouter:
+    """
+    Routes calls for the primary model, hedging them with the secondary after the primary's deadline.
+    """
+
+    def __init__(
+        self,
+        primary: str = DEFAULT_PRIMARY,
+        secondary: str = DEFAULT_SECONDARY,
+        percentile: float = DEFAULT_PERCENTILE,
+        default_deadline: float = DEFAULT_DEADLINE,
+        min_samples: int = MIN_SAMPLES,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.percentile = percentile
+        self.default_deadline = default_deadline
+        self.min_samples = min_samples
+        self.latencies = LatencyTracker()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+        self._wins: dict[str, Counter] = {}
+        self._hedged: Counter = Counter()
+
+    def deadline(self, stage: str) -> float:
+        """
+        How long to wait for the primary before hedging this stage.
+        """
+        latency, samples = self.latencies.percentile(self.primary, stage, self.percentile)
+        if latency is None or samples < self.min_samples:
+            return self.default_deadline
+        return latency
+
+    def _submit(self, call: Callable[[str], object], model_name: str) -> Future:
+        # In the caller's context, so the call keeps its run ID, priority and parent span.
+        return self.executor.submit(copy_context().run, call, model_name)
+
+    def run(self, stage: str, call: Callable[[str], object]) -> tuple[object, str]:
+        """
+        call(model_name) performs the request. Returns the first valid result and the model that produced it.
+        If every attempt fails, the primary's exception is raised.
+        """
+        start = time.perf_counter()
+        primary = self._submit(call, self.primary)
+        futures = {primary: (self.primary, start)}
+        wait([primary], timeout=self.deadline(stage))
+        if not primary.done() or primary.exception() is not None:
+            futures[self._submit(call, self.secondary)] = (self.secondary, time.perf_counter())
+            with self._lock:
+                self._hedged[stage] += 1
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    winner, started = futures[future]
+                    self.latencies.record(winner, stage, time.perf_counter() - started)
+                    with self._lock:
+                        self._wins.setdefault(stage, Counter())[winner] += 1
+                    return future.result(), winner
+        raise primary.exception()
+
+    @property
+    def stats(self) -> HedgeStats:
+        with self._lock:
+            return HedgeStats(
+                wins={stage: dict(counter) for stage, counter in self._wins.items()},
+                hedged=dict(self._hedged),
+            )
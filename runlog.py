@@ -0,0 +1,338 @@
+"""
+Append-only JSONL run log: a message store for Chain that stays off the hot path.
+
+Chain hands its message store every message it sends and receives (Chain._message_store.add(...)). Rewriting one
+shared JSON file on every message gets slower as the file grows and isn't safe across concurrent runs. Instead:
+- add() only timestamps the messages and queues them; a background thread encodes and appends them in batches
+  (whatever queued up while the last batch was written goes out in one write),
+- each run (one RunLog, i.e. one process) writes its own files, <run_id>.<segment>.jsonl, starting a new segment
+  once max_bytes is reached,
+- index.jsonl gets one line per finished segment (run ID, file, records, bytes, time span, and the byte range each
+  artifact run's records occupy in it), so runs can be listed without opening their logs, a run's messages are read
+  back from its own segments only, and one artifact run's messages (e.g. one request to service.py, which shares
+  its process's log with every other request) from the ranges that hold them.
+
+One JSON object per line: {"seq": ..., "time": ..., "run": <artifact run ID or null>, "role": ..., "content": ...}.
+
+The store is attached as Chain._message_store (see Mentor.load_chain) and only add() is called on it. add() takes
+one message or a list of them: {"role", "content"} dicts, Message models, or any object with role and content
+attributes; content may itself be a pydantic object (e.g. a parsed answer). A RunLog is always truthy.
+"""
+
+from artifacts import new_run_id
+from pydantic import BaseModel
+from pathlib import Path
+from typing import Callable, Iterator
+import threading
+import logging
+import atexit
+import queue
+import json
+import time
+
+DEFAULT_RUNLOG_DIR = Path(".mentor_runs")
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+DEFAULT_BATCH_SIZE = 512
+INDEX_FILE = "index.jsonl"
+
+logger = logging.getLogger("Mentor.runlog")
+
+
+def _default(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def encode_message(message) -> dict:
+    """
+    Chain's messages are Message models or {"role", "content"} dicts; content may be a pydantic model.
+    """
+    if isinstance(message, BaseModel):
+        return dict(message)
+    if isinstance(message, dict):
+        return message
+    if hasattr(message, "role") and hasattr(message, "content"):
+        return {"role": message.role, "content": message.content}
+    return {"role": None, "content": message}
+
+
+class SegmentInfo(BaseModel):
+    """
+    One line of index.jsonl.
+    """
+
+    run_id: str
+    path: str  # relative to the log directory
+    segment: int
+    records: int
+    bytes: int
+    started: float
+    ended: float
+    # Artifact run ID -> [start, end) byte offsets of the part of the segment holding its records.
+    tags: dict[str, tuple[int, int]] = {}
+
+
+class RunLog:
+    """
+    Message store for one run. add() is safe to call from any thread; call flush() to wait for the writer,
+    close() to finish (also done at exit).
+    """
+
+    def __init__(
+        self,
+        directory: str | Path = DEFAULT_RUNLOG_DIR,
+        run_id: str | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        tag: Callable[[], str | None] | None = None,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.run_id = run_id or new_run_id()
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+        self.tag = tag
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._sequence = 0
+        self._sequence_lock = threading.Lock()
+        self._segment = 0
+        self._file = None
+        self._closed = False
+        self.errors = 0
+        self._writer = threading.Thread(target=self._write_loop, name="runlog", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    # Chain's side
+    # ------------------------------------------------
+
+    def add(self, messages) -> None:
+        """
+        Queue one message, or a list of them (copied, since Chain keeps appending to its list).
+        """
+        if self._closed:
+            return
+        messages = list(messages) if isinstance(messages, (list, tuple)) else [messages]
+        now = time.time()
+        tag = self.tag() if self.tag else None
+        with self._sequence_lock:
+            first = self._sequence
+            self._sequence += len(messages)
+        for offset, message in enumerate(messages):
+            self._queue.put((first + offset, now, tag, message))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait until everything added so far is written. Returns False on timeout.
+        """
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        atexit.unregister(self.close)
+
+    # Writer thread
+    # ------------------------------------------------
+
+    def _write_loop(self) -> None:
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines, events = [], []
+            for item in batch:
+                if item is None:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    events.append(item)
+                else:
+                    lines.append(self._encode(*item))
+            try:
+                self._write(lines)
+                if stopping:
+                    self._finish_segment()
+            except OSError as e:
+                # Logging must never take a run down with it.
+                self.errors += 1
+                if self.errors == 1:
+                    logger.warning("Run log: write failed (%s); messages are being dropped.", e)
+            for event in events:
+                event.set()
+
+    def _encode(
+        self, sequence: int, timestamp: float, tag: str | None, message
+    ) -> tuple[str | None, bytes]:
+        record = {"seq": sequence, "time": timestamp, "run": tag, **encode_message(message)}
+        line = json.dumps(record, default=_default, ensure_ascii=False)
+        return tag, (line + "\n").encode("utf-8")
+
+    def _write(self, lines: list[tuple[str | None, bytes]]) -> None:
+        while lines:
+            if self._file is None:
+                self._start_segment()
+            room = self.max_bytes - self._bytes
+            # Fill the current segment (at least one line, so an oversized record still gets written).
+            count, size = 0, 0
+            for _, line in lines:
+                if count and size + len(line) > room:
+                    break
+                count += 1
+                size += len(line)
+            if self._bytes and size > room:
+                self._finish_segment()
+                continue
+            self._file.write(b"".join(line for _, line in lines[:count]))
+            self._file.flush()
+            offset = self._bytes
+            for tag, line in lines[:count]:
+                if tag is not None:
+                    start, _ = self._tags.get(tag, (offset, offset))
+                    self._tags[tag] = (start, offset + len(line))
+                offset += len(line)
+            self._bytes += size
+            self._records += count
+            lines = lines[count:]
+            if self._bytes >= self.max_bytes:
+                self._finish_segment()
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"{self.run_id}.{segment:04d}.jsonl"
+
+    def _start_segment(self) -> None:
+        self._segment += 1
+        self._file = open(self._segment_path(self._segment), "ab")
+        self._bytes = self._records = 0
+        self._tags: dict[str, tuple[int, int]] = {}
+        self._started = time.time()
+
+    def _finish_segment(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        info = SegmentInfo(
+            run_id=self.run_id,
+            path=self._segment_path(self._segment).name,
+            segment=self._segment,
+            records=self._records,
+            bytes=self._bytes,
+            started=self._started,
+            ended=time.time(),
+            tags=self._tags,
+        )
+        # One short line per segment; appends from concurrent runs don't interleave.
+        with open(self.directory / INDEX_FILE, "a") as f:
+            f.write(info.model_dump_json() + "\n")
+
+
+# Reading
+# ------------------------------------------------
+
+
+def read_index(directory: str | Path = DEFAULT_RUNLOG_DIR) -> list[SegmentInfo]:
+    """
+    Every finished segment, in the order they were finished. A truncated last line is ignored.
+    """
+    path = Path(directory) / INDEX_FILE
+    if not path.exists():
+        return []
+    segments = []
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                segments.append(SegmentInfo.model_validate_json(line))
+            except ValueError:
+                continue
+    return segments
+
+
+def run_segments(run_id: str, directory: str | Path = DEFAULT_RUNLOG_DIR) -> list[Path]:
+    """
+    A run's log files, in order (including a segment still being written, or left unindexed by a crash).
+    """
+    return sorted(Path(directory).glob(f"{run_id}.*.jsonl"))
+
+
+def _read_records(path: Path, tag: str | None, start: int = 0, end: int | None = None) -> Iterator[dict]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        position = start
+        for line in f:
+            if end is not None and position >= end:
+                break
+            position += len(line)
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if tag is None or record.get("run") == tag:
+                yield record
+
+
+def read_run(
+    run_id: str, directory: str | Path = DEFAULT_RUNLOG_DIR, tag: str | None = None
+) -> Iterator[dict]:
+    """
+    Stream one run's messages, optionally only those recorded under an artifact run ID (tag).
+    With a tag, indexed segments are only read where that tag's records are; unindexed ones are scanned.
+    """
+    indexed = {info.path: info for info in read_index(directory) if info.run_id == run_id}
+    for path in run_segments(run_id, directory):
+        info = indexed.get(path.name)
+        if tag is None or info is None:
+            yield from _read_records(path, tag)
+        elif tag in info.tags:
+            yield from _read_records(path, tag, *info.tags[tag])
+
+
+def read_tag(tag: str, directory: str | Path = DEFAULT_RUNLOG_DIR) -> Iterator[dict]:
+    """
+    Stream one artifact run's messages, whichever process logged them. Only indexed segments are searched.
+    """
+    for info in read_index(directory):
+        if tag in info.tags:
+            yield from _read_records(Path(directory) / info.path, tag, *info.tags[tag])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="List runs in the run log, or print one run's messages.")
+    parser.add_argument("--dir", type=str, default=str(DEFAULT_RUNLOG_DIR))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("runs", help="List the runs in the index.")
+    show = subparsers.add_parser("show", help="Print a run's messages as JSONL.")
+    show.add_argument("run_id", nargs="?", help="Optional with --tag (then every run's index is searched).")
+    show.add_argument("--tag", type=str, help="Only messages recorded under this artifact run ID.")
+    args = parser.parse_args()
+    if args.command == "runs":
+        runs: dict[str, list[SegmentInfo]] = {}
+        for info in read_index(args.dir):
+            runs.setdefault(info.run_id, []).append(info)
+        for run_id, segments in runs.items():
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(segments[0].started))
+            records = sum(info.records for info in segments)
+            size = sum(info.bytes for info in segments)
+            print(f"{run_id}  {started}  {records} messages  {size / 1024:.0f} KiB  {len(segments)} segment(s)")
+    else:
+        if args.run_id:
+            records = read_run(args.run_id, args.dir, tag=args.tag)
+        elif args.tag:
+            records = read_tag(args.tag, args.dir)
+        else:
+            parser.error("show needs a run ID, a --tag, or both")
+        for record in records:
+            print(json.dumps(record, ensure_ascii=False))
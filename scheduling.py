@@ -0,0 +1,332 @@
+"""
+Shared, rate-limit-aware scheduler for model (and Curate) calls.
+
+Every call made while the scheduler is enabled waits for a slot in its model's lane. A lane has:
+- token buckets for requests/minute and tokens/minute (the prompt is charged up front, the completion once it's known,
+  so a lane that overspent its token quota waits until the bucket refills),
+- a priority queue: the lowest priority number goes first (INTERACTIVE ahead of BATCH), FIFO within a priority,
+- an adaptive concurrency limit (AIMD): halved when the provider throttles us, raised by 1/limit per success,
+  between min_concurrency and max_concurrency.
+Throttling and transient errors are retried with full-jitter exponential backoff (honouring a retry_after hint on the
+exception, if there is one); any other error is raised straight away.
+"""
+
+from pydantic import BaseModel
+from contextlib import contextmanager
+from typing import Callable
+import threading
+import itertools
+import random
+import heapq
+import time
+
+INTERACTIVE = 0
+BATCH = 10
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_DELAY = 1.0  # seconds
+DEFAULT_MAX_DELAY = 60.0
+
+THROTTLE_MARKERS = ("429", "rate limit", "rate_limit", "ratelimit", "too many requests", "overloaded", "529")
+TRANSIENT_MARKERS = ("timeout", "timed out", "503", "502", "connection reset", "temporarily unavailable")
+
+
+class ModelLimits(BaseModel):
+    """
+    Quotas for one lane. None means unlimited.
+    """
+
+    requests_per_minute: float | None = None
+    tokens_per_minute: float | None = None
+    max_concurrency: int = 16
+    min_concurrency: int = 1
+    initial_concurrency: int | None = None  # defaults to max_concurrency
+
+    def share(self, parts: int) -> "ModelLimits":
+        """
+        One of parts equal shares of these quotas, for a scheduler in each of parts processes.
+        """
+        if parts <= 1:
+            return self
+        return self.model_copy(
+            update={
+                "requests_per_minute": self.requests_per_minute and self.requests_per_minute / parts,
+                "tokens_per_minute": self.tokens_per_minute and self.tokens_per_minute / parts,
+                "max_concurrency": max(1, self.max_concurrency // parts),
+                "min_concurrency": 1,
+                "initial_concurrency": None,
+            }
+        )
+
+
+class LaneStats(BaseModel):
+    calls: int = 0
+    throttled: int = 0
+    retries: int = 0
+    failures: int = 0
+    waited: float = 0.0  # seconds spent queued, in total
+    concurrency: float = 0.0
+
+    def __str__(self):
+        return (
+            f"{self.calls} calls, {self.throttled} throttled, {self.retries} retries, {self.failures} failed, "
+            f"{self.waited:.1f}s queued, concurrency {self.concurrency:.1f}"
+        )
+
+
+def is_throttled(error: Exception) -> bool:
+    """
+    Whether an exception looks like the provider telling us to slow down (HTTP 429/529, "rate limit", ...).
+    """
+    if getattr(error, "status_code", None) in (429, 529):
+        return True
+    text = f"{type(error).__name__} {error}".casefold()
+    return any(marker in text for marker in THROTTLE_MARKERS)
+
+
+def is_transient(error: Exception) -> bool:
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if getattr(error, "status_code", None) in (500, 502, 503, 504):
+        return True
+    text = f"{type(error).__name__} {error}".casefold()
+    return any(marker in text for marker in TRANSIENT_MARKERS)
+
+
+class TokenBucket:
+    """
+    rate_per_minute units refill continuously, up to capacity (one minute's worth by default).
+    Not thread-safe by itself; the lane's lock guards it.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """
+        Seconds until amount is available (0 if it is now). Requests larger than capacity wait for a full bucket.
+        """
+        self._refill()
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        """
+        Remove amount; the level can go negative (e.g. a completion longer than expected), which delays later calls.
+        """
+        self._refill()
+        self.level -= amount
+
+    def drain(self) -> None:
+        self._refill()
+        self.level = min(self.level, 0.0)
+
+
+class Lane:
+    """
+    The queue, buckets and concurrency limit for one model.
+    """
+
+    def __init__(self, limits: ModelLimits):
+        self.limits = limits
+        self.requests = TokenBucket(limits.requests_per_minute) if limits.requests_per_minute else None
+        self.tokens = TokenBucket(limits.tokens_per_minute) if limits.tokens_per_minute else None
+        self.concurrency = float(limits.initial_concurrency or limits.max_concurrency)
+        self.active = 0
+        self.waiting: list[tuple[int, int]] = []
+        self.condition = threading.Condition()
+        self.stats = LaneStats(concurrency=self.concurrency)
+
+    def _wait_time(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.wait_time(tokens))
+        return wait
+
+    def acquire(self, ticket: tuple[int, int], tokens: int) -> None:
+        """
+        Block until ticket is first in line, a concurrency slot is free and the buckets allow the call.
+        """
+        started = time.monotonic()
+        with self.condition:
+            heapq.heappush(self.waiting, ticket)
+            try:
+                while True:
+                    if self.waiting[0] == ticket and self.active < max(1, int(self.concurrency)):
+                        wait = self._wait_time(tokens)
+                        if wait <= 0:
+                            break
+                        self.condition.wait(wait)
+                    else:
+                        self.condition.wait()
+            except BaseException:
+                # Interrupted while queued: give up our place so the line keeps moving.
+                self.waiting.remove(ticket)
+                heapq.heapify(self.waiting)
+                self.condition.notify_all()
+                raise
+            heapq.heappop(self.waiting)
+            self.active += 1
+            if self.requests is not None:
+                self.requests.take(1)
+            if self.tokens is not None:
+                self.tokens.take(tokens)
+            self.stats.waited += time.monotonic() - started
+            # The next ticket may be runnable too.
+            self.condition.notify_all()
+
+    def release(self, ok: bool, throttled: bool = False, used_tokens: int = 0) -> None:
+        with self.condition:
+            self.active -= 1
+            if self.tokens is not None and used_tokens:
+                self.tokens.take(used_tokens)
+            if throttled:
+                # Multiplicative decrease, and nothing else goes out until the buckets refill a little.
+                self.concurrency = max(self.limits.min_concurrency, self.concurrency / 2)
+                for bucket in (self.requests, self.tokens):
+                    if bucket is not None:
+                        bucket.drain()
+            elif ok:
+                self.concurrency = min(
+                    self.limits.max_concurrency, self.concurrency + 1 / self.concurrency
+                )
+            self.stats.concurrency = self.concurrency
+            self.condition.notify_all()
+
+
+class Scheduler:
+    """
+    One lane per model name; lanes without configured limits get default_limits.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, ModelLimits] | None = None,
+        default_limits: ModelLimits | None = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ):
+        self.limits = dict(limits or {})
+        self.default_limits = default_limits or ModelLimits()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._lanes: dict[str, Lane] = {}
+        self._sequence = itertools.count()
+
+    def lane(self, model_name: str) -> Lane:
+        with self._lock:
+            if model_name not in self._lanes:
+                self._lanes[model_name] = Lane(self.limits.get(model_name, self.default_limits))
+            return self._lanes[model_name]
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        """
+        Full jitter: uniform in [0, min(max_delay, base_delay * 2**attempt)], but at least the server's retry_after.
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        retry_after = getattr(error, "retry_after", None)
+        if isinstance(retry_after, (int, float)):
+            delay = max(delay, float(retry_after))
+        return delay
+
+    def run(
+        self,
+        model_name: str,
+        call: Callable[[], object],
+        tokens: int = 0,
+        priority: int = INTERACTIVE,
+        completion_tokens: Callable[[object], int] | None = None,
+    ):
+        """
+        Run call() in the calling thread once model_name's lane admits it, retrying throttled or transient failures.
+        tokens is the prompt's estimated size; completion_tokens(result), if given, charges the response as well.
+        """
+        lane = self.lane(model_name)
+        attempt = 0
+        while True:
+            lane.acquire((priority, next(self._sequence)), tokens)
+            try:
+                result = call()
+            except Exception as e:
+                throttled = is_throttled(e)
+                lane.release(ok=False, throttled=throttled)
+                retry = (throttled or is_transient(e)) and attempt < self.max_retries
+                with lane.condition:
+                    lane.stats.throttled += throttled
+                    lane.stats.retries += retry
+                    lane.stats.failures += not retry
+                if not retry:
+                    raise
+                time.sleep(self.backoff(attempt, e))
+                attempt += 1
+                continue
+            used = completion_tokens(result) if completion_tokens else 0
+            lane.release(ok=True, used_tokens=used)
+            with lane.condition:
+                lane.stats.calls += 1
+            return result
+
+    @contextmanager
+    def slot(self, model_name: str, tokens: int = 0, priority: int = INTERACTIVE):
+        """
+        Hold a place in model_name's lane for the duration of the block, without retries (e.g. for a streamed response).
+        """
+        lane = self.lane(model_name)
+        lane.acquire((priority, next(self._sequence)), tokens)
+        ok, throttled = True, False
+        try:
+            yield
+        except Exception as e:
+            # (A consumer closing the stream early isn't an Exception, and doesn't count as a failure.)
+            ok, throttled = False, is_throttled(e)
+            raise
+        finally:
+            lane.release(ok=ok, throttled=throttled)
+            with lane.condition:
+                lane.stats.calls += ok
+                lane.stats.throttled += throttled
+                lane.stats.failures += not ok
+
+    @property
+    def stats(self) -> dict[str, LaneStats]:
+        with self._lock:
+            lanes = dict(self._lanes)
+        stats = {}
+        for model_name, lane in lanes.items():
+            with lane.condition:
+                stats[model_name] = lane.stats.model_copy()
+        return stats
+
+
+def parse_limits(spec: str) -> tuple[str, ModelLimits]:
+    """
+    Parse a command-line lane spec, e.g. "claude:rpm=50,tpm=40000,concurrency=8".
+    Model names may contain colons themselves ("llama3.1:latest:rpm=10"), so the options follow the last one.
+    """
+    model_name, _, options = spec.rpartition(":")
+    if "=" not in options:
+        # Just a model name: default limits.
+        model_name, options = spec, ""
+    fields = {"rpm": "requests_per_minute", "tpm": "tokens_per_minute", "concurrency": "max_concurrency"}
+    values = {}
+    for option in filter(None, options.split(",")):
+        name, _, value = option.partition("=")
+        if name.strip() not in fields:
+            raise ValueError(f"Unknown limit {name!r} in {spec!r} (expected rpm, tpm or concurrency)")
+        values[fields[name.strip()]] = float(value)
+    if "max_concurrency" in values:
+        values["max_concurrency"] = int(values["max_concurrency"])
+    return model_name.strip(), ModelLimits(**values)
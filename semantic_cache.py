@@ -0,0 +1,215 @@
+"""
+Topic-level semantic cache: reuse the Curriculum (and possibly the Curation) of a previously run, near-duplicate topic.
+
+"Data Science with Python" and "Python for Data Science" want the same curriculum. Every finished run is stored with
+its topic embedding; a new topic is embedded and compared against all stored topics at once (one matrix-vector
+product over an in-memory matrix). The best unexpired match is a hit if its cosine similarity clears the threshold.
+Mentor then reuses the cached Curriculum; above curation_threshold it reuses the whole Curation too.
+
+Entries persist in SQLite, expire after ttl seconds, and the least recently used are evicted beyond max_entries.
+Topic embeddings come from local_index.flag_embedder by default (pass embed= to use something else).
+"""
+
+from local_index import flag_embedder, normalize_rows
+from pydantic import BaseModel
+from pathlib import Path
+from typing import Callable
+import threading
+import sqlite3
+import time
+
+DEFAULT_THRESHOLD = 0.92
+DEFAULT_CURATION_THRESHOLD = 0.97
+DEFAULT_TTL = 7 * 24 * 60 * 60  # seconds
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def normalize_topic(topic: str) -> str:
+    return " ".join(topic.casefold().split())
+
+
+class SemanticHit(BaseModel):
+    """
+    A cached run for a similar topic. score is the cosine similarity of the two topics (1.0 for the same topic).
+    """
+
+    topic: str
+    score: float
+    curriculum_json: str
+    curation_json: str | None = None
+
+
+class SemanticTopicCache:
+    """
+    Topic embeddings in memory (for the lookup), runs on disk. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        embed: Callable[[list[str]], "np.ndarray"] | None = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        curation_threshold: float = DEFAULT_CURATION_THRESHOLD,
+        ttl: float | None = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        import numpy as np
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.embed = embed or flag_embedder()
+        self.threshold = threshold
+        self.curation_threshold = curation_threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS topics ("
+                "key TEXT PRIMARY KEY, topic TEXT NOT NULL, embedding BLOB NOT NULL, "
+                "curriculum TEXT NOT NULL, curation TEXT, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            if self.ttl is not None:
+                self._conn.execute(
+                    "DELETE FROM topics WHERE created < ?", (time.time() - self.ttl,)
+                )
+            rows = self._conn.execute(
+                "SELECT key, embedding, created FROM topics ORDER BY accessed"
+            ).fetchall()
+        # Row i of matrix[:size] is the embedding of keys[i], stored at created[i]; rows maps a key to its row.
+        # The arrays have spare capacity (doubled when full), so a put doesn't copy the whole matrix.
+        self.size = 0
+        self.keys: list[str] = []
+        self.rows: dict[str, int] = {}
+        self.matrix = None
+        self.created = np.zeros(0)
+        for key, blob, created in rows:
+            self._append(key, np.frombuffer(blob, dtype=np.float32), created)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def lookup(self, topic: str, threshold: float | None = None) -> SemanticHit | None:
+        """
+        The most similar unexpired cached run, if it clears the threshold.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        key = normalize_topic(topic)
+        with self._lock:
+            if not self.size:
+                return None
+            exact = key in self.rows
+        # Embed outside the lock; the same topic needs no embedding at all.
+        vector = None if exact else normalize_rows(self.embed([topic]))[0]
+        with self._lock, self._conn:
+            self._expire()
+            if vector is None:
+                if key not in self.rows:
+                    return None  # evicted or expired meanwhile
+                position, score = self.rows[key], 1.0
+            else:
+                if not self.size:
+                    return None
+                scores = self.matrix[: self.size] @ vector
+                position = int(scores.argmax())
+                score = float(scores[position])
+            if score < threshold:
+                return None
+            key = self.keys[position]
+            row = self._conn.execute(
+                "SELECT topic, curriculum, curation FROM topics WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE topics SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        cached_topic, curriculum, curation = row
+        return SemanticHit(
+            topic=cached_topic,
+            score=min(score, 1.0),
+            curriculum_json=curriculum,
+            curation_json=curation,
+        )
+
+    def put(self, topic: str, curriculum_json: str, curation_json: str | None = None) -> None:
+        """
+        Store a finished run (replacing any earlier run for the same topic), then evict down to max_entries.
+        """
+        import numpy as np
+
+        vector = normalize_rows(self.embed([topic]))[0].astype(np.float32)
+        key = normalize_topic(topic)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO topics (key, topic, embedding, curriculum, curation, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, topic, vector.tobytes(), curriculum_json, curation_json, now, now),
+            )
+            if key in self.rows:
+                position = self.rows[key]
+                self.matrix[position] = vector
+                self.created[position] = now
+            else:
+                self._append(key, vector, now)
+            overflow = self.size - self.max_entries
+            if overflow > 0:
+                lru = self._conn.execute(
+                    "SELECT key FROM topics ORDER BY accessed LIMIT ?", (overflow,)
+                ).fetchall()
+                self._remove([self.rows[key] for (key,) in lru if key in self.rows])
+
+    def _append(self, key: str, vector, created: float) -> None:
+        """
+        Add a row, growing the arrays if they're full. Call with the lock held (or from __init__).
+        """
+        import numpy as np
+
+        if self.matrix is None:
+            self.matrix = np.zeros((16, vector.shape[0]), dtype=np.float32)
+            self.created = np.zeros(16)
+        elif self.size == self.matrix.shape[0]:
+            capacity = 2 * self.size
+            self.matrix = np.resize(self.matrix, (capacity, self.matrix.shape[1]))
+            self.created = np.resize(self.created, capacity)
+        self.matrix[self.size] = vector
+        self.created[self.size] = created
+        self.keys.append(key)
+        self.rows[key] = self.size
+        self.size += 1
+
+    def _expire(self) -> None:
+        """
+        Drop every entry older than ttl. Call with the lock held.
+        """
+        import numpy as np
+
+        if self.ttl is None or not self.size:
+            return
+        expired = np.flatnonzero(self.created[: self.size] < time.time() - self.ttl)
+        if len(expired):
+            self._remove(expired.tolist())
+
+    def _remove(self, positions: list[int], delete: bool = True) -> None:
+        """
+        Drop entries from memory (and from disk, with delete=True). Each removed row is filled with the last row,
+        so nothing else moves. Call with the lock held.
+        """
+        if delete:
+            self._conn.executemany(
+                "DELETE FROM topics WHERE key = ?", [(self.keys[p],) for p in positions]
+            )
+        # Highest first: the last row is then never one still waiting to be removed.
+        for position in sorted(set(positions), reverse=True):
+            last = self.size - 1
+            del self.rows[self.keys[position]]
+            if position != last:
+                moved = self.keys[last]
+                self.keys[position] = moved
+                self.rows[moved] = position
+                self.matrix[position] = self.matrix[last]
+                self.created[position] = self.created[last]
+            self.keys.pop()
+            self.size -= 1
@@ -0,0 +1,319 @@
+"""
+Long-running Mentor service: one process keeps Chain, the models, the retrieval engine, the blacklist and the caches
+warm, and answers curation requests over HTTP (TCP or a Unix socket). Standard library only.
+
+    POST /curate   {"topic": "...", "fast": false}  ->  the Curation as JSON
+    GET  /curate?topic=...&fast=1                   ->  same
+    GET  /stats                                     ->  ServiceStats
+    GET  /health                                    ->  {"ok": true}
+
+Identical requests in flight (same topic, ignoring case and spacing, same mode) share a single pipeline run;
+the X-Mentor-Coalesced header says whether a response came from someone else's run.
+At most --pipelines runs execute at once; once --max-pending runs are queued or running, new topics get
+503 with a Retry-After header instead of piling up.
+
+    python service.py --port 8765 --pipelines 4 --cache
+    curl -s localhost:8765/curate -d '{"topic": "Data Science with Python"}'
+"""
+
+from Mentor import (
+    Mentor,
+    Curation,
+    load_chain,
+    load_model,
+    active_blacklist,
+    load_blacklist,
+    disable_blacklist,
+    configure_message_store,
+    enable_response_cache,
+    enable_retrieval_cache,
+    use_local_index,
+    use_candidate_ids,
+    enable_artifact_store,
+    enable_semantic_cache,
+    enable_scheduler,
+    scheduler_stats,
+    warm_retrieval,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_BLACKLIST,
+)
+from packing import DEFAULT_TOKEN_BUDGET
+from scheduling import LaneStats, parse_limits
+from runlog import DEFAULT_RUNLOG_DIR
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+from functools import partial
+from pydantic import BaseModel
+import argparse
+import asyncio
+import logging
+import json
+import time
+
+DEFAULT_PORT = 8765
+DEFAULT_PIPELINES = 4
+DEFAULT_MAX_PENDING = 32
+MAX_BODY_BYTES = 64 * 1024
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class Overloaded(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    """
+    The request itself is malformed (400). Errors from the pipeline are 500s and count as failures.
+    """
+
+
+class ServiceStats(BaseModel):
+    started: float
+    requests: int = 0
+    pipelines: int = 0
+    coalesced: int = 0
+    rejected: int = 0
+    failures: int = 0
+    in_flight: int = 0
+    lanes: dict[str, LaneStats] = {}
+
+
+class MentorService:
+    """
+    Runs pipelines on a fixed pool of threads, coalescing identical in-flight topics.
+    """
+
+    def __init__(
+        self,
+        pipelines: int = DEFAULT_PIPELINES,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        token_budget: int | None = DEFAULT_TOKEN_BUDGET,
+        speculative: bool = False,
+    ):
+        self.executor = ThreadPoolExecutor(max_workers=pipelines, thread_name_prefix="mentor")
+        self.max_pending = max_pending
+        self.max_workers = max_workers
+        self.token_budget = token_budget
+        if speculative:
+            from speculative import Mentor_speculative
+
+            self.pipeline = Mentor_speculative
+        else:
+            self.pipeline = Mentor
+        self.in_flight: dict[tuple[str, bool], asyncio.Future] = {}
+        self.stats = ServiceStats(started=time.time())
+
+    def warm(self, model_names: tuple[str, ...] = ("claude",)) -> None:
+        """
+        Pay the one-time costs (imports, clients, retrieval engine, embedding models, blacklist) before the first request.
+        """
+        load_chain()
+        for model_name in model_names:
+            load_model(model_name)
+        warm_retrieval()
+        active_blacklist()
+
+    async def curate(self, topic: str, fast: bool = False) -> tuple[Curation, bool]:
+        """
+        The Curation for topic, and whether it came from a run another request started.
+        """
+        key = (" ".join(topic.casefold().split()), fast)
+        future = self.in_flight.get(key)
+        coalesced = future is not None
+        if coalesced:
+            self.stats.coalesced += 1
+        else:
+            if len(self.in_flight) >= self.max_pending:
+                self.stats.rejected += 1
+                raise Overloaded(f"{len(self.in_flight)} pipelines pending")
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(
+                self.executor,
+                partial(
+                    self.pipeline,
+                    topic,
+                    max_workers=self.max_workers,
+                    token_budget=self.token_budget,
+                    fast=fast,
+                ),
+            )
+            self.in_flight[key] = future
+            self.stats.pipelines += 1
+            future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        # shield: one client hanging up mustn't cancel a run others are waiting on.
+        return await asyncio.shield(future), coalesced
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        status, payload, headers = 500, {"error": "internal error"}, {}
+        try:
+            try:
+                method, path, body = await read_request(reader)
+            except (ValueError, asyncio.IncompleteReadError) as e:
+                raise BadRequest(str(e)) from e
+            self.stats.requests += 1
+            url = urlsplit(path)
+            if url.path == "/health":
+                status, payload = 200, {"ok": True}
+            elif url.path == "/stats":
+                self.stats.in_flight = len(self.in_flight)
+                self.stats.lanes = scheduler_stats()
+                status, payload = 200, self.stats.model_dump()
+            elif url.path == "/curate":
+                request = parse_curate_request(method, url.query, body)
+                topic = str(request.get("topic", "")).strip()
+                fast = str(request.get("fast", "")).lower() in ("1", "true", "yes")
+                if not topic:
+                    status, payload = 400, {"error": "missing topic"}
+                else:
+                    curation, coalesced = await self.curate(topic, fast=fast)
+                    status, payload = 200, curation.model_dump()
+                    headers["X-Mentor-Coalesced"] = "1" if coalesced else "0"
+            else:
+                status, payload = 404, {"error": f"no route for {url.path}"}
+        except Overloaded as e:
+            status, payload = 503, {"error": f"overloaded: {e}"}
+            headers["Retry-After"] = "5"
+        except BadRequest as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            self.stats.failures += 1
+            status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+        try:
+            write_response(writer, status, payload, headers)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def read_request(reader: asyncio.StreamReader) -> tuple[str, str, bytes]:
+    """
+    Minimal HTTP/1.1 request parsing: request line, headers, and a Content-Length body.
+    """
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    parts = request_line.split()
+    if len(parts) != 3:
+        raise ValueError(f"bad request line: {request_line!r}")
+    method, path, _ = parts
+    length = 0
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value.strip())
+    if length > MAX_BODY_BYTES:
+        raise ValueError("request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path, body
+
+
+def parse_curate_request(method: str, query: str, body: bytes) -> dict:
+    """
+    The /curate parameters: the JSON body of a POST, or the query string of a GET.
+    """
+    if method != "POST":
+        return {key: values[-1] for key, values in parse_qs(query).items()}
+    try:
+        request = json.loads(body or b"{}")
+    except ValueError as e:  # JSONDecodeError, or a body that isn't UTF-8
+        raise BadRequest(f"invalid JSON: {e}") from e
+    if not isinstance(request, dict):
+        raise BadRequest("expected a JSON object")
+    return request
+
+
+def write_response(
+    writer: asyncio.StreamWriter, status: int, payload: dict, headers: dict[str, str]
+) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    head = [
+        f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        "Connection: close",
+    ] + [f"{name}: {value}" for name, value in headers.items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+
+
+async def serve(
+    service: MentorService,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    unix_socket: str | None = None,
+) -> None:
+    if unix_socket:
+        server = await asyncio.start_unix_server(service.handle, path=unix_socket)
+        print(f"Mentor service listening on {unix_socket}")
+    else:
+        server = await asyncio.start_server(service.handle, host, port)
+        print(f"Mentor service listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve Mentor curations over HTTP.")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", type=str, metavar="SOCKET_PATH", help="Listen on a Unix socket instead of TCP.")
+    parser.add_argument("--pipelines", type=int, default=DEFAULT_PIPELINES, help="Pipelines to run at once.")
+    parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=DEFAULT_MAX_PENDING,
+        help="Distinct topics queued or running before new ones are turned away (503).",
+    )
+    parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS)
+    parser.add_argument("--token-budget", type=int, default=DEFAULT_TOKEN_BUDGET, help="0 for no limit.")
+    parser.add_argument("--speculative", action="store_true")
+    parser.add_argument("--candidate-ids", action="store_true")
+    parser.add_argument("--cache", action="store_true", help="Enable the response and retrieval caches.")
+    parser.add_argument("--semantic-cache", action="store_true", help="Reuse runs for near-duplicate topics.")
+    parser.add_argument(
+        "--rate-limit",
+        action="append",
+        default=[],
+        metavar="MODEL:rpm=N,tpm=N,concurrency=N",
+        help="Queue model calls within these quotas, retrying throttled calls (repeatable).",
+    )
+    parser.add_argument("--local-index", type=str, metavar="INDEX_DIR")
+    parser.add_argument("--blacklist", type=str, default=str(DEFAULT_BLACKLIST))
+    parser.add_argument("--no-blacklist", action="store_true")
+    parser.add_argument("--artifacts", type=str, metavar="DB")
+    parser.add_argument("--run-log", type=str, default=str(DEFAULT_RUNLOG_DIR), metavar="DIR", help="Empty to disable.")
+    parser.add_argument("--log-file", type=str, help="Log to one JSON file (Chain's MessageStore) instead.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(threadName)s %(message)s")
+    configure_message_store(args.log_file or None, args.run_log or None)
+    if args.local_index:
+        use_local_index(args.local_index)
+    use_candidate_ids(args.candidate_ids)
+    if args.artifacts:
+        enable_artifact_store(args.artifacts)
+    if args.no_blacklist:
+        disable_blacklist()
+    else:
+        load_blacklist(args.blacklist)
+    if args.cache:
+        enable_response_cache()
+        enable_retrieval_cache()
+    if args.semantic_cache:
+        enable_semantic_cache()
+    if args.rate_limit:
+        enable_scheduler(dict(parse_limits(spec) for spec in args.rate_limit))
+    service = MentorService(
+        pipelines=args.pipelines,
+        max_pending=args.max_pending,
+        max_workers=args.max_workers,
+        token_budget=args.token_budget or None,
+        speculative=args.speculative,
+    )
+    service.warm()
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
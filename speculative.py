@@ -0,0 +1,230 @@
+"""
+Speculative retrieval: start Curate queries while the Curriculum is still being generated.
+
+The structuring call is asked for plain JSON text and streamed (see Mentor.stream_chain). ModuleStreamParser watches
+the stream for the "modules" array and hands back each module as soon as its closing brace arrives; its Curate query
+is dispatched right away, so retrieval overlaps generation and the librarian can start right after the last module.
+
+If the model doesn't stream, everything arrives as one chunk and this degrades to the normal pipeline.
+With the local index, retrieval is one batched in-process search after the Curriculum is complete (see Mentor.use_local_index).
+If the streamed JSON doesn't validate, we fall back to the regular structured-output call and reuse whatever
+retrievals already match its modules.
+"""
+
+from Mentor import (
+    Module,
+    Curriculum,
+    Curation,
+    ModuleRetrieval,
+    prompt_curriculum_specialist,
+    persona_curriculum_specialist,
+    prompt_lnd_structured,
+    persona_lnd,
+    stream_chain,
+    lnd_curriculum,
+    curriculum_specialist_curriculum,
+    lnd_structured_curriculum,
+    module_query,
+    retrieve_module,
+    librarian_curation,
+    artifact_run,
+    record_artifact,
+    semantic_lookup,
+    semantic_store,
+    identify_courses,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_TOKEN_BUDGET,
+)
+import Mentor
+from profiling import span
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextvars import copy_context
+from pydantic import ValidationError
+import json
+import time
+import re
+
+json_instructions = """
+
+Respond with a single JSON object and nothing else (no code fences, no commentary).
+It must follow this JSON schema:
+{{schema}}
+""".rstrip()
+
+prompt_curriculum_specialist_json = prompt_curriculum_specialist + json_instructions
+prompt_lnd_structured_json = prompt_lnd_structured + json_instructions
+
+MODULES_ARRAY = re.compile(r'(?<!\\)"modules"\s*:\s*\[')
+
+
+class ModuleStreamParser:
+    """
+    Incrementally finds the objects of the top-level "modules" array in streamed JSON text.
+    feed() returns the module dicts completed by the new chunk.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = None  # where we've scanned to inside the modules array
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.object_start = None
+        self.finished = False
+
+    def feed(self, chunk: str) -> list[dict]:
+        self.buffer += chunk
+        if self.finished:
+            return []
+        if self.position is None:
+            match = MODULES_ARRAY.search(self.buffer)
+            if match is None:
+                return []
+            self.position = match.end()
+        modules = []
+        while self.position < len(self.buffer):
+            char = self.buffer[self.position]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in "{[":
+                if self.depth == 0:
+                    self.object_start = self.position
+                self.depth += 1
+            elif char in "}]":
+                if self.depth == 0:
+                    # The closing bracket of the modules array.
+                    self.finished = True
+                    self.position += 1
+                    break
+                self.depth -= 1
+                if self.depth == 0:
+                    text = self.buffer[self.object_start : self.position + 1]
+                    try:
+                        modules.append(json.loads(text))
+                    except json.JSONDecodeError:
+                        pass
+            self.position += 1
+        return modules
+
+
+def extract_json(text: str) -> str:
+    """
+    The outermost {...} in a response (models sometimes wrap JSON in prose or code fences).
+    """
+    start, end = text.find("{"), text.rfind("}")
+    return text[start : end + 1] if start != -1 and end > start else text
+
+
+def speculative_identify(
+    topic: str,
+    ideal_curriculum: str | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    token_budget: int | None = DEFAULT_TOKEN_BUDGET,
+) -> tuple[Curriculum, Curation]:
+    """
+    Generate the Curriculum (from ideal_curriculum, or straight from the topic in fast mode if it's None),
+    dispatching each module's Curate query as soon as the module is streamed, then run the librarian.
+    Returns the Curriculum and the Curation.
+    """
+    if ideal_curriculum is None:
+        prompt, persona = prompt_lnd_structured_json, persona_lnd
+        input_variables = {"topic": topic}
+    else:
+        prompt, persona = prompt_curriculum_specialist_json, persona_curriculum_specialist
+        input_variables = {"topic": topic, "ideal_curriculum": ideal_curriculum}
+    if Mentor.local_index is not None:
+        # Local retrieval takes milliseconds and is cheapest as one batched search: there's nothing to overlap.
+        if ideal_curriculum is None:
+            curriculum = lnd_structured_curriculum(topic)
+        else:
+            curriculum = curriculum_specialist_curriculum(ideal_curriculum, topic)
+        return curriculum, identify_courses(
+            curriculum, max_workers=max_workers, token_budget=token_budget
+        )
+    input_variables["schema"] = json.dumps(Curriculum.model_json_schema())
+    parser = ModuleStreamParser()
+    futures: dict[str, Future] = {}
+    chunks = []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        with span("speculative_curriculum") as attributes:
+            start = time.perf_counter()
+            # model_name = "llama3.1:latest"
+            for chunk in stream_chain(prompt, persona, input_variables):
+                chunks.append(chunk)
+                for data in parser.feed(chunk):
+                    try:
+                        module = Module(**data)
+                    except (ValidationError, TypeError):
+                        continue
+                    query = module_query(module)
+                    if query not in futures:
+                        futures[query] = executor.submit(
+                            copy_context().run, retrieve_module, module
+                        )
+                        attributes.setdefault(
+                            "first_module_s", time.perf_counter() - start
+                        )
+            attributes["speculative_modules"] = len(futures)
+            try:
+                curriculum = Curriculum.model_validate_json(
+                    extract_json("".join(chunks))
+                )
+                record_artifact(topic, "curriculum", curriculum)
+            except ValidationError:
+                attributes["fallback"] = True
+                if ideal_curriculum is None:
+                    curriculum = lnd_structured_curriculum(topic)
+                else:
+                    curriculum = curriculum_specialist_curriculum(
+                        ideal_curriculum, topic
+                    )
+        # Modules the stream didn't give us (or that changed in a fallback) are retrieved now.
+        for module in curriculum.modules:
+            query = module_query(module)
+            if query not in futures:
+                futures[query] = executor.submit(
+                    copy_context().run, retrieve_module, module
+                )
+        retrievals: list[ModuleRetrieval] = [
+            futures[module_query(module)].result() for module in curriculum.modules
+        ]
+    curation = librarian_curation(curriculum, retrievals, token_budget=token_budget)
+    return curriculum, curation
+
+
+def Mentor_speculative(
+    topic: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    token_budget: int | None = DEFAULT_TOKEN_BUDGET,
+    fast: bool = False,
+) -> Curation:
+    """
+    Runs the entire Mentor pipeline, with retrieval overlapping the structuring call.
+    """
+    cached = semantic_lookup(topic)
+    if cached is not None:
+        curriculum, curation = cached
+        if curation is not None:
+            return curation
+        # Nothing left to overlap with: the Curriculum is already here.
+        with artifact_run():
+            return identify_courses(
+                curriculum, max_workers=max_workers, token_budget=token_budget
+            )
+    with artifact_run():
+        ideal_curriculum = None if fast else lnd_curriculum(topic)
+        curriculum, curation = speculative_identify(
+            topic,
+            ideal_curriculum,
+            max_workers=max_workers,
+            token_budget=token_budget,
+        )
+    semantic_store(topic, curriculum, curation)
+    return curation
@@ -0,0 +1,195 @@
+"""
+Streaming form of the Mentor pipeline.
+
+Mentor_stream(topic) yields typed events as soon as each piece of the pipeline is ready:
+- IdealCurriculumDelta: chunks of the L&D specialist's answer (if the model streams; otherwise one chunk)
+- IdealCurriculumEvent: the extracted ideal curriculum
+  (neither is emitted in fast mode, where the Curriculum comes straight from one structured call,
+  nor when the semantic topic cache supplies the Curriculum)
+- CurriculumEvent: the structured Curriculum
+- ModuleRetrievalEvent: the retrieval hits for each module, in order of arrival
+- CurationEvent: the final Curation
+
+Mentor_astream is the async-iterator equivalent, for UIs running an event loop.
+"""
+
+from Mentor import (
+    Curriculum,
+    Curation,
+    ModuleRetrieval,
+    prompt_lnd,
+    persona_lnd,
+    stream_chain,
+    extract_curriculum_description,
+    curriculum_specialist_curriculum,
+    lnd_structured_curriculum,
+    retrieve_as_completed,
+    librarian_curation,
+    artifact_run,
+    record_artifact,
+    semantic_lookup,
+    semantic_store,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_TOKEN_BUDGET,
+)
+from profiling import span
+from pydantic import BaseModel
+from contextvars import copy_context
+from typing import Iterator, AsyncIterator, Literal
+import threading
+import asyncio
+import time
+
+
+# Events
+# ------------------------------------------------
+
+
+class PipelineEvent(BaseModel):
+    """
+    Base class for pipeline events. elapsed is seconds since the pipeline started.
+    """
+
+    topic: str
+    elapsed: float
+
+
+class IdealCurriculumDelta(PipelineEvent):
+    kind: Literal["ideal_curriculum_delta"] = "ideal_curriculum_delta"
+    text: str
+
+
+class IdealCurriculumEvent(PipelineEvent):
+    kind: Literal["ideal_curriculum"] = "ideal_curriculum"
+    ideal_curriculum: str
+
+
+class CurriculumEvent(PipelineEvent):
+    kind: Literal["curriculum"] = "curriculum"
+    curriculum: Curriculum
+
+
+class ModuleRetrievalEvent(PipelineEvent):
+    """
+    index is the module's position in the Curriculum (events arrive in completion order).
+    """
+
+    kind: Literal["module_retrieval"] = "module_retrieval"
+    index: int
+    retrieval: ModuleRetrieval
+
+
+class CurationEvent(PipelineEvent):
+    kind: Literal["curation"] = "curation"
+    curation: Curation
+
+
+# Pipeline
+# ------------------------------------------------
+
+
+def Mentor_stream(
+    topic: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    token_budget: int | None = DEFAULT_TOKEN_BUDGET,
+    fast: bool = False,
+) -> Iterator[PipelineEvent]:
+    """
+    Runs the entire Mentor pipeline, yielding an event as each stage (or piece of a stage) completes.
+    The last event is always a CurationEvent.
+    """
+    start = time.perf_counter()
+
+    def elapsed() -> float:
+        return time.perf_counter() - start
+
+    cached = semantic_lookup(topic)
+    if cached is not None and cached[1] is not None:
+        yield CurriculumEvent(topic=topic, elapsed=elapsed(), curriculum=cached[0])
+        yield CurationEvent(topic=topic, elapsed=elapsed(), curation=cached[1])
+        return
+    with artifact_run():
+        if cached is not None:
+            curriculum = cached[0]
+            record_artifact(topic, "curriculum", curriculum)
+        elif fast:
+            curriculum = lnd_structured_curriculum(topic)
+        else:
+            chunks = []
+            # model_name = "llama3.1:latest"
+            with span("lnd_curriculum"):
+                for chunk in stream_chain(prompt_lnd, persona_lnd, {"topic": topic}):
+                    chunks.append(chunk)
+                    yield IdealCurriculumDelta(topic=topic, elapsed=elapsed(), text=chunk)
+            ideal_curriculum = extract_curriculum_description("".join(chunks))
+            record_artifact(topic, "ideal_curriculum", ideal_curriculum)
+            yield IdealCurriculumEvent(
+                topic=topic, elapsed=elapsed(), ideal_curriculum=ideal_curriculum
+            )
+            curriculum = curriculum_specialist_curriculum(ideal_curriculum, topic)
+        yield CurriculumEvent(topic=topic, elapsed=elapsed(), curriculum=curriculum)
+        with span("identify_courses", modules=len(curriculum.modules)):
+            retrievals: list[ModuleRetrieval | None] = [None] * len(curriculum.modules)
+            for index, retrieval in retrieve_as_completed(
+                curriculum.modules, max_workers=max_workers
+            ):
+                retrievals[index] = retrieval
+                yield ModuleRetrievalEvent(
+                    topic=topic,
+                    elapsed=elapsed(),
+                    index=index,
+                    retrieval=retrieval,
+                )
+            curation = librarian_curation(
+                curriculum, retrievals, token_budget=token_budget
+            )
+        if cached is None:
+            semantic_store(topic, curriculum, curation)
+        yield CurationEvent(topic=topic, elapsed=elapsed(), curation=curation)
+
+
+async def Mentor_astream(
+    topic: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    token_budget: int | None = DEFAULT_TOKEN_BUDGET,
+    fast: bool = False,
+) -> AsyncIterator[PipelineEvent]:
+    """
+    Async-iterator version of Mentor_stream. The (blocking) pipeline runs on a worker thread, in a copy of the
+    caller's context (call priority, artifact run); events are handed to the event loop as they're produced.
+    Exceptions are re-raised here.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+    cancelled = threading.Event()
+
+    def produce():
+        try:
+            for event in Mentor_stream(
+                topic,
+                max_workers=max_workers,
+                token_budget=token_budget,
+                fast=fast,
+            ):
+                if cancelled.is_set():
+                    return
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+        except BaseException as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+
+    loop.run_in_executor(None, copy_context().run, produce)
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Stop the producer at the next event if the consumer goes away early.
+        cancelled.set()
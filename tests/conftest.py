@@ -0,0 +1,62 @@
+"""
+The modules are flat at the top level of the repository; make them importable from the tests, along with the
+benchmark fakes for Chain, Curator, Get and review_certificates (benchmarks/fakes.py) and the editing_mode tools.
+"""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(1, str(ROOT / "benchmarks"))
+sys.path.insert(2, str(ROOT / "editing_mode"))
+
+# Mentor's opt-in features, off for each test that uses the fakes; a test turns on what it needs.
+MENTOR_DEFAULTS = {
+    "message_store_log_file": None,
+    "message_store_run_log": None,
+    "_message_store_ready": False,
+    "response_cache": None,
+    "refresh_cache": False,
+    "retrieval_cache": None,
+    "semantic_cache": None,
+    "router": None,
+    "scheduler": None,
+    "local_index": None,
+    "catalog_titles": None,
+    "catalog_publishers": {},
+    "blacklist": None,
+    "use_blacklist": False,
+    "artifact_store": None,
+    "candidate_ids": False,
+}
+
+
+@pytest.fixture
+def fakes(monkeypatch):
+    """
+    Mentor running on the benchmark fakes, without latency or message logging. Returns the FakeConfig.
+    """
+    from fakes import (
+        FakeConfig,
+        build_chain_module,
+        build_curator_module,
+        build_get_module,
+        build_review_certificates_module,
+    )
+    import Mentor
+
+    config = FakeConfig(llm_latency=0, curate_latency=0, get_latency=0)
+    monkeypatch.setitem(sys.modules, "Chain", build_chain_module(config))
+    monkeypatch.setitem(sys.modules, "Curator", build_curator_module(config))
+    monkeypatch.setitem(sys.modules, "Get", build_get_module(config))
+    monkeypatch.setitem(sys.modules, "review_certificates", build_review_certificates_module(config))
+    for name, value in MENTOR_DEFAULTS.items():
+        monkeypatch.setattr(Mentor, name, value)
+    Mentor.load_model.cache_clear()
+    Mentor.course_TOC.cache_clear()
+    yield config
+    Mentor.load_model.cache_clear()
+    Mentor.course_TOC.cache_clear()
@@ -0,0 +1,74 @@
+from artifacts import ArtifactStore, import_pickle
+from Mentor import Curation
+import artifacts
+import pickle
+
+
+def test_values_round_trip_by_kind(tmp_path):
+    store = ArtifactStore(tmp_path / "artifacts.db")
+    curation = Curation(topic="Python", course_titles=["Python Essential Training"])
+    store.put("Python", "curation", curation, run_id="run-1")
+    store.put("Python", "ideal_curriculum", "<curriculum_description>...", run_id="run-1")
+    store.put("Python", "curation_model", {"winner": "claude"}, run_id="run-1")
+    recorded = store.run("run-1")
+    assert recorded["curation"].kind == "Curation"
+    assert recorded["curation"].load(Curation) == curation
+    assert recorded["ideal_curriculum"].load() == "<curriculum_description>..."
+    assert recorded["curation_model"].load() == {"winner": "claude"}
+
+
+def test_latest_run_and_topics(tmp_path):
+    store = ArtifactStore(tmp_path / "artifacts.db")
+    store.put("Python", "critique", "first", run_id="run-1")
+    store.put("SQL", "critique", "other topic", run_id="run-2")
+    store.put("Python", "critique", "second", run_id="run-3")
+    assert store.latest("Python", "critique").value == "second"
+    assert store.latest("Python", "curation") is None
+    assert set(store.run("run-1")) == {"critique"}
+    assert store.topics() == ["Python", "SQL"]
+    assert len(store) == 3
+    # Without a run ID, each put starts its own run.
+    first, second = store.put("Excel", "critique", "a"), store.put("Excel", "critique", "b")
+    assert store.get(first).run_id != store.get(second).run_id
+
+
+def test_find_pages_through_matches_in_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, "PAGE_SIZE", 3)
+    store = ArtifactStore(tmp_path / "artifacts.db")
+    for i in range(7):
+        store.put("Python" if i % 2 else "SQL", "critique", str(i), run_id=f"run-{i}")
+    assert [artifact.value for artifact in store.find(stage="critique")] == [str(i) for i in range(7)]
+    assert [artifact.value for artifact in store.find(topic="Python")] == ["1", "3", "5"]
+    assert [artifact.value for artifact in store.find(topic="SQL", run_id="run-4")] == ["4"]
+
+
+def test_store_persists_across_instances(tmp_path):
+    ArtifactStore(tmp_path / "artifacts.db").put("Python", "critique", "kept", run_id="run-1")
+    assert ArtifactStore(tmp_path / "artifacts.db").latest("Python", "critique").value == "kept"
+
+
+def test_import_pickle(tmp_path):
+    path = tmp_path / "cached.pkl"
+    entries = [
+        {
+            "CURATION_OBJECT": {"topic": "Python", "course_titles": ["Python Essential Training"]},
+            "CURRICULUM": "Python Essential Training\n  Chapter 1",
+            "CRITIQUE": "Too basic.",
+        }
+    ]
+    path.write_bytes(pickle.dumps(entries))
+    store = ArtifactStore(tmp_path / "artifacts.db")
+    assert import_pickle(store, path) == 1
+    run_id = store.latest("Python", "curation").run_id
+    assert set(store.run(run_id)) == {"curation", "curriculum_text", "critique"}
+    assert store.latest("Python", "critique").load() == "Too basic."
+
+
+def test_pipeline_records_every_stage_under_one_run(fakes, tmp_path):
+    import Mentor
+
+    store = Mentor.enable_artifact_store(str(tmp_path / "artifacts.db"))
+    with Mentor.artifact_run() as run_id:
+        Mentor.Mentor("Python")
+    assert {"ideal_curriculum", "curriculum", "candidates", "curation"} <= set(store.run(run_id))
+    assert {artifact.run_id for artifact in store.find(topic="Python")} == {run_id}
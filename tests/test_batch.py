@@ -0,0 +1,81 @@
+from batch import Checkpoint, load_checkpoint, read_topics, run_batch
+from Mentor import Curation
+import pytest
+
+
+def curation_for(topic: str) -> Curation:
+    return Curation(topic=topic, course_titles=[f"{topic} Essential Training"])
+
+
+def test_read_topics(tmp_path):
+    path = tmp_path / "topics.txt"
+    path.write_text("# header\nPython\n\n  SQL  \nPython\nExcel\n")
+    assert read_topics(path) == ["Python", "SQL", "Excel"]
+
+
+def test_resume_skips_finished_topics_and_retries_failures(tmp_path):
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    calls = []
+
+    def flaky(topic, **kwargs):
+        calls.append(topic)
+        if topic == "SQL":
+            raise TimeoutError("model timed out")
+        return curation_for(topic)
+
+    result = run_batch(["Python", "SQL", "Excel"], checkpoint=checkpoint, pipelines=2, pipeline=flaky)
+    assert list(result.curations) == ["Python", "Excel"]
+    assert result.failures == {"SQL": "TimeoutError: model timed out"}
+    assert result.skipped == 0
+
+    calls.clear()
+    result = run_batch(
+        ["Python", "SQL", "Excel"], checkpoint=checkpoint, pipeline=lambda topic, **kwargs: curation_for(topic)
+    )
+    assert result.skipped == 2 and not result.failures
+    # Curations come back in topic order, restored ones included.
+    assert list(result.curations) == ["Python", "SQL", "Excel"]
+    assert set(load_checkpoint(checkpoint)) == {"Python", "SQL", "Excel"}
+
+
+def test_truncated_last_line_is_ignored_and_not_glued_to(tmp_path):
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    Checkpoint(checkpoint).append("Python", curation_for("Python"))
+    with open(checkpoint, "a") as f:
+        f.write('{"topic": "SQL", "curation": {"top')
+    assert list(load_checkpoint(checkpoint)) == ["Python"]
+    Checkpoint(checkpoint).append("Excel", curation_for("Excel"))
+    assert list(load_checkpoint(checkpoint)) == ["Python", "Excel"]
+
+
+def test_failures_are_logged_once(tmp_path, caplog):
+    def failing(topic, **kwargs):
+        raise ValueError("bad curriculum")
+
+    with caplog.at_level("INFO", logger="Mentor.batch"):
+        run_batch(["Python"], checkpoint=tmp_path / "checkpoint.jsonl", pipeline=failing)
+    assert [record.getMessage() for record in caplog.records if record.levelname == "WARNING"] == [
+        "Failed: Python (ValueError: bad curriculum)"
+    ]
+
+
+@pytest.mark.parametrize("local", [False, True])
+def test_batch_on_the_fakes(fakes, tmp_path, local, monkeypatch):
+    import Mentor
+
+    if local:
+        # run_waves: one batched retrieval per wave.
+        class Index:
+            courses = []
+            publishers = {}
+
+            def search(self, queries, k=10):
+                return [[(f"Course {i}", "description") for i in range(k)] for _ in queries]
+
+        monkeypatch.setattr(Mentor, "local_index", Index())
+    checkpoint = tmp_path / "checkpoint.jsonl"
+    result = run_batch(["Python", "SQL"], checkpoint=checkpoint, pipelines=2)
+    assert not result.failures
+    assert set(result.curations) == {"Python", "SQL"}
+    assert all(curation.course_titles for curation in result.curations.values())
+    assert load_checkpoint(checkpoint) == result.curations
@@ -0,0 +1,57 @@
+from blacklist import Blacklist
+import pytest
+
+
+def test_bare_vendor_names_only_match_the_publisher():
+    blacklist = Blacklist(["Microsoft", "Google"])
+    assert not blacklist.matches("Microsoft Excel Essential Training")
+    assert not blacklist.matches("Google Analytics Essential Training", publisher="LinkedIn")
+    assert blacklist.matches("Google Analytics Essential Training", publisher="Google")
+    assert blacklist.matches("Azure Fundamentals", publisher="Microsoft Press")
+
+
+def test_publisher_rules_match_whole_words():
+    blacklist = Blacklist(["publisher:IBM", "Amazon Web Services"])
+    assert not blacklist.publisher_matches("IBMX Learning")
+    assert blacklist.publisher_matches("ibm")
+    assert blacklist.publisher_matches("Amazon Web Services, Inc.")
+    assert not blacklist.publisher_matches("Amazon")
+
+
+def test_title_rules():
+    blacklist = Blacklist(["exact:Excel Essential Training", "prefix:Microsoft", r"regex:^AWS\b.*Certification"])
+    assert blacklist.matches("excel  essential training")
+    assert not blacklist.matches("Excel Essential Training 2")
+    assert blacklist.matches("Microsoft Teams Tips")
+    assert not blacklist.matches("Learning Microsoft Teams")
+    assert blacklist.matches("AWS Solutions Architect Certification Prep")
+    assert not blacklist.matches("Prepare for AWS Certification")
+
+
+def test_bad_regex_fails_loudly():
+    with pytest.raises(Exception):
+        Blacklist(["regex:("])
+
+
+def test_filter_uses_publisher_of():
+    blacklist = Blacklist(["Microsoft", "prefix:Vendor"])
+    courses = [
+        ("Microsoft Excel Essential Training", "By LinkedIn"),
+        ("Azure Fundamentals", "Microsoft's cloud"),
+        ("Vendor Tools", "..."),
+    ]
+    publishers = {"Azure Fundamentals": "Microsoft"}
+    kept, removed = blacklist.filter(courses, publisher_of=publishers.get)
+    assert kept == [courses[0]]
+    assert removed == 2
+    kept, removed = blacklist.filter(courses)
+    assert kept == courses[:2]
+    assert removed == 1
+
+
+def test_load_skips_comments_and_blank_lines(tmp_path):
+    path = tmp_path / "blacklist.conf"
+    path.write_text("# vendors\n\nIBM\nexact:Some Course\n")
+    blacklist = Blacklist.load(path)
+    assert len(blacklist) == 2
+    assert blacklist.matches("Some Course")
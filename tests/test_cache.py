@@ -0,0 +1,137 @@
+from cache import DiskCache, RetrievalCache, cache_key, catalog_fingerprint, normalize_query
+import cache
+import sys
+import pytest
+
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "time", clock.time)
+    return clock
+
+
+def test_cache_key_is_stable_and_order_sensitive():
+    assert cache_key("claude", "persona", "prompt") == cache_key("claude", "persona", "prompt")
+    assert cache_key("claude", "persona", "prompt") != cache_key("claude", "prompt", "persona")
+    assert cache_key({"b": 1, "a": 2}) == cache_key({"a": 2, "b": 1})
+
+
+def test_entries_expire_after_max_age(tmp_path, clock):
+    store = DiskCache(tmp_path / "cache.sqlite", max_age=60)
+    store.set("a", "first")
+    clock.now += 30
+    assert store.get("a") == "first"
+    # Reading doesn't extend an entry's life: age counts from when it was written.
+    clock.now += 31
+    assert store.get("a") is None
+    assert len(store) == 0
+
+
+def test_expired_entries_are_evicted_on_write(tmp_path, clock):
+    store = DiskCache(tmp_path / "cache.sqlite", max_age=60)
+    store.set("a", "old")
+    clock.now += 61
+    store.set("b", "new")
+    assert len(store) == 1
+
+
+def test_least_recently_used_entries_are_evicted_beyond_max_bytes(tmp_path, clock):
+    store = DiskCache(tmp_path / "cache.sqlite", max_bytes=20, max_age=None)
+    for key in "abc":
+        store.set(key, "x" * 6)
+        clock.now += 1
+    store.get("a")  # now more recent than b
+    clock.now += 1
+    store.set("d", "x" * 6)
+    assert store.get("b") is None
+    assert [store.get(key) for key in "acd"] == ["x" * 6] * 3
+
+
+def test_entries_persist_across_instances(tmp_path):
+    DiskCache(tmp_path / "cache.sqlite").set("a", "value")
+    assert DiskCache(tmp_path / "cache.sqlite").get("a") == "value"
+
+
+def test_response_cache_hit_loads_no_model(fakes, tmp_path, monkeypatch):
+    import Mentor
+
+    monkeypatch.setattr(Mentor, "response_cache", DiskCache(tmp_path / "responses.sqlite"))
+    first = Mentor.run_chain_once("Tell me about {{topic}}", "persona", {"topic": "SQL"})
+    loaded = []
+    monkeypatch.setattr(Mentor, "load_chain", lambda: loaded.append("chain"))
+    monkeypatch.delitem(sys.modules, "Chain")
+    assert Mentor.run_chain_once("Tell me about {{topic}}", "persona", {"topic": "SQL"}) == first
+    assert not loaded
+    # A structured answer comes back as the pydantic model.
+    curation = Mentor.Curation(topic="SQL", course_titles=["SQL Essential Training"])
+    key = Mentor.response_cache_key("claude", "persona", "Pick courses", {}, Mentor.Curation)
+    Mentor.response_cache.set(key, curation.model_dump_json())
+    assert Mentor.run_chain_once("Pick courses", "persona", {}, Mentor.Curation) == curation
+
+
+def test_query_normalization():
+    assert normalize_query("  Python:  Data\tAnalysis! ") == "python data analysis"
+    assert normalize_query("Ｐｙｔｈｏｎ") == "python"
+
+
+def test_retrieval_cache_shares_entries_between_equivalent_queries(tmp_path):
+    retrieval = RetrievalCache(tmp_path / "retrieval.sqlite", catalog_version=lambda: "v1")
+    calls = []
+
+    def retrieve(query):
+        calls.append(query)
+        return [("Python Essential Training", "Learn Python")]
+
+    assert retrieval.lookup("Python: basics", retrieve) == [("Python Essential Training", "Learn Python")]
+    assert retrieval.lookup("python   BASICS!", retrieve) == [("Python Essential Training", "Learn Python")]
+    assert calls == ["Python: basics"]
+    assert (retrieval.stats.memory_hits, retrieval.stats.misses) == (1, 1)
+    # A new process: the disk tier answers.
+    reopened = RetrievalCache(tmp_path / "retrieval.sqlite", catalog_version=lambda: "v1")
+    assert reopened.lookup("python basics", retrieve) == [("Python Essential Training", "Learn Python")]
+    assert reopened.stats.disk_hits == 1 and len(calls) == 1
+
+
+def test_retrieval_cache_invalidates_when_the_catalog_changes(tmp_path):
+    version = ["v1"]
+    retrieval = RetrievalCache(tmp_path / "retrieval.sqlite", catalog_version=lambda: version[0], version_ttl=0)
+    retrieval.lookup("python", lambda query: [("Old Course", "")])
+    version[0] = "v2"
+    assert retrieval.lookup("python", lambda query: [("New Course", "")]) == [("New Course", "")]
+    assert retrieval.stats.misses == 2
+
+
+def test_catalog_version_is_rechecked_at_most_every_version_ttl(tmp_path):
+    checks = []
+    retrieval = RetrievalCache(
+        tmp_path / "retrieval.sqlite", catalog_version=lambda: checks.append(1) or "v1", version_ttl=60
+    )
+    for _ in range(3):
+        retrieval.lookup("python", lambda query: [])
+    assert len(checks) == 1
+
+
+def test_catalog_fingerprint_changes_with_the_collection(tmp_path):
+    (tmp_path / "chroma.sqlite3").write_text("collection")
+    (tmp_path / "__init__.py").write_text("")
+    before = catalog_fingerprint(tmp_path)
+    assert catalog_fingerprint(tmp_path) == before
+    # Source files don't count; the collection's files do.
+    (tmp_path / "loader.py").write_text("import chromadb")
+    assert catalog_fingerprint(tmp_path) == before
+    (tmp_path / "segment.bin").write_bytes(b"\0" * 8)
+    assert catalog_fingerprint(tmp_path) != before
+
+
+def test_missing_catalog_warns_and_never_invalidates(tmp_path):
+    with pytest.warns(RuntimeWarning, match="MENTOR_CATALOG_PATH"):
+        assert catalog_fingerprint(tmp_path / "missing") == "unknown"
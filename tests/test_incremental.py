@@ -0,0 +1,36 @@
+from incremental import diff_curricula
+from Mentor import Curriculum, Module
+
+
+def module(title: str, description: str = "") -> Module:
+    return Module(title=title, description=description or title, learning_objectives=[title])
+
+
+def curriculum(*modules: Module) -> Curriculum:
+    return Curriculum(topic="Topic", description="", audience="", modules=list(modules))
+
+
+def test_identical_curricula():
+    old = curriculum(module("A"), module("B"))
+    diff, reused = diff_curricula(old, old)
+    assert (diff.unchanged, diff.changed, diff.removed) == ([0, 1], [], [])
+    assert reused == {0: 0, 1: 1}
+
+
+def test_edit_add_remove_and_reorder():
+    old = curriculum(module("A"), module("B"), module("C"))
+    new = curriculum(module("C"), module("A", "edited"), module("D"), module("B"))
+    diff, reused = diff_curricula(old, new)
+    assert diff.unchanged == [0, 3]
+    assert diff.changed == [1, 2]
+    assert diff.removed == [0]
+    assert reused == {0: 2, 3: 1}
+
+
+def test_duplicate_modules_are_matched_once_each():
+    old = curriculum(module("A"), module("A"))
+    new = curriculum(module("A"), module("A"), module("A"))
+    diff, reused = diff_curricula(old, new)
+    assert reused == {0: 0, 1: 1}
+    assert diff.changed == [2]
+    assert diff.removed == []
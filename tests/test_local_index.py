@@ -0,0 +1,80 @@
+from local_index import LocalIndex, load_publishers, course_publisher, normalize_rows
+import numpy as np
+import json
+import pytest
+
+COURSES = [
+    ("Python Essential Training", [1.0, 0.0, 0.0], {"publisher": "LinkedIn"}),
+    ("Python for Data Science", [0.8, 0.6, 0.0], {"provider": "Microsoft"}),
+    ("SQL Essential Training", [0.0, 1.0, 0.0], {}),
+    ("Negotiation Skills", [0.0, 0.0, 1.0], None),
+]
+QUERIES = {"python": [1.0, 0.1, 0.0], "databases": [0.0, 1.0, 0.1], "negotiating": [0.0, 0.0, 2.0]}
+
+
+def embed(texts):
+    return np.array([QUERIES[text] for text in texts])
+
+
+def export(index_dir, courses):
+    index_dir.mkdir(exist_ok=True)
+    vectors = normalize_rows([vector for _, vector, _ in courses]) if courses else np.zeros((0, 3), np.float32)
+    np.save(index_dir / "embeddings.npy", vectors)
+    with open(index_dir / "courses.jsonl", "w") as f:
+        for title, _, metadata in courses:
+            f.write(json.dumps({"title": title, "description": f"About {title}", "metadata": metadata}) + "\n")
+    return index_dir
+
+
+def test_batched_search_ranks_by_cosine_similarity(tmp_path):
+    index = LocalIndex(export(tmp_path / "index", COURSES), embed=embed)
+    python, databases, negotiating = index.search(["python", "databases", "negotiating"], k=2)
+    assert python == [
+        ("Python Essential Training", "About Python Essential Training"),
+        ("Python for Data Science", "About Python for Data Science"),
+    ]
+    assert [title for title, _ in databases] == ["SQL Essential Training", "Python for Data Science"]
+    assert negotiating[0][0] == "Negotiation Skills"
+    assert index.search([]) == []
+
+
+def test_k_is_capped_at_the_catalog_size(tmp_path):
+    index = LocalIndex(export(tmp_path / "index", COURSES), embed=embed)
+    assert len(index.search(["python"], k=10)[0]) == len(COURSES)
+
+
+def test_empty_catalog_returns_no_hits(tmp_path):
+    index = LocalIndex(export(tmp_path / "index", []), embed=embed)
+    assert len(index) == 0
+    assert index.search(["python", "databases"]) == [[], []]
+
+
+def test_mismatched_export_is_rejected(tmp_path):
+    index_dir = export(tmp_path / "index", COURSES)
+    np.save(index_dir / "embeddings.npy", normalize_rows([vector for _, vector, _ in COURSES[:2]]))
+    with pytest.raises(ValueError, match="2 embeddings but 4 courses"):
+        LocalIndex(index_dir, embed=embed)
+
+
+def test_publishers(tmp_path, monkeypatch):
+    index_dir = export(tmp_path / "index", COURSES)
+    expected = {"Python Essential Training": "LinkedIn", "Python for Data Science": "Microsoft"}
+    assert LocalIndex(index_dir, embed=embed).publishers == expected
+    assert load_publishers(index_dir) == expected
+    monkeypatch.setenv("MENTOR_PUBLISHER_KEY", "vendor")
+    assert course_publisher({"vendor": "IBM", "publisher": "LinkedIn"}) == "IBM"
+    assert course_publisher(None) is None
+
+
+def test_pipeline_retrieves_every_module_in_one_search(fakes, tmp_path, monkeypatch):
+    import Mentor
+
+    searches = []
+    index = LocalIndex(export(tmp_path / "index", COURSES), embed=lambda texts: np.ones((len(texts), 3)))
+    search = index.search
+    monkeypatch.setattr(index, "search", lambda queries, k=10: searches.append(len(queries)) or search(queries, k))
+    monkeypatch.setattr(Mentor, "local_index", index)
+    curriculum = Mentor.plan_curriculum("Python", fast=True)
+    retrievals = Mentor.retrieve_courses(curriculum)
+    assert searches == [len(curriculum.modules)]
+    assert all(len(retrieval.courses) == len(COURSES) for retrieval in retrievals)
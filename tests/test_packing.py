@@ -0,0 +1,32 @@
+from packing import pack_candidates, estimate_tokens
+
+
+def test_duplicates_are_merged_and_ranked_by_fused_score():
+    packed = pack_candidates(
+        [
+            ("Module A", [("Shared", "desc"), ("Only A", "desc")]),
+            ("Module B", [("Only B", "desc"), ("shared ", "desc")]),
+        ],
+        token_budget=None,
+    )
+    # Only B was ranked first for its module, Only A second.
+    assert [candidate.title for candidate in packed.candidates] == ["Shared", "Only B", "Only A"]
+    assert packed.candidates[0].modules == ["Module A", "Module B"]
+    assert packed.duplicates == 1
+    assert packed.dropped == 0
+
+
+def test_budget_keeps_the_best_candidates():
+    hits = [("Module", [(f"Course {i}", "x" * 40) for i in range(10)])]
+    cost = estimate_tokens(f"Course 0: {'x' * 40}") + 1
+    packed = pack_candidates(hits, token_budget=3 * cost)
+    assert [candidate.title for candidate in packed.candidates] == ["Course 0", "Course 1", "Course 2"]
+    assert packed.tokens == 3 * cost
+    assert packed.dropped == 7
+    assert packed.dropped_tokens == 7 * cost
+
+
+def test_ids_map_back_to_titles():
+    packed = pack_candidates([("Module", [("One", "a"), ("Two", "b")])])
+    assert packed.numbered_context == "[1] One: a\n[2] Two: b"
+    assert packed.titles_for([2, 1, 2, 7]) == (["Two", "One"], [7])
@@ -0,0 +1,101 @@
+from blacklist import Blacklist
+from Mentor import Curation
+import react_agent
+import Mentor
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clean_observations():
+    react_agent.clear_observations()
+    yield
+    react_agent.clear_observations()
+
+
+def test_get_alternative_courses_applies_publisher_rules(fakes, monkeypatch):
+    courses = Mentor.search_courses("pandas for data analysis")
+    vendor_title = courses[0][0]
+    monkeypatch.setattr(Mentor, "blacklist", Blacklist(["Vendor"]))
+    monkeypatch.setattr(Mentor, "use_blacklist", True)
+    monkeypatch.setattr(Mentor, "catalog_publishers", {vendor_title: "Vendor Inc."})
+    titles, text = react_agent.get_alternative_courses("pandas for data analysis")
+    assert vendor_title not in titles
+    assert titles == [title for title, _ in courses[1 : react_agent.ALTERNATIVES + 1]]
+    assert all(title in text for title in titles)
+
+
+def test_observations_are_memoised_and_bounded(monkeypatch):
+    calls = []
+
+    def get_alternative_courses(description):
+        calls.append(description)
+        return [description.upper()], f"TOC of {description}"
+
+    monkeypatch.setattr(react_agent, "get_alternative_courses", get_alternative_courses)
+    monkeypatch.setattr(react_agent, "MAX_OBSERVATIONS", 2)
+    results, cached = react_agent.observe(["a", "b"])
+    assert results == [(["A"], "TOC of a"), (["B"], "TOC of b")] and cached == 0
+    # Same description up to case and spacing: from the memo. "a" becomes the most recently used.
+    _, cached = react_agent.observe(["  A "])
+    assert cached == 1 and calls == ["a", "b"]
+    react_agent.observe(["c"])
+    assert list(react_agent.observations) == ["a", "c"]
+
+
+def test_failed_calls_are_reported_not_memoised(monkeypatch):
+    def get_alternative_courses(description):
+        raise TimeoutError("search timed out")
+
+    monkeypatch.setattr(react_agent, "get_alternative_courses", get_alternative_courses)
+    (result,), _ = react_agent.observe(["a"])
+    assert result == ([], "Error: TimeoutError: search timed out")
+    assert not react_agent.observations
+
+
+def test_improve_curation_runs_calls_and_repairs_titles(monkeypatch):
+    curation = Curation(topic="Python", course_titles=["Python Essential Training"])
+    responses = iter(
+        [
+            '<thought>Add testing.</thought>\n<function_call>Get_alternative_courses(description="unit testing")'
+            "</function_call>\n<observation>made up</observation>",
+            '<improved_curation>{"topic": "Python", "course_titles": ["python essential training", '
+            '"Unit Testing in Python", "Invented Course"]}</improved_curation>\n<explanation>Added tests.</explanation>',
+        ]
+    )
+    prompts = []
+
+    def run_chain(prompt, persona, input_variables, model_name="gpt"):
+        prompts.append(input_variables["TRANSCRIPT"])
+        return next(responses)
+
+    monkeypatch.setattr(react_agent, "run_chain", run_chain)
+    monkeypatch.setattr(
+        react_agent,
+        "get_alternative_courses",
+        lambda description: (["Unit Testing in Python"], "Unit Testing in Python\n  Chapter 1"),
+    )
+    result = react_agent.improve_curation(curation, "curriculum", "critique")
+    assert result.improved and result.stopped == "answer"
+    assert result.iterations == 2 and result.calls == 1
+    assert result.curation.course_titles == ["Python Essential Training", "Unit Testing in Python"]
+    assert result.unmatched_titles == ["Invented Course"]
+    assert result.explanation == "Added tests."
+    # The model's own <observation> is dropped; ours is in the transcript.
+    assert "made up" not in prompts[1]
+    assert '<observation description="unit testing">' in prompts[1]
+
+
+def test_improve_curation_stops_at_max_iterations(monkeypatch):
+    curation = Curation(topic="Python", course_titles=["Python Essential Training"])
+    finals = []
+
+    def run_chain(prompt, persona, input_variables, model_name="gpt"):
+        finals.append(input_variables["FINAL"])
+        return '<function_call>Get_alternative_courses(description="more")</function_call>'
+
+    monkeypatch.setattr(react_agent, "run_chain", run_chain)
+    monkeypatch.setattr(react_agent, "get_alternative_courses", lambda description: ([], ""))
+    result = react_agent.improve_curation(curation, "curriculum", "critique", max_iterations=2)
+    assert result.stopped == "max_iterations" and not result.improved
+    assert result.curation == curation
+    assert finals == [False, False, True]
@@ -0,0 +1,97 @@
+from scheduling import ModelLimits, BATCH, INTERACTIVE
+import Mentor
+import pytest
+
+TOPICS = ["Python for Data Science", "SQL for Analysts", "Excel Dashboards"]
+
+
+@pytest.fixture
+def review_runner(fakes):
+    """
+    review_runner imports review_certificates at import time, so import it once the fakes are installed.
+    """
+    import review_runner
+
+    return review_runner
+
+
+def test_review_topic_runs_every_stage(review_runner, tmp_path):
+    store = Mentor.enable_artifact_store(str(tmp_path / "artifacts.sqlite"))
+    result = review_runner.review_topic(TOPICS[0])
+    assert result.error is None
+    assert result.curation.topic == TOPICS[0]
+    assert result.curriculum == result.curation.curation_TOCs()
+    assert result.critique and result.revision
+    assert set(result.timings) == set(review_runner.STAGES) | {"total"}
+    # Every stage's output lands in one run, including those recorded on the TOC and critique threads' side.
+    run_id = store.latest(TOPICS[0], "revision").run_id
+    assert {"curation", "curriculum_text", "critique", "revision"} <= set(store.run(run_id))
+
+
+def test_failures_name_the_stage(review_runner, monkeypatch):
+    def review_curriculum(curation, audience):
+        raise TimeoutError("critic unavailable")
+
+    monkeypatch.setattr(review_runner, "review_curriculum", review_curriculum)
+    result = review_runner.review_topic(TOPICS[0])
+    assert result.error == "critique: TimeoutError: critic unavailable"
+    assert result.curation is not None and result.revision is None
+    assert "total" in result.timings and "revise" not in result.timings
+
+
+def test_the_priority_reaches_every_model_call(review_runner, monkeypatch):
+    scheduler = Mentor.enable_scheduler({"gpt": ModelLimits(max_concurrency=4)})
+    calls = []
+    run = scheduler.run
+
+    def record(lane, call, priority=INTERACTIVE, **kwargs):
+        calls.append((lane, priority))
+        return run(lane, call, priority=priority, **kwargs)
+
+    monkeypatch.setattr(scheduler, "run", record)
+    result = review_runner.review_topic(TOPICS[0], priority=BATCH)
+    assert result.error is None
+    # The critique builds its own Chain and Model("gpt") on a worker thread; it's still scheduled, at BATCH.
+    assert ("gpt", BATCH) in calls
+    assert {priority for _, priority in calls} == {BATCH}
+
+
+def test_run_reviews_returns_results_in_topic_order(review_runner, capsys):
+    report = review_runner.run_reviews(TOPICS, workers=3, revise=False)
+    assert [result.topic for result in report.results] == TOPICS
+    assert not report.failures
+    assert all(result.critique and result.revision is None for result in report.results)
+    assert report.workers == 3 and not report.processes
+    assert f"Reviewed {len(TOPICS)} topics" in str(report)
+    assert capsys.readouterr().out.count(" done in ") == len(TOPICS)
+
+
+def test_configure_worker(review_runner, tmp_path):
+    review_runner.configure_worker()
+    assert Mentor.artifact_store is None and Mentor.scheduler is None
+    review_runner.configure_worker(str(tmp_path / "artifacts.sqlite"), {"gpt": ModelLimits(requests_per_minute=60)})
+    assert Mentor.artifact_store is not None
+    assert Mentor.scheduler is not None
+
+
+def test_process_workers_get_a_share_of_the_quotas(review_runner, monkeypatch):
+    pools = []
+
+    class Pool:
+        def __init__(self, max_workers, mp_context=None, initializer=None, initargs=()):
+            pools.append((max_workers, initializer, initargs))
+            self.threads = review_runner.ThreadPoolExecutor(max_workers=max_workers)
+
+        def __enter__(self):
+            return self.threads.__enter__()
+
+        def __exit__(self, *exc):
+            return self.threads.__exit__(*exc)
+
+    monkeypatch.setattr(review_runner, "ProcessPoolExecutor", Pool)
+    limits = ModelLimits(requests_per_minute=60, tokens_per_minute=6000, max_concurrency=4)
+    report = review_runner.run_reviews(TOPICS[:2], workers=2, processes=True, revise=False, rate_limits={"gpt": limits})
+    assert report.processes and not report.failures
+    ((workers, initializer, (artifacts, shares)),) = pools
+    assert workers == 2 and initializer is review_runner.configure_worker
+    assert artifacts is None and shares == {"gpt": limits.share(2)}
@@ -0,0 +1,105 @@
+from routing import HedgedRouter, LatencyTracker
+from contextvars import ContextVar
+import threading
+import pytest
+import time
+
+request = ContextVar("request", default=None)
+
+
+def test_percentile_is_nearest_rank():
+    tracker = LatencyTracker()
+    for seconds in (1, 2, 3, 4, 5, 6, 7, 8, 9, 10):
+        tracker.record("claude", "lnd", seconds)
+    assert tracker.percentile("claude", "lnd", 0.95) == (10, 10)
+    assert tracker.percentile("claude", "lnd", 0.5) == (5, 10)
+    assert tracker.percentile("claude", "other", 0.95) == (None, 0)
+
+
+def test_fast_primary_is_not_hedged():
+    router = HedgedRouter(primary="a", secondary="b", default_deadline=1.0)
+    result, winner = router.run("lnd", lambda model_name: model_name)
+    assert (result, winner) == ("a", "a")
+    assert router.stats.hedged == {}
+    assert router.stats.wins == {"lnd": {"a": 1}}
+
+
+def test_stalled_primary_is_hedged_and_secondary_wins():
+    release = threading.Event()
+
+    def call(model_name):
+        if model_name == "a":
+            release.wait(5)
+        return model_name
+
+    router = HedgedRouter(primary="a", secondary="b", default_deadline=0.05)
+    try:
+        result, winner = router.run("lnd", call)
+    finally:
+        release.set()
+    assert (result, winner) == ("b", "b")
+    assert router.stats.hedged == {"lnd": 1}
+
+
+def test_failing_primary_falls_over_straight_away():
+    def call(model_name):
+        if model_name == "a":
+            raise ValueError("unparseable")
+        return model_name
+
+    router = HedgedRouter(primary="a", secondary="b", default_deadline=10.0)
+    start = time.perf_counter()
+    assert router.run("lnd", call) == ("b", "b")
+    assert time.perf_counter() - start < 5
+
+
+def test_primary_exception_is_raised_when_both_fail():
+    def call(model_name):
+        raise ValueError(model_name)
+
+    router = HedgedRouter(primary="a", secondary="b", default_deadline=10.0)
+    with pytest.raises(ValueError, match="a"):
+        router.run("lnd", call)
+
+
+def test_deadline_follows_recorded_latencies():
+    router = HedgedRouter(primary="a", secondary="b", default_deadline=30.0, min_samples=3)
+    assert router.deadline("lnd") == 30.0
+    for seconds in (0.1, 0.2, 0.3):
+        router.latencies.record("a", "lnd", seconds)
+    assert router.deadline("lnd") == 0.3
+
+
+def test_calls_run_in_the_callers_context():
+    router = HedgedRouter(primary="a", secondary="b", default_deadline=1.0)
+    token = request.set("run-1")
+    try:
+        result, _ = router.run("lnd", lambda model_name: request.get())
+    finally:
+        request.reset(token)
+    assert result == "run-1"
+
+
+def test_only_the_winners_latency_is_recorded():
+    release = threading.Event()
+    finished = threading.Event()
+
+    def call(model_name):
+        if model_name == "a":
+            release.wait(5)
+            finished.set()
+        return model_name
+
+    router = HedgedRouter(primary="a", secondary="b", default_deadline=0.05)
+    assert router.run("lnd", call) == ("b", "b")
+    release.set()
+    finished.wait(5)
+    time.sleep(0.05)
+    # The stalled primary lost: its latency mustn't drag the deadline up towards the stall.
+    assert router.latencies.percentile("a", "lnd", 0.95) == (None, 0)
+    assert router.latencies.percentile("b", "lnd", 0.95)[1] == 1
+
+
+def test_max_workers_bounds_the_executor():
+    router = HedgedRouter(max_workers=3)
+    assert router.executor._max_workers == 3
@@ -0,0 +1,68 @@
+from runlog import RunLog, read_index, read_run, read_tag, run_segments
+from pydantic import BaseModel
+
+
+class Message(BaseModel):
+    role: str
+    content: object
+
+
+def test_segments_rotate_and_are_indexed(tmp_path):
+    log = RunLog(tmp_path, max_bytes=1000)
+    for i in range(100):
+        log.add({"role": "user", "content": f"message {i}"})
+    log.close()
+    segments = run_segments(log.run_id, tmp_path)
+    index = read_index(tmp_path)
+    assert len(segments) > 1
+    assert [info.path for info in index] == [path.name for path in segments]
+    assert all(info.bytes <= 1000 for info in index)
+    assert sum(info.records for info in index) == 100
+    records = list(read_run(log.run_id, tmp_path))
+    assert [record["seq"] for record in records] == list(range(100))
+    assert records[-1]["content"] == "message 99"
+
+
+def test_oversized_record_gets_its_own_segment(tmp_path):
+    log = RunLog(tmp_path, max_bytes=100)
+    log.add({"role": "user", "content": "x" * 500})
+    log.add({"role": "user", "content": "small"})
+    log.close()
+    assert [info.records for info in read_index(tmp_path)] == [1, 1]
+
+
+def test_chain_style_adds(tmp_path):
+    # A chat call's whole messages list, single dicts and Message models, with parsed content.
+    log = RunLog(tmp_path)
+    messages = [{"role": "system", "content": "persona"}, {"role": "user", "content": "prompt"}]
+    log.add(messages)
+    messages.append({"role": "assistant", "content": "later"})  # the store keeps a copy
+    log.add(Message(role="assistant", content=Message(role="nested", content=1)))
+    log.close()
+    records = list(read_run(log.run_id, tmp_path))
+    assert [record["role"] for record in records] == ["system", "user", "assistant"]
+    assert records[2]["content"] == {"role": "nested", "content": 1}
+
+
+def test_tags_are_read_back_from_their_ranges(tmp_path):
+    tag = {"value": None}
+    log = RunLog(tmp_path, max_bytes=600, tag=lambda: tag["value"])
+    for i in range(60):
+        tag["value"] = ("a", "b", None)[i % 3]
+        log.add({"role": "user", "content": f"message {i}"})
+    log.close()
+    everything = list(read_run(log.run_id, tmp_path))
+    for name in ("a", "b"):
+        expected = [record for record in everything if record["run"] == name]
+        assert len(expected) == 20
+        assert list(read_run(log.run_id, tmp_path, tag=name)) == expected
+        assert list(read_tag(name, tmp_path)) == expected
+    assert all(set(info.tags) <= {"a", "b"} for info in read_index(tmp_path))
+
+
+def test_add_after_close_is_ignored(tmp_path):
+    log = RunLog(tmp_path)
+    log.close()
+    log.add({"role": "user", "content": "late"})
+    assert log.flush()
+    assert list(read_run(log.run_id, tmp_path)) == []
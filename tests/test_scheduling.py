@@ -0,0 +1,99 @@
+from scheduling import TokenBucket, Scheduler, ModelLimits, parse_limits, INTERACTIVE, BATCH
+import threading
+import pytest
+import time
+
+
+class Throttled(Exception):
+    status_code = 429
+
+
+def test_token_bucket_refills_at_its_rate(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(60)  # one per second, capacity 60
+    assert bucket.wait_time(60) == 0
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    now[0] = 30.0
+    assert bucket.wait_time(30) == 0
+    assert bucket.wait_time(40) == pytest.approx(10.0)
+
+
+def test_token_bucket_overspend_and_oversized_requests(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(60)
+    bucket.take(90)
+    assert bucket.level == -30
+    # More than capacity waits for a full bucket rather than forever.
+    assert bucket.wait_time(1000) == pytest.approx(90.0)
+    bucket.level = 10
+    bucket.drain()
+    assert bucket.level == 0
+
+
+def test_parse_limits():
+    assert parse_limits("claude:rpm=50,tpm=40000,concurrency=8") == (
+        "claude",
+        ModelLimits(requests_per_minute=50, tokens_per_minute=40000, max_concurrency=8),
+    )
+    assert parse_limits("llama3.1:latest:rpm=10") == ("llama3.1:latest", ModelLimits(requests_per_minute=10))
+    assert parse_limits("llama3.1:latest") == ("llama3.1:latest", ModelLimits())
+    assert parse_limits("curate") == ("curate", ModelLimits())
+    with pytest.raises(ValueError):
+        parse_limits("claude:rps=5")
+
+
+def test_throttled_calls_are_retried_and_halve_concurrency():
+    scheduler = Scheduler({"m": ModelLimits(max_concurrency=8)}, base_delay=0.001)
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise Throttled("slow down")
+        return "ok"
+
+    assert scheduler.run("m", call) == "ok"
+    stats = scheduler.stats["m"]
+    assert (stats.calls, stats.throttled, stats.retries, stats.failures) == (1, 2, 2, 0)
+    assert stats.concurrency < 8
+
+
+def test_other_errors_are_not_retried():
+    scheduler = Scheduler(base_delay=0.001)
+    with pytest.raises(KeyError):
+        scheduler.run("m", lambda: {}["missing"])
+    assert scheduler.stats["m"].failures == 1
+    assert scheduler.stats["m"].retries == 0
+
+
+def test_interactive_calls_go_ahead_of_batch_calls():
+    scheduler = Scheduler({"m": ModelLimits(max_concurrency=1)})
+    order = []
+    release = threading.Event()
+    blocker = threading.Thread(target=scheduler.run, args=("m", lambda: release.wait(5)))
+    blocker.start()
+    while scheduler.lane("m").active == 0:
+        time.sleep(0.001)
+    threads = []
+    for name, priority in (("batch", BATCH), ("interactive", INTERACTIVE)):
+        thread = threading.Thread(target=scheduler.run, args=("m", lambda name=name: order.append(name)), kwargs={"priority": priority})
+        thread.start()
+        threads.append(thread)
+        while len(scheduler.lane("m").waiting) < len(threads):
+            time.sleep(0.001)
+    release.set()
+    for thread in [blocker] + threads:
+        thread.join()
+    assert order == ["interactive", "batch"]
+
+
+def test_limits_are_shared_between_processes():
+    limits = ModelLimits(requests_per_minute=60, tokens_per_minute=None, max_concurrency=8, min_concurrency=2)
+    share = limits.share(4)
+    assert (share.requests_per_minute, share.tokens_per_minute, share.max_concurrency) == (15, None, 2)
+    assert share.min_concurrency == 1
+    assert ModelLimits(max_concurrency=2).share(4).max_concurrency == 1
+    assert limits.share(1) == limits
@@ -0,0 +1,48 @@
+from semantic_cache import SemanticTopicCache
+import numpy as np
+import time
+
+VECTORS = {
+    "data science with python": [1.0, 0.0, 0.0],
+    "python for data science": [0.99, 0.14, 0.0],
+    "python data science": [0.98, 0.0, 0.2],
+    "negotiation": [0.0, 0.0, 1.0],
+}
+
+
+def embed(texts):
+    return np.array([VECTORS.get(" ".join(text.casefold().split()), [0.0, 1.0, 0.0]) for text in texts])
+
+
+def test_near_duplicate_topic_is_a_hit(tmp_path):
+    cache = SemanticTopicCache(tmp_path / "topics.sqlite", embed=embed, threshold=0.9)
+    cache.put("Data Science with Python", "curriculum")
+    hit = cache.lookup("Python for Data Science")
+    assert hit.topic == "Data Science with Python"
+    assert 0.9 < hit.score < 1.0
+    assert cache.lookup("Data  science with PYTHON").score == 1.0
+    assert cache.lookup("Negotiation") is None
+
+
+def test_expired_best_match_does_not_hide_a_valid_one(tmp_path):
+    cache = SemanticTopicCache(tmp_path / "topics.sqlite", embed=embed, threshold=0.9, ttl=60)
+    cache.put("Python for Data Science", "old")
+    cache.put("Python Data Science", "new")
+    cache.created[cache.rows["python for data science"]] = time.time() - 120
+    hit = cache.lookup("Data Science with Python")
+    assert hit.curriculum_json == "new"
+    assert len(cache) == 1
+
+
+def test_growth_replacement_and_eviction(tmp_path):
+    path = tmp_path / "topics.sqlite"
+    cache = SemanticTopicCache(path, embed=embed, max_entries=40)
+    for i in range(50):
+        cache.put(f"Topic {i}", f"curriculum {i}")
+    cache.put("Topic 49", "replaced")
+    assert len(cache) == 40
+    assert set(cache.rows) == {f"topic {i}" for i in range(10, 50)}
+    assert all(cache.keys[row] == key for key, row in cache.rows.items())
+    reloaded = SemanticTopicCache(path, embed=embed, max_entries=40)
+    assert set(reloaded.rows) == set(cache.rows)
+    assert reloaded.lookup("Topic 49").curriculum_json == "replaced"
@@ -0,0 +1,144 @@
+from service import MentorService, Overloaded, BadRequest, parse_curate_request
+from Mentor import Curation
+import threading
+import asyncio
+import json
+import pytest
+
+
+class Pipeline:
+    """
+    Stands in for Mentor(): blocks until released, and counts its runs.
+    """
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.runs = []
+
+    def __call__(self, topic, **kwargs):
+        self.runs.append(topic)
+        self.release.wait(5)
+        if topic == "broken":
+            raise RuntimeError("librarian failed")
+        return Curation(topic=topic, course_titles=[f"{topic} Essential Training"])
+
+
+@pytest.fixture
+def service():
+    service = MentorService(pipelines=2, max_pending=2)
+    service.pipeline = Pipeline()
+    yield service
+    service.pipeline.release.set()
+    service.executor.shutdown(wait=True)
+
+
+async def request(port: int, method: str, path: str, body: dict | None = None) -> tuple[int, dict, dict]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    headers = dict(line.split(": ", 1) for line in header_lines)
+    return int(status_line.split()[1]), headers, json.loads(payload)
+
+
+def serve_and(service: MentorService, scenario):
+    async def run():
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        async with server:
+            return await scenario(server.sockets[0].getsockname()[1])
+
+    return asyncio.run(run())
+
+
+def test_identical_topics_share_one_run(service):
+    async def scenario(port):
+        first = asyncio.create_task(request(port, "POST", "/curate", {"topic": "Data Science"}))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(request(port, "GET", "/curate?topic=data%20%20SCIENCE"))
+        await asyncio.sleep(0.05)
+        service.pipeline.release.set()
+        return await first, await second
+
+    (status, headers, payload), (status2, headers2, payload2) = serve_and(service, scenario)
+    assert status == status2 == 200
+    assert payload == payload2
+    assert payload["course_titles"] == ["Data Science Essential Training"]
+    assert (headers["X-Mentor-Coalesced"], headers2["X-Mentor-Coalesced"]) == ("0", "1")
+    assert service.pipeline.runs == ["Data Science"]
+    assert (service.stats.pipelines, service.stats.coalesced) == (1, 1)
+    assert not service.in_flight
+
+
+def test_fast_mode_is_a_separate_run(service):
+    async def scenario(port):
+        tasks = [
+            asyncio.create_task(request(port, "POST", "/curate", {"topic": "SQL", "fast": fast}))
+            for fast in (False, True)
+        ]
+        await asyncio.sleep(0.05)
+        service.pipeline.release.set()
+        return await asyncio.gather(*tasks)
+
+    serve_and(service, scenario)
+    assert service.pipeline.runs == ["SQL", "SQL"]
+
+
+def test_new_topics_get_503_beyond_max_pending(service):
+    async def scenario(port):
+        running = [
+            asyncio.create_task(request(port, "POST", "/curate", {"topic": topic})) for topic in ("Python", "SQL")
+        ]
+        await asyncio.sleep(0.05)
+        rejected = await request(port, "POST", "/curate", {"topic": "Excel"})
+        # A topic already in flight still joins its run.
+        joined = asyncio.create_task(request(port, "POST", "/curate", {"topic": "python"}))
+        await asyncio.sleep(0.05)
+        service.pipeline.release.set()
+        return rejected, await joined, await asyncio.gather(*running)
+
+    (status, headers, payload), joined, _ = serve_and(service, scenario)
+    assert status == 503 and headers["Retry-After"] == "5"
+    assert "overloaded" in payload["error"]
+    assert joined[0] == 200 and joined[1]["X-Mentor-Coalesced"] == "1"
+    assert service.stats.rejected == 1
+    assert "Excel" not in service.pipeline.runs
+
+
+def test_curate_raises_overloaded(service):
+    service.max_pending = 0
+
+    async def scenario():
+        with pytest.raises(Overloaded):
+            await service.curate("Python")
+
+    asyncio.run(scenario())
+
+
+def test_errors(service):
+    service.pipeline.release.set()
+
+    async def scenario(port):
+        return [
+            await request(port, "POST", "/curate", {"topic": "broken"}),
+            await request(port, "POST", "/curate", {"topic": " "}),
+            await request(port, "GET", "/nowhere"),
+            await request(port, "GET", "/health"),
+        ]
+
+    broken, missing, nowhere, health = serve_and(service, scenario)
+    assert broken[0] == 500 and broken[2]["error"] == "RuntimeError: librarian failed"
+    assert missing[0] == 400 and nowhere[0] == 404 and health[2] == {"ok": True}
+    assert service.stats.failures == 1
+
+
+def test_parse_curate_request():
+    assert parse_curate_request("GET", "topic=SQL&fast=1", b"") == {"topic": "SQL", "fast": "1"}
+    assert parse_curate_request("POST", "", b'{"topic": "SQL"}') == {"topic": "SQL"}
+    with pytest.raises(BadRequest):
+        parse_curate_request("POST", "", b"{not json")
+    with pytest.raises(BadRequest):
+        parse_curate_request("POST", "", b'["SQL"]')
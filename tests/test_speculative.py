@@ -0,0 +1,48 @@
+from speculative import ModuleStreamParser, extract_json
+import json
+
+CURRICULUM = {
+    "topic": "Data Science",
+    "description": 'Covers "modules": [ of all kinds',
+    "audience": "Analysts",
+    "modules": [
+        {"title": "Python", "description": "Lists {and} dicts", "learning_objectives": ["a", "b"]},
+        {"title": "Stats \"101\"", "description": "Means]", "learning_objectives": []},
+        {"title": "SQL", "description": "Joins", "learning_objectives": ["c"]},
+    ],
+}
+
+
+def feed_in_chunks(text: str, size: int) -> list[dict]:
+    parser = ModuleStreamParser()
+    modules = []
+    for start in range(0, len(text), size):
+        modules += parser.feed(text[start : start + size])
+    return modules
+
+
+def test_modules_are_found_whatever_the_chunking():
+    text = json.dumps(CURRICULUM)
+    for size in (1, 2, 7, 64, len(text)):
+        assert feed_in_chunks(text, size) == CURRICULUM["modules"]
+
+
+def test_each_module_is_returned_once_it_is_complete():
+    text = json.dumps(CURRICULUM)
+    first_end = text.index('"b"]}') + len('"b"]}')
+    parser = ModuleStreamParser()
+    assert parser.feed(text[: first_end - 1]) == []
+    assert parser.feed(text[first_end - 1 : first_end]) == [CURRICULUM["modules"][0]]
+
+
+def test_text_after_the_modules_array_is_ignored():
+    text = json.dumps(CURRICULUM) + ' {"title": "not a module"}'
+    parser = ModuleStreamParser()
+    assert len(parser.feed(text)) == 3
+    assert parser.finished
+    assert parser.feed('{"title": "late"}') == []
+
+
+def test_extract_json_strips_prose_and_fences():
+    assert extract_json('Here you go:\n```json\n{"a": 1}\n```') == '{"a": 1}'
+    assert extract_json("no json") == "no json"
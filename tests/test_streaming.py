@@ -0,0 +1,97 @@
+from streaming import Mentor_stream, Mentor_astream
+from cache import DiskCache
+import numpy as np
+import asyncio
+import sys
+import pytest
+
+TOPIC = "Python for Data Science"
+
+
+@pytest.fixture
+def streaming_model(fakes, monkeypatch):
+    """
+    The fakes, with a Model that has a stream() method.
+    """
+    from fakes import build_chain_module
+    import Mentor
+
+    monkeypatch.setitem(
+        sys.modules, "Chain", build_chain_module(fakes.model_copy(update={"streaming": True, "stream_chunks": 5}))
+    )
+    Mentor.load_model.cache_clear()
+    return fakes
+
+
+@pytest.fixture
+def artifacts(fakes, tmp_path):
+    import Mentor
+
+    return Mentor.enable_artifact_store(str(tmp_path / "artifacts.sqlite"))
+
+
+def test_events_in_pipeline_order(fakes):
+    events = list(Mentor_stream(TOPIC))
+    kinds = [event.kind for event in events]
+    # Chain's Model doesn't stream: the ideal curriculum comes as one chunk.
+    assert kinds[:3] == ["ideal_curriculum_delta", "ideal_curriculum", "curriculum"]
+    assert kinds[3:-1] == ["module_retrieval"] * fakes.modules
+    assert kinds[-1] == "curation"
+    assert sorted(event.index for event in events[3:-1]) == list(range(fakes.modules))
+    assert [event.elapsed for event in events] == sorted(event.elapsed for event in events)
+
+
+def test_streamed_chunks_then_one_cached_chunk(streaming_model, tmp_path, monkeypatch):
+    import Mentor
+
+    monkeypatch.setattr(Mentor, "response_cache", DiskCache(tmp_path / "responses.sqlite"))
+    deltas = [event.text for event in Mentor_stream(TOPIC) if event.kind == "ideal_curriculum_delta"]
+    assert len(deltas) == 5
+    again = [event.text for event in Mentor_stream(TOPIC) if event.kind == "ideal_curriculum_delta"]
+    assert again == ["".join(deltas)]
+
+
+def test_astream_runs_in_the_callers_artifact_run(fakes, artifacts):
+    import Mentor
+
+    async def collect():
+        with Mentor.artifact_run("run-1"):
+            return [event async for event in Mentor_astream(TOPIC, fast=True)]
+
+    events = asyncio.run(collect())
+    assert events[-1].kind == "curation"
+    assert {"curriculum", "candidates", "curation"} <= set(artifacts.run("run-1"))
+
+
+def test_astream_reraises_pipeline_errors(fakes, monkeypatch):
+    import streaming
+
+    def broken(topic):
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(streaming, "lnd_structured_curriculum", broken)
+
+    async def collect():
+        return [event async for event in Mentor_astream(TOPIC, fast=True)]
+
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        asyncio.run(collect())
+
+
+def test_semantic_hit_on_the_curriculum_is_recorded(fakes, artifacts, tmp_path):
+    import Mentor
+
+    def embed(texts):
+        return np.array([[1.0, 0.0] if "python" in text.casefold() else [0.0, 1.0] for text in texts])
+
+    # Every Python topic shares the curriculum; none is close enough to share the curation.
+    Mentor.semantic_cache = Mentor.SemanticTopicCache(
+        tmp_path / "topics.sqlite", embed=embed, threshold=0.9, curation_threshold=1.1
+    )
+    list(Mentor_stream("Data Science with Python", fast=True))
+    with Mentor.artifact_run("run-2"):
+        events = list(Mentor_stream(TOPIC, fast=True))
+    assert "ideal_curriculum_delta" not in {event.kind for event in events}
+    recorded = artifacts.run("run-2")
+    assert recorded["curriculum"].load(Mentor.Curriculum).topic == TOPIC
+    assert "curation" in recorded
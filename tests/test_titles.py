@@ -0,0 +1,69 @@
+from titles import TitleIndex, repair_titles
+
+CATALOG = [
+    "Python Essential Training",
+    "Excel 2019 Essential Training",
+    "Excel 2016 Essential Training",
+    "Machine Learning Foundations: Linear Algebra",
+]
+
+
+def test_exact_match():
+    match = TitleIndex(CATALOG).match("Python Essential Training")
+    assert match.exact
+    assert not match.corrected
+
+
+def test_case_and_spacing_are_normalized_to_the_verbatim_title():
+    match = TitleIndex(CATALOG).match("python  essential TRAINING")
+    assert match.title == "Python Essential Training"
+    assert match.score == 1.0
+    assert match.corrected
+
+
+def test_near_miss_is_corrected():
+    match = TitleIndex(CATALOG).match("Machine Learning Foundation: Linear Algebra")
+    assert match.title == "Machine Learning Foundations: Linear Algebra"
+    assert match.corrected
+
+
+def test_numbers_must_agree():
+    index = TitleIndex(CATALOG)
+    assert index.match("Excel 2016 Essentials Training").title == "Excel 2016 Essential Training"
+    assert index.match("Excel 2021 Essential Training").title is None
+
+
+def test_unrelated_title_is_unmatched():
+    match = TitleIndex(CATALOG).match("Negotiation Skills")
+    assert match.title is None
+
+
+def test_repair_titles_tries_indexes_in_order_and_drops_unmatched():
+    candidates = TitleIndex(CATALOG[:1])
+    catalog = TitleIndex(CATALOG)
+    titles, report = repair_titles(
+        ["Python Essential Trainin", "Excel 2019 Essential Training", "Negotiation Skills", "python essential training"],
+        [candidates, catalog],
+    )
+    assert titles == ["Python Essential Training", "Excel 2019 Essential Training"]
+    assert report.unmatched == ["Negotiation Skills"]
+    assert [match.requested for match in report.corrected] == ["Python Essential Trainin", "python essential training"]
+
+
+def test_librarian_keeps_unmatched_titles_on_the_curation(fakes, monkeypatch, caplog):
+    import Mentor
+
+    module = Mentor.Module(title="Basics", description="The basics", learning_objectives=["Learn"])
+    curriculum = Mentor.Curriculum(topic="Python", description="Python", audience="Everyone", modules=[module])
+    retrievals = [Mentor.ModuleRetrieval(module=module, courses=[(title, "description") for title in CATALOG])]
+    picked = ["python essential training", "Negotiation Skills"]
+    monkeypatch.setattr(
+        Mentor, "run_chain", lambda *args, **kwargs: Mentor.Curation(topic="Python", course_titles=picked)
+    )
+    with caplog.at_level("WARNING", logger="Mentor"):
+        curation = Mentor.librarian_curation(curriculum, retrievals)
+    assert curation.course_titles == ["Python Essential Training"]
+    assert curation.unmatched_titles == ["Negotiation Skills"]
+    assert "has 1 courses, fewer than 6 (1 unmatched titles dropped)" in caplog.text
+    # The flag is ours: the model never sees it in the schema.
+    assert "unmatched_titles" not in Mentor.Curation.model_json_schema()["properties"]
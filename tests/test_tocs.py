@@ -0,0 +1,36 @@
+from Mentor import Curation
+import Mentor
+import threading
+import time
+
+
+def test_tocs_keep_course_order_and_run_in_the_callers_artifact_run(monkeypatch):
+    def course_TOC(title):
+        # Later courses finish first.
+        time.sleep(0.05 * (3 - int(title[-1])))
+        return f"{title} ({Mentor._run_id.get()})\n"
+
+    monkeypatch.setattr(Mentor, "course_TOC", course_TOC)
+    curation = Curation(topic="Python", course_titles=["Course 1", "Course 2", "Course 3"])
+    with Mentor.artifact_run("run-1"):
+        text = curation.curation_TOCs()
+        arrived = list(curation.stream_TOCs(ordered=False))
+    assert text == "Course 1 (run-1)\nCourse 2 (run-1)\nCourse 3 (run-1)\n"
+    assert arrived == ["Course 3 (run-1)\n", "Course 2 (run-1)\n", "Course 1 (run-1)\n"]
+
+
+def test_stopping_early_cancels_pending_lookups(monkeypatch):
+    started = []
+    lock = threading.Lock()
+
+    def course_TOC(title):
+        with lock:
+            started.append(title)
+        time.sleep(0.05)
+        return title
+
+    monkeypatch.setattr(Mentor, "course_TOC", course_TOC)
+    curation = Curation(topic="Python", course_titles=[f"Course {i}" for i in range(20)])
+    assert next(curation.stream_TOCs(max_workers=2)) == "Course 0"
+    time.sleep(0.2)
+    assert len(started) < 20
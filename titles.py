@@ -0,0 +1,146 @@
+"""
+Verbatim-title index: checks the librarian's course titles against the titles it was shown (and the catalog),
+so that a misspelled title doesn't break the Get lookups in Curation.curation_TOCs.
+
+TitleIndex combines an exact map (on a normalized form: case, whitespace and unicode variants folded) with a
+character-trigram index for near misses. A near miss is scored with the Dice coefficient of the two trigram sets
+(1.0 is identical) and auto-corrected if it clears the threshold; anything below is flagged as unmatched.
+Numbers must agree exactly ("Excel 2016" is never corrected to "Excel 2019", nor "Part 1" to "Part 12").
+"""
+
+from pydantic import BaseModel
+from collections import Counter
+from typing import Iterable
+import unicodedata
+import re
+
+NUMBER = re.compile(r"\d+")
+
+TITLE_MATCH_THRESHOLD = 0.75
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", title).casefold().split())
+
+
+def trigrams(normalized: str) -> set[str]:
+    padded = f"  {normalized} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleMatch(BaseModel):
+    """
+    The result of checking one title. title is the verbatim catalog title, or None if there's no match.
+    """
+
+    requested: str
+    title: str | None = None
+    score: float = 0.0
+
+    @property
+    def exact(self) -> bool:
+        return self.title == self.requested
+
+    @property
+    def corrected(self) -> bool:
+        return self.title is not None and not self.exact
+
+
+class TitleIndex:
+    """
+    Exact and fuzzy lookup of verbatim course titles.
+    """
+
+    def __init__(self, titles: Iterable[str]):
+        self.titles: list[str] = []
+        self.exact: dict[str, str] = {}
+        self.grams: list[set[str]] = []
+        self.numbers: list[list[str]] = []
+        self.postings: dict[str, list[int]] = {}
+        for title in titles:
+            normalized = normalize_title(title)
+            if normalized in self.exact:
+                continue
+            self.exact[normalized] = title
+            grams = trigrams(normalized)
+            position = len(self.titles)
+            self.titles.append(title)
+            self.grams.append(grams)
+            self.numbers.append(NUMBER.findall(normalized))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def match(self, title: str, threshold: float = TITLE_MATCH_THRESHOLD) -> TitleMatch:
+        normalized = normalize_title(title)
+        if normalized in self.exact:
+            return TitleMatch(requested=title, title=self.exact[normalized], score=1.0)
+        grams = trigrams(normalized)
+        numbers = NUMBER.findall(normalized)
+        shared = Counter(
+            position for gram in grams for position in self.postings.get(gram, ())
+        )
+        best, best_score = None, 0.0
+        for position, count in shared.items():
+            if self.numbers[position] != numbers:
+                continue
+            score = 2 * count / (len(grams) + len(self.grams[position]))
+            if score > best_score:
+                best, best_score = position, score
+        if best is None or best_score < threshold:
+            return TitleMatch(requested=title, score=best_score)
+        return TitleMatch(requested=title, title=self.titles[best], score=best_score)
+
+
+class TitleReport(BaseModel):
+    """
+    What repair_titles did to a list of titles.
+    """
+
+    matches: list[TitleMatch]
+
+    @property
+    def corrected(self) -> list[TitleMatch]:
+        return [match for match in self.matches if match.corrected]
+
+    @property
+    def unmatched(self) -> list[str]:
+        return [match.requested for match in self.matches if match.title is None]
+
+    def __str__(self):
+        lines = [
+            f"Corrected course title '{match.requested}' -> '{match.title}' (score {match.score:.2f})"
+            for match in self.corrected
+        ]
+        lines += [
+            f"Unmatched course title (dropped): '{title}'" for title in self.unmatched
+        ]
+        return "\n".join(lines)
+
+
+def repair_titles(
+    titles: list[str],
+    indexes: list[TitleIndex],
+    threshold: float = TITLE_MATCH_THRESHOLD,
+) -> tuple[list[str], TitleReport]:
+    """
+    Map each title to its verbatim form, trying the indexes in order (e.g. the candidates, then the catalog).
+    Returns the repaired titles (unmatched ones dropped, duplicates removed) and a report; callers keep
+    report.unmatched with the result (e.g. Curation.unmatched_titles) so the drop doesn't go unnoticed.
+    """
+    matches = []
+    for title in titles:
+        match = TitleMatch(requested=title)
+        for index in indexes:
+            found = index.match(title, threshold=threshold)
+            if found.title is not None:
+                match = found
+                break
+            match.score = max(match.score, found.score)
+        matches.append(match)
+    repaired = list(
+        dict.fromkeys(match.title for match in matches if match.title is not None)
+    )
+    return repaired, TitleReport(matches=matches)